@@ -8,6 +8,51 @@ __email__ = "contact@amanoteam.com"
 __license__ = "MIT"
 __version__ = "1.0.9"
 
-from . import types
-from .async_client import Client as AsyncClient
-from .sync_client import Client
+from typing import TYPE_CHECKING, Any, List
+
+__all__ = [
+    "AsyncClient",
+    "Client",
+    "DiskCache",
+    "EntityStore",
+    "MetricsCollector",
+    "ResponseCache",
+    "Span",
+    "types",
+]
+
+# Public name to the submodule and attribute it comes from, imported on first access (PEP 562).
+_LAZY = {
+    "AsyncClient": ("async_client", "Client"),
+    "Client": ("sync_client", "Client"),
+    "DiskCache": ("cache", "DiskCache"),
+    "EntityStore": ("store", "EntityStore"),
+    "MetricsCollector": ("metrics", "MetricsCollector"),
+    "ResponseCache": ("cache", "ResponseCache"),
+    "Span": ("metrics", "Span"),
+    "types": ("types", None),
+}
+
+if TYPE_CHECKING:  # pragma: no cover
+    from . import types
+    from .async_client import Client as AsyncClient
+    from .cache import DiskCache, ResponseCache
+    from .metrics import MetricsCollector, Span
+    from .store import EntityStore
+    from .sync_client import Client
+
+
+def __getattr__(name: str) -> Any:
+    if name not in _LAZY:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    module, attribute = _LAZY[name]
+    # __import__ goes through the same path as import statements, so -X importtime reports the module.
+    value = __import__(module, globals(), None, ("__name__",), 1)
+    if attribute is not None:
+        value = getattr(value, attribute)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> List[str]:
+    return sorted(set(globals()) | set(__all__))
@@ -3,12 +3,23 @@
 #
 # SPDX-License-Identifier: MIT
 
-from typing import List, Optional, Union, Tuple
+import asyncio
+from functools import partial
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, Iterable, List, Optional, Union, Tuple
 
 import httpx
 
-from .client_process import *
-
+from .base_client import ACQUIRE, BaseClient, Batch, Blocking, Flow, Item, NextChunk, Parallel, Read, Send
+from .batch import Batcher
+from .cache import DiskCache, ResponseCache
+from .concurrency import Progress, amap, check_concurrency, resolve_method
+from .decoder import Decoder
+from .documents import request_body
+from .metrics import Hook, Recorder
+from .operations import ACTIVITY, GET, GET_MANY, SEARCH
+from .pagination import aiter_pages
+from .ratelimit import AsyncRateLimiter
+from .store import EntityStore
 from .types import (
     Anime,
     Character,
@@ -20,48 +31,239 @@ from .types import (
     TextActivity,
     User,
 )
-from .utils import (
-    ANIME_GET_QUERY,
-    ANIME_SEARCH_QUERY,
-    API_URL,
-    CHARACTER_GET_QUERY,
-    CHARACTER_SEARCH_QUERY,
-    HEADERS,
-    LIST_ACTIVITY_QUERY,
-    LIST_GET_QUERY_ANIME,
-    LIST_GET_QUERY_MANGA,
-    LIST_ITEM_GET_QUERY,
-    MANGA_GET_QUERY,
-    MANGA_SEARCH_QUERY,
-    MESSAGE_ACTIVITY_QUERY,
-    MESSAGE_ACTIVITY_QUERY_SENT,
-    STAFF_GET_QUERY,
-    STAFF_SEARCH_QUERY,
-    TEXT_ACTIVITY_QUERY,
-    USER_GET_QUERY,
-    USER_SEARCH_QUERY,
-)
+from .utils import API_URL, HEADERS, MAX_PER_PAGE
+
+
+async def api_query(
+        query, variables, url=API_URL, headers=HEADERS, session=None, transport=None, extensions=None, persisted=None
+):
+    if session is not None:
+        return await session.post(
+            url=url, json=request_body(query, variables, persisted), headers=headers, extensions=extensions
+        )
+    async with httpx.AsyncClient(http2=True, transport=transport) as session:
+        response = await session.post(
+            url=url, json=request_body(query, variables, persisted), headers=headers, extensions=extensions
+        )
+    return response
 
 
-async def api_query(query, variables, url=API_URL, headers=HEADERS):
-    async with httpx.AsyncClient(http2=True) as session:
-        response = await session.post(url=url, json=dict(query=query, variables=variables), headers=headers)
-    return response
+class Client(BaseClient):
+    _asynchronous = True
 
+    def __init__(
+            self,
+            *,
+            http2: bool = True,
+            max_connections: Optional[int] = 100,
+            max_keepalive_connections: Optional[int] = 20,
+            keepalive_expiry: Optional[float] = 5.0,
+            cache: Optional[Union[ResponseCache, DiskCache]] = None,
+            rate_limit: Optional[int] = 90,
+            max_retries: int = 5,
+            batch_window: Optional[float] = None,
+            max_batch: int = 10,
+            lazy: bool = False,
+            decoder: Union[str, Decoder] = "auto",
+            typed: bool = False,
+            base_url: str = API_URL,
+            transport: Optional[httpx.AsyncBaseTransport] = None,
+            headers: Optional[Dict[str, str]] = None,
+            store: Optional[EntityStore] = None,
+            hooks: Optional[Iterable[Hook]] = None,
+            minify: bool = False,
+            persisted_queries: bool = False,
+    ):
+        """Creates a client that reuses one connection pool for all of its requests.
+
+        The pool is opened on the first request and kept alive until `aclose()` is called
+        or the `async with` block exits. A pool is bound to the event loop it was opened in,
+        so a call from another event loop, like a second `asyncio.run()`, opens a new one.
 
-class Client:
-    def __init__(self):
-        self.httpx = None
+        Args:
+            http2 (bool, optional): Option to use HTTP/2. Defaults to True.
+            max_connections (int, optional): Maximum open connections, None for no limit. Defaults to 100.
+            max_keepalive_connections (int, optional): Maximum idle connections kept alive. Defaults to 20.
+            keepalive_expiry (float, optional): Seconds before an idle connection is closed. Defaults to 5.0.
+            cache (Union[ResponseCache, DiskCache], optional): Cache for API responses. Defaults to None,
+                which disables caching.
+            rate_limit (int, optional): Requests per minute this client paces itself to. The limit is
+                corrected from AniList's rate limit headers. None disables pacing. Defaults to 90.
+            max_retries (int, optional): Times a throttled (429) request is queued again before
+                `httpx.HTTPStatusError` is raised. Defaults to 5.
+            batch_window (float, optional): Seconds during which `get_character`, `get_staff` and `get_user`
+                calls are coalesced into one aliased request. Defaults to None, which disables batching.
+            max_batch (int, optional): Maximum lookups coalesced into one request. Defaults to 10.
+            lazy (bool, optional): Return list entries and list activities as `LazyObject`s that build
+                their models on first attribute access. Media attributes are built one at a time.
+                Defaults to False.
+            decoder (Union[str, Decoder], optional): JSON decoder for response bodies, see `get_decoder()`.
+                Defaults to "auto", which uses orjson or msgspec when installed.
+            typed (bool, optional): Decode `get_anime`, `get_manga`, `get_list` and `get_user` responses
+                with msgspec straight into the structs of `anilist.schema` instead of building the
+                model objects. Typed responses are not cached. Defaults to False.
+            base_url (str, optional): GraphQL endpoint, for example a caching proxy. Defaults to API_URL.
+            transport (httpx.AsyncBaseTransport, optional): Transport for the connection pool, like
+                `httpx.MockTransport`. When set, it handles `http2` and the pool limits itself. Defaults to None.
+            headers (Dict[str, str], optional): Extra request headers, merged over the default ones.
+                Defaults to None.
+            store (EntityStore, optional): Normalized store the anime, manga, characters, staff and studios
+                of every response are merged into, and single item lookups are answered from when it covers
+                the requested fields. Defaults to None.
+            hooks (Iterable[Hook], optional): Callables receiving a `Span` for each phase of every call:
+                connect, server, download, decode and process. Streamed calls report connect, server
+                and download, the download span including the parsing of the entries as they arrive.
+                `MetricsCollector` keeps their quantiles. Defaults to None.
+            minify (bool, optional): Send queries without comments, the license header and
+                insignificant whitespace, about a quarter of their size. Defaults to False.
+            persisted_queries (bool, optional): Send automatic persisted queries: only the sha256 of
+                the query, followed by the full text when the server does not know the hash yet.
+                Turned off for the client when the server answers that it does not support them.
+                Defaults to False.
+
+        Raises:
+            ImportError: If typed is set and msgspec is not installed.
+        """
+        super().__init__(
+            http2=http2,
+            max_connections=max_connections,
+            max_keepalive_connections=max_keepalive_connections,
+            keepalive_expiry=keepalive_expiry,
+            cache=cache,
+            max_retries=max_retries,
+            lazy=lazy,
+            decoder=decoder,
+            typed=typed,
+            base_url=base_url,
+            transport=transport,
+            headers=headers,
+            store=store,
+            hooks=hooks,
+            minify=minify,
+            persisted_queries=persisted_queries,
+        )
+        self.rate_limiter: Optional[AsyncRateLimiter] = None
+        if rate_limit is not None:
+            self.rate_limiter = AsyncRateLimiter(limit=rate_limit)
+        self.batcher: Optional[Batcher] = None
+        if batch_window is not None:
+            self.batcher = Batcher(self, window=batch_window, max_batch=max_batch)
+        self.httpx: Optional[httpx.AsyncClient] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
 
     async def __aenter__(self):
-        self.httpx = httpx.AsyncClient(http2=True)
+        self._session()
         return self
 
     async def __aexit__(self, *args):
-        await self.httpx.aclose()
-        self.httpx = None
+        await self.aclose()
         return None
 
+    def _session(self) -> httpx.AsyncClient:
+        loop = asyncio.get_running_loop()
+        if self.httpx is None or self._loop not in (None, loop):
+            # The connections of a pool belong to the loop that opened them, which may be closed by now.
+            self.httpx = httpx.AsyncClient(http2=self.http2, limits=self.limits, transport=self.transport)
+        self._loop = loop
+        return self.httpx
+
+    async def aclose(self) -> None:
+        """Closes the connection pool. A new one is opened on the next request."""
+        if self.httpx is not None:
+            await self.httpx.aclose()
+            self.httpx = None
+            self._loop = None
+
+    async def _drive(self, flow: Flow) -> Any:
+        # Runs a flow of base_client, awaiting every step it yields.
+        value, error = None, None
+        while True:
+            try:
+                step = flow.send(value) if error is None else flow.throw(error)
+            except StopIteration as stop:
+                return stop.value
+            value, error = None, None
+            try:
+                value = await self._perform(step)
+            except Exception as exc:
+                error = exc
+
+    async def _drive_stream(self, flow: Flow) -> AsyncIterator[Any]:
+        # Same as _drive, yielding the items of a streaming flow. Responses are closed
+        # when the caller stops iterating before the end.
+        responses = []
+        value, error = None, None
+        try:
+            while True:
+                try:
+                    step = flow.send(value) if error is None else flow.throw(error)
+                except StopIteration:
+                    return
+                value, error = None, None
+                if isinstance(step, Item):
+                    yield step.value
+                    continue
+                try:
+                    value = await self._perform(step)
+                except Exception as exc:
+                    error = exc
+                else:
+                    if isinstance(step, Send) and step.stream:
+                        responses.append(value[0])
+        finally:
+            flow.close()
+            for response in responses:
+                await response.aclose()
+
+    async def _perform(self, step: Any) -> Any:
+        if isinstance(step, Send):
+            session = self._session()
+            if step.stream:
+                request = session.build_request(
+                    "POST", self.base_url, json=request_body(step.query, step.variables), headers=step.headers,
+                    extensions=step.extensions,
+                )
+                response = await session.send(request, stream=True)
+                return response, response.aiter_bytes()
+            return await api_query(
+                step.query, step.variables, url=self.base_url, headers=step.headers, session=session,
+                extensions=step.extensions, persisted=step.persisted,
+            )
+        if step is ACQUIRE:
+            return await self.rate_limiter.acquire()
+        if isinstance(step, NextChunk):
+            try:
+                return await step.chunks.__anext__()
+            except StopAsyncIteration:
+                return None
+        if isinstance(step, Read):
+            return await step.response.aread()
+        if isinstance(step, Blocking):
+            return await asyncio.get_running_loop().run_in_executor(None, partial(step.function, *step.args))
+        if isinstance(step, Batch):
+            return await self.batcher.load(step.kind, step.variables)
+        if isinstance(step, Parallel):
+            return list(await asyncio.gather(*(self._drive(flow) for flow in step.flows)))
+        raise TypeError(f"unknown step {step!r}")
+
+    async def _pages(
+            self, fetch: Callable[[int], Flow], limit: int, max_items: Optional[int], concurrency: int
+    ) -> AsyncIterator[Any]:
+        async for item in aiter_pages(
+                lambda page: self._drive(fetch(page)), per_page=limit, max_items=max_items, concurrency=concurrency,
+        ):
+            yield item
+
+    async def _query(
+            self,
+            query: str,
+            variables: dict,
+            content_type: Optional[str] = None,
+            response_type: Optional[type] = None,
+            recorder: Optional[Recorder] = None,
+    ) -> dict:
+        return await self._drive(self._request(query, variables, content_type, response_type, recorder))
+
     async def search(
             self,
             query: str,
@@ -92,41 +294,7 @@ class Client:
         Returns:
             Union[Anime, Manga, Character, Staff, User], optional: Search results.
         """
-        if isinstance(content_type, str):
-            content_type = content_type.lower()
-        else:
-            raise TypeError(
-                f"content_type argument must be a string, not '{content_type.__class__.__name__}'"
-            )
-        if not isinstance(query, str):
-            raise TypeError(
-                f"query argument must be a string, not '{query.__class__.__name__}'"
-            )
-        if isinstance(limit, str) and limit.isdecimal():
-            limit = int(limit)
-        elif not isinstance(limit, int):
-            raise TypeError(
-                f"limit argument must be an int, not '{limit.__class__.__name__}'"
-            )
-
-        if content_type == "anime":
-            search, pages = await self.search_anime(query=query, page=page, limit=limit)
-        elif content_type == "manga":
-            search, pages = await self.search_manga(query=query, page=page, limit=limit)
-        elif content_type in ["char", "character"]:
-            search, pages = await self.search_character(
-                query=query, page=page, limit=limit
-            )
-        elif content_type == "staff":
-            search, pages = await self.search_staff(query=query, page=page, limit=limit)
-        elif content_type == "user":
-            search, pages = await self.search_user(query=query, page=page, limit=limit)
-        else:
-            raise TypeError("There is no such content type.")
-
-        if pagination:
-            return search, pages
-        return search
+        return await self._drive(self._search(query, content_type, page, limit, pagination))
 
     async def get(
             self,
@@ -135,6 +303,7 @@ class Client:
             page: int = 1,
             limit: int = 25,
             pagination: bool = False,
+            fields: Optional[Union[str, List[str]]] = None,
     ) -> Optional[Tuple[Union[Anime, Manga, Character, Staff, List[MediaList], User], PageInfo]]:
         """Gets specified item from given id.
 
@@ -144,6 +313,8 @@ class Client:
             page (int, optional): Current page. Defaults to 1. Only used for lists.
             limit (int, optional): Maximum items per page. Defaults to 25. Only used for lists.
             pagination (bool, optional): Option to return pagination info. Only used for lists. Defaults to False.
+            fields (Union[str, List[str]], optional): Fields to request, as a preset ("minimal", "card" or "full")
+                or a list of attribute names. Only used for anime and manga. Defaults to None, every field.
 
         Raises:
             TypeError: If content type is not a string.
@@ -155,139 +326,200 @@ class Client:
         Returns:
             Union[Anime, Manga, Character, Staff, List[MediaList], User], optional: Returned items.
         """
-        if isinstance(content_type, str):
-            content_type = content_type.lower()
-        else:
-            raise TypeError(
-                f"content_type argument must be a string, not '{content_type.__class__.__name__}'"
-            )
-        if isinstance(id, str) and id.isdecimal():
-            id = int(id)
-        elif not isinstance(id, int):
-            if content_type == "user":
-                user = await self.get_user(name=id)
-                return user
-            elif content_type == "list_anime" or content_type == "list_manga":
-                try:
-                    user = await self.get_user(name=id)
-                    id = user.id
-                except Exception:
-                    raise TypeError("user not found")
-            else:
-                raise TypeError(
-                    f"id argument must be a string, not '{id.__class__.__name__}'"
-                )
-        if content_type == "anime":
-            return await self.get_anime(id=id)
-        elif content_type == "manga":
-            return await self.get_manga(id=id)
-        elif content_type in ["char", "character"]:
-            return await self.get_character(id=id)
-        elif content_type == "staff":
-            return await self.get_staff(id=id)
-        elif content_type == "list_anime":
-            anime, pages = await self.get_list(
-                user_id=id, limit=limit, page=page, content_type="anime"
-            )
-            if pagination:
-                return anime, pages
-            return anime
-        elif content_type == "list_manga":
-            manga, pages = await self.get_list(
-                user_id=id, limit=limit, page=page, content_type="manga"
-            )
-            if pagination:
-                return manga, pages
-            return manga
-        elif content_type == "user":
-            raise TypeError("id argument must be a string for the user object.")
-        else:
-            raise TypeError("There is no such content type.")
-
-    @staticmethod
-    async def search_anime(
-            query: str, limit: int, page: int = 1
-    ) -> Optional[Tuple[List[Anime], PageInfo]]:
-        response = await api_query(ANIME_SEARCH_QUERY,
-                                   dict(search=query, page=page, per_page=limit, MediaType="ANIME"))
-        data: Optional[dict] = response.json()
-        return process_search_anime(data)
-
-    @staticmethod
-    async def search_manga(
-            query: str, limit: int, page: int = 1
-    ) -> Optional[Tuple[List[Manga], PageInfo]]:
-        response = await api_query(MANGA_SEARCH_QUERY,
-                                   dict(search=query, page=page, per_page=limit, MediaType="MANGA"))
-        data: dict = response.json()
-        return process_search_manga(data)
-
-    @staticmethod
+        return await self._drive(self._get(id, content_type, page, limit, pagination, fields))
+
+    async def get_many(
+            self,
+            ids: List[Union[int, str]],
+            content_type: str = "anime",
+            fields: Optional[Union[str, List[str]]] = None,
+    ) -> List[Optional[Union[Anime, Manga]]]:
+        """Gets several items at once, packing up to 50 ids in each request.
+
+        Args:
+            ids (List[Union[int, str]]): Item ids.
+            content_type (str, optional): anime or manga. Defaults to "anime".
+            fields (Union[str, List[str]], optional): Fields to request, as a preset ("minimal", "card" or "full")
+                or a list of attribute names. Defaults to None, every field.
+
+        Raises:
+            TypeError: If content type is not a string.
+            TypeError: If an id is not an int.
+            TypeError: If the content type is invalid.
+
+        Returns:
+            List[Optional[Union[Anime, Manga]]]: Items in the same order as the given ids, None for missing ones.
+        """
+        return await self._drive(self._get_many(ids, content_type, fields))
+
+    async def search_anime(self, query: str, limit: int, page: int = 1) -> Optional[Tuple[List[Anime], PageInfo]]:
+        return await self._drive(self._run(SEARCH["anime"], dict(search=query, page=page, per_page=limit)))
+
+    async def search_manga(self, query: str, limit: int, page: int = 1) -> Optional[Tuple[List[Manga], PageInfo]]:
+        return await self._drive(self._run(SEARCH["manga"], dict(search=query, page=page, per_page=limit)))
+
     async def search_character(
-            query: str, limit: int, page: int = 1
+            self, query: str, limit: int, page: int = 1
     ) -> Optional[Tuple[List[Character], PageInfo]]:
-        response = await api_query(CHARACTER_SEARCH_QUERY, dict(search=query, page=page, per_page=limit))
-        data = response.json()
-        return process_search_character(data)
-
-    @staticmethod
-    async def search_staff(
-            query: str, limit: int, page: int = 1
-    ) -> Optional[Tuple[List[Staff], PageInfo]]:
-        response = await api_query(STAFF_SEARCH_QUERY, dict(search=query, page=page, per_page=limit))
-        data = response.json()
-        return process_search_staff(data)
-
-    @staticmethod
-    async def search_user(
-            query: str, limit: int, page: int = 1
-    ) -> Optional[Tuple[List[User], PageInfo]]:
-        response = await api_query(USER_SEARCH_QUERY, dict(search=query, page=page, per_page=limit))
-        data = response.json()
-        return process_search_user(data)
-
-    @staticmethod
-    async def get_anime(id: int) -> Optional[Anime]:
-        response = await api_query(ANIME_GET_QUERY, dict(id=id, MediaType="ANIME"))
-        data = response.json()
-        return process_get_anime(data)
-
-    @staticmethod
-    async def get_manga(id: int) -> Optional[Manga]:
-        response = await api_query(MANGA_GET_QUERY, dict(id=id, MediaType="MANGA"))
-        data = response.json()
-        return process_get_manga(data)
-
-    @staticmethod
-    async def get_character(id: int) -> Optional[Character]:
-        response = await api_query(CHARACTER_GET_QUERY, dict(id=id))
-        data = response.json()
-        return process_get_character(data)
-
-    @staticmethod
-    async def get_staff(id: int) -> Optional[Staff]:
-        response = await api_query(STAFF_GET_QUERY, dict(id=id))
-        data = response.json()
-        return process_get_staff(data)
-
-    @staticmethod
-    async def get_user(name: str) -> Optional[User]:
-        response = await api_query(USER_GET_QUERY, dict(name=name))
-        data = response.json()
-        return process_get_user(data)
-
-    @staticmethod
+        return await self._drive(self._run(SEARCH["character"], dict(search=query, page=page, per_page=limit)))
+
+    async def search_staff(self, query: str, limit: int, page: int = 1) -> Optional[Tuple[List[Staff], PageInfo]]:
+        return await self._drive(self._run(SEARCH["staff"], dict(search=query, page=page, per_page=limit)))
+
+    async def search_user(self, query: str, limit: int, page: int = 1) -> Optional[Tuple[List[User], PageInfo]]:
+        return await self._drive(self._run(SEARCH["user"], dict(search=query, page=page, per_page=limit)))
+
+    async def get_anime(self, id: int, fields: Optional[Union[str, List[str]]] = None) -> Optional[Anime]:
+        return await self._drive(self._get_media(GET["anime"], id, fields))
+
+    async def get_manga(self, id: int, fields: Optional[Union[str, List[str]]] = None) -> Optional[Manga]:
+        return await self._drive(self._get_media(GET["manga"], id, fields))
+
+    async def get_many_anime(
+            self, ids: List[int], fields: Optional[Union[str, List[str]]] = None
+    ) -> List[Optional[Anime]]:
+        return await self._drive(self._fetch_many(GET_MANY["anime"], ids, fields))
+
+    async def get_many_manga(
+            self, ids: List[int], fields: Optional[Union[str, List[str]]] = None
+    ) -> List[Optional[Manga]]:
+        return await self._drive(self._fetch_many(GET_MANY["manga"], ids, fields))
+
+    async def get_character(self, id: int) -> Optional[Character]:
+        return await self._drive(self._get_character(id))
+
+    async def get_staff(self, id: int) -> Optional[Staff]:
+        return await self._drive(self._get_staff(id))
+
+    async def get_user(self, name: str) -> Optional[User]:
+        return await self._drive(self._get_user(name))
+
     async def get_list(
-            user_id: int, limit: int, page: int = 1, content_type: str = "anime"
+            self, user_id: int, limit: int, page: int = 1, content_type: str = "anime"
     ) -> Optional[Tuple[List[MediaList], List[MediaList]]]:
-        is_manga = "manga" in content_type
-        response = await api_query(LIST_GET_QUERY_ANIME if not is_manga else LIST_GET_QUERY_MANGA,
-                                   dict(user_id=user_id, page=page, per_page=limit))
-        data = response.json()
-        return process_get_list(data, content_type)
-
-    @staticmethod
-    async def get_list_item(name: str, id: int) -> Optional[MediaList]:
+        return await self._drive(self._get_list(user_id, limit, page, content_type))
+
+    async def get_list_collection(
+            self, user_id: Union[int, str], content_type: str = "anime", chunk_size: int = 500
+    ) -> Dict[str, List[MediaList]]:
+        """Fetches a user's whole list with AniList's MediaListCollection, up to 500 entries per request.
+
+        Each chunk is turned into `MediaList` objects as soon as it arrives. Entries of custom
+        lists are left out, as they also appear under their status.
+
+        Args:
+            user_id (Union[int, str]): Username or userid.
+            content_type (str, optional): anime or manga. Defaults to "anime".
+            chunk_size (int, optional): Entries per request, at most 500. Defaults to 500.
+
+        Raises:
+            TypeError: If the content type is invalid.
+            TypeError: If user_id is invalid.
+            TypeError: If chunk_size is not between 1 and 500.
+
+        Returns:
+            Dict[str, List[MediaList]]: Entries by status (CURRENT, PLANNING, COMPLETED, DROPPED, PAUSED
+                or REPEATING), most recently updated first.
+        """
+        return await self._drive(self._get_list_collection(user_id, content_type, chunk_size))
+
+    def stream_list(
+            self, user_id: Union[int, str], content_type: str = "anime", limit: int = MAX_PER_PAGE, page: int = 1
+    ) -> AsyncIterator[MediaList]:
+        """Yields the entries of a list page while the response is still downloading.
+
+        The body is parsed incrementally, so each entry is built as soon as it has arrived and
+        only one entry's JSON is held at a time. Streamed responses are not cached.
+
+        Args:
+            user_id (Union[int, str]): Username or userid.
+            content_type (str, optional): anime or manga. Defaults to "anime".
+            limit (int, optional): Maximum items per page. Defaults to 50.
+            page (int, optional): Current page. Defaults to 1.
+
+        Raises:
+            TypeError: If the content type is invalid.
+            TypeError: If user_id is invalid.
+
+        Yields:
+            MediaList: List entries, most recently updated first.
+        """
+        return self._drive_stream(self._stream_list(user_id, content_type, limit, page))
+
+    def stream_list_collection(
+            self, user_id: Union[int, str], content_type: str = "anime", chunk_size: int = 500
+    ) -> AsyncIterator[Tuple[str, MediaList]]:
+        """Streaming version of `get_list_collection()`, yielding entries as they arrive.
+
+        Args:
+            user_id (Union[int, str]): Username or userid.
+            content_type (str, optional): anime or manga. Defaults to "anime".
+            chunk_size (int, optional): Entries per request, at most 500. Defaults to 500.
+
+        Raises:
+            TypeError: If the content type is invalid.
+            TypeError: If user_id is invalid.
+            TypeError: If chunk_size is not between 1 and 500.
+
+        Yields:
+            Tuple[str, MediaList]: Status of the list holding the entry, and the entry.
+        """
+        return self._drive_stream(self._stream_list_collection(user_id, content_type, chunk_size))
+
+    def stream_activity(
+            self, user_id: Union[int, str], content_type: str = "anime", limit: int = MAX_PER_PAGE, page: int = 1
+    ) -> AsyncIterator[ListActivity]:
+        """Yields the list activities of a page while the response is still downloading.
+
+        Args:
+            user_id (Union[int, str]): Username or userid.
+            content_type (str, optional): anime or manga. Defaults to "anime".
+            limit (int, optional): Maximum items per page. Defaults to 50.
+            page (int, optional): Current page. Defaults to 1.
+
+        Raises:
+            TypeError: If the content type is invalid.
+            TypeError: If user_id is invalid.
+
+        Yields:
+            ListActivity: List activities, newest first.
+        """
+        return self._drive_stream(self._stream_activity(user_id, content_type, limit, page))
+
+    async def sync_list(
+            self,
+            user_id: Union[int, str],
+            content_type: str = "anime",
+            since: Optional[int] = None,
+            snapshot: Optional[Dict[int, MediaList]] = None,
+            limit: int = MAX_PER_PAGE,
+    ) -> Tuple[List[MediaList], Optional[int]]:
+        """Fetches the entries of a user's list updated since a watermark.
+
+        Lists are sorted by update time, so pages are fetched one at a time until an entry
+        older than the watermark shows up. Pass the returned watermark as `since` on the next
+        sync. Entries removed from the list are not reported. Entries updated in the same second
+        as the watermark are returned again, so changes made later in that second are not missed,
+        unless `snapshot` already holds them with that update time.
+
+        Args:
+            user_id (Union[int, str]): Username or userid.
+            content_type (str, optional): anime or manga. Defaults to "anime".
+            since (int, optional): Timestamp of the last sync. Defaults to None, which fetches the whole list.
+            snapshot (Dict[int, MediaList], optional): Previously synced entries by entry id. Changed
+                entries are stored in it in place. Defaults to None.
+            limit (int, optional): Maximum items per page. Defaults to 50.
+
+        Raises:
+            TypeError: If the content type is invalid.
+            TypeError: If user_id is invalid.
+
+        Returns:
+            Tuple[List[MediaList], Optional[int]]: Changed entries, most recently updated first, and the new watermark.
+        """
+        return await self._drive(self._sync_list(user_id, content_type, since, snapshot, limit))
+
+    async def get_list_item(self, name: str, id: int) -> Optional[MediaList]:
         """Returns list item from user.
 
         Args:
@@ -297,9 +529,7 @@ class Client:
         Returns:
             Optional[MediaList]: List item.
         """
-        response = await api_query(LIST_ITEM_GET_QUERY, dict(name=name, id=id))
-        data = response.json()
-        return process_get_list_item(data)
+        return await self._drive(self._get_list_item(name, id))
 
     async def get_activity(
             self,
@@ -313,7 +543,7 @@ class Client:
 
         Args:
             id (Union[int, str]): Username or userid.
-            content_type (str, optional): anime, manga, text or message. Defaults to "anime".
+            content_type (str, optional): anime, manga, text, message or message_sent. Defaults to "anime".
             page (int, optional): Current page. Defaults to 1.
             limit (int, optional): Maximum items per page. Defaults to 25.
             pagination (bool, optional): Option to return pagination info. Defaults to False.
@@ -325,83 +555,140 @@ class Client:
         Returns:
             Optional[List[ListActivity]]: User activity.
         """
-        if isinstance(content_type, str):
-            content_type = content_type.lower()
-        else:
-            raise TypeError(
-                f"content_type argument must be a string, not '{content_type.__class__.__name__}'"
-            )
-        if isinstance(id, str) and id.isdecimal():
-            id = int(id)
-        elif isinstance(id, str):
-            try:
-                user = await self.get_user(name=id)
-                id = user.id
-            except Exception:
-                raise TypeError(f"could not get userid from username '{id}'")
-        elif not isinstance(id, int):
-            raise TypeError(
-                f"id argument must be an int, not '{id.__class__.__name__}'"
-            )
-
-        activity: ListActivity
-        pages: PageInfo
-        if content_type == "anime":
-            activity, pages = await self.get_anime_activity(
-                user_id=id, page=page, limit=limit
-            )
-        elif content_type == "manga":
-            activity, pages = await self.get_manga_activity(
-                user_id=id, page=page, limit=limit
-            )
-        elif content_type == "text":
-            activity, pages = await self.get_text_activity(
-                user_id=id, page=page, limit=limit
-            )
-        elif content_type == "message":
-            return await self.get_message_activity(user_id=id, page=page, limit=limit)
-        else:
-            raise TypeError(f"Invalid content_type ({content_type}")
+        return await self._drive(self._get_activity(id, content_type, page, limit, pagination))
 
-        if pagination:
-            return activity, pages
-        return activity
-
-    @staticmethod
     async def get_anime_activity(
-            user_id: int, limit: int, page: int = 1
+            self, user_id: int, limit: int, page: int = 1
     ) -> Optional[Tuple[List[ListActivity], PageInfo]]:
-        response = await api_query(LIST_ACTIVITY_QUERY,
-                                   dict(user_id=user_id, page=page, per_page=limit, activity_type="ANIME_LIST"))
-        data = response.json()
-        return process_get_anime_activity(data)
+        return await self._drive(self._run(ACTIVITY["anime"], dict(user_id=user_id, page=page, per_page=limit)))
 
-    @staticmethod
-    async def get_manga_activity(user_id: int, limit: int, page: int = 1
+    async def get_manga_activity(self, user_id: int, limit: int, page: int = 1
                                  ) -> Optional[Tuple[List[ListActivity], PageInfo]]:
-        MANGA_ACTIVITY_QUERY = LIST_ACTIVITY_QUERY.replace("episodes", "chapters\nvolumes")
-        response = await api_query(MANGA_ACTIVITY_QUERY,
-                                   dict(user_id=user_id, page=page, per_page=limit, activity_type="MANGA_LIST"))
-        data = response.json()
-        return process_get_manga_activity(data)
-
-    @staticmethod
-    async def get_text_activity(user_id: int, limit: int, page: int = 1
+        return await self._drive(self._run(ACTIVITY["manga"], dict(user_id=user_id, page=page, per_page=limit)))
+
+    async def get_text_activity(self, user_id: int, limit: int, page: int = 1
                                 ) -> Optional[Tuple[List[TextActivity], PageInfo]]:
-        response = await api_query(TEXT_ACTIVITY_QUERY, dict(user_id=user_id, page=page, per_page=limit))
-        data = response.json()
-        return process_get_text_activity(data)
+        return await self._drive(self._run(ACTIVITY["text"], dict(user_id=user_id, page=page, per_page=limit)))
 
-    @staticmethod
-    async def get_message_activity(user_id: int, limit: int, page: int = 1
+    async def get_message_activity(self, user_id: int, limit: int, page: int = 1
                                    ) -> Optional[Tuple[List[TextActivity], PageInfo]]:
-        response = await api_query(MESSAGE_ACTIVITY_QUERY, dict(user_id=user_id, page=page, per_page=limit))
-        data = response.json()
-        return process_get_message_activity(data)
+        return await self._drive(self._run(ACTIVITY["message"], dict(user_id=user_id, page=page, per_page=limit)))
 
-    @staticmethod
-    async def get_message_activity_sent(user_id: int, limit: int, page: int = 1
+    async def get_message_activity_sent(self, user_id: int, limit: int, page: int = 1
                                         ) -> Optional[Tuple[List[TextActivity], PageInfo]]:
-        response = await api_query(MESSAGE_ACTIVITY_QUERY_SENT, dict(user_id=user_id, page=page, per_page=limit))
-        data = response.json()
-        return process_get_message_activity_sent(data)
+        return await self._drive(self._run(ACTIVITY["message_sent"], dict(user_id=user_id, page=page, per_page=limit)))
+
+    async def map(
+            self,
+            method: Union[str, Callable[..., Awaitable[Any]]],
+            args: Iterable[Any],
+            concurrency: int = 10,
+            progress: Optional[Progress] = None,
+    ) -> List[Any]:
+        """Calls a client method for every item of args, with a bounded number of calls in flight.
+
+        Every call shares this client's connection pool, so with HTTP/2 they are multiplexed
+        onto one connection, and they are paced by the rate limiter like any other request.
+        A failing call does not cancel the others.
+
+        Args:
+            method (Union[str, Callable[..., Awaitable[Any]]]): Method name, like "get_anime", or a coroutine function.
+            args (Iterable[Any]): Arguments of each call. Tuples are passed as positional arguments,
+                dicts as keyword arguments and anything else as the only argument.
+            concurrency (int, optional): Maximum calls in flight. Defaults to 10.
+            progress (Progress, optional): Called with the number of finished calls and the total
+                after each call. Defaults to None.
+
+        Raises:
+            TypeError: If method is not a client method name or a callable.
+            TypeError: If concurrency is not a positive int.
+
+        Returns:
+            List[Any]: Results in the order of args, with the raised exception in place of failed calls.
+        """
+        function = resolve_method(self, method)
+        check_concurrency(concurrency)
+        return await amap(function, args, concurrency=concurrency, progress=progress)
+
+    def iter_search(
+            self,
+            query: str,
+            content_type: str = "anime",
+            limit: int = 10,
+            max_items: Optional[int] = None,
+            concurrency: int = 2,
+    ) -> AsyncIterator[Union[Anime, Manga, Character, Staff, User]]:
+        """Iterates over every search result, fetching the next pages concurrently.
+
+        Args:
+            query (str): Search query.
+            content_type (str, optional): anime, manga, character, staff or user. Defaults to "anime".
+            limit (int, optional): Maximum items per page. Defaults to 10.
+            max_items (int, optional): Stop after this many items. Defaults to None.
+            concurrency (int, optional): Pages fetched ahead of the one being consumed. Defaults to 2.
+
+        Raises:
+            TypeError: If content type is not a string.
+            TypeError: If the content type is invalid.
+
+        Returns:
+            AsyncIterator[Union[Anime, Manga, Character, Staff, User]]: Search results.
+        """
+        return self._pages(self._search_pages(query, content_type, limit), limit, max_items, concurrency)
+
+    async def iter_list(
+            self,
+            user_id: Union[int, str],
+            content_type: str = "anime",
+            limit: int = 25,
+            max_items: Optional[int] = None,
+            concurrency: int = 2,
+    ) -> AsyncIterator[MediaList]:
+        """Iterates over every entry in a user's list, fetching the next pages concurrently.
+
+        Args:
+            user_id (Union[int, str]): Username or userid.
+            content_type (str, optional): anime or manga. Defaults to "anime".
+            limit (int, optional): Maximum items per page. Defaults to 25.
+            max_items (int, optional): Stop after this many items. Defaults to None.
+            concurrency (int, optional): Pages fetched ahead of the one being consumed. Defaults to 2.
+
+        Raises:
+            TypeError: If the content type is invalid.
+            TypeError: If user_id is invalid.
+
+        Yields:
+            MediaList: List entries, most recently updated first.
+        """
+        fetch = await self._drive(self._list_pages(user_id, content_type, limit))
+        async for item in self._pages(fetch, limit, max_items, concurrency):
+            yield item
+
+    async def iter_activity(
+            self,
+            id: Union[int, str],
+            content_type: str = "anime",
+            limit: int = 25,
+            max_items: Optional[int] = None,
+            concurrency: int = 2,
+    ) -> AsyncIterator[Union[ListActivity, TextActivity]]:
+        """Iterates over every activity of a user, fetching the next pages concurrently.
+
+        Args:
+            id (Union[int, str]): Username or userid.
+            content_type (str, optional): anime, manga, text, message or message_sent. Defaults to "anime".
+            limit (int, optional): Maximum items per page. Defaults to 25.
+            max_items (int, optional): Stop after this many items. Defaults to None.
+            concurrency (int, optional): Pages fetched ahead of the one being consumed. Defaults to 2.
+
+        Raises:
+            TypeError: If content type is not a string.
+            TypeError: If id is invalid.
+            TypeError: If the content type is invalid.
+
+        Yields:
+            Union[ListActivity, TextActivity]: User activity.
+        """
+        fetch = await self._drive(self._activity_pages(id, content_type, limit))
+        async for item in self._pages(fetch, limit, max_items, concurrency):
+            yield item
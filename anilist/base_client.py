@@ -0,0 +1,612 @@
+#!/usr/bin/env python3
+# SPDX-License-Identifier: MIT
+# Copyright (C) 2021-2022 Amano Team <https://amanoteam.com/> and the python-anilist contributors
+
+"""Request building, caching and response processing shared by `Client` and `AsyncClient`.
+
+Every client method is written once here as a flow: a generator that yields the I/O it
+needs as steps (`Send`, `Read`, `NextChunk`, `ACQUIRE`, `Blocking`, `Parallel`, `Batch`) and is sent
+back each step's result. `Client` runs the steps blocking and `AsyncClient` awaits them,
+so the transport is the only code the two clients do not share.
+"""
+
+from time import perf_counter
+from typing import Any, Callable, Dict, Generator, Iterable, List, Optional, Tuple, Union
+
+import httpx
+
+from . import queries
+from .cache import DiskCache, ResponseCache
+from .client_process import (
+    CONSTRUCTORS,
+    process_get_list_collection,
+    process_get_list_item,
+    process_list_activity_entry,
+    process_list_entry,
+    raise_for_errors,
+)
+from .decoder import Decoder, get_decoder
+from .documents import PERSISTED_QUERY_NOT_SUPPORTED, persisted_query_error
+from .metrics import Hook, Recorder
+from .operations import ACTIVITY, GET, GET_MANY, SEARCH, Operation, lookup
+from .pagination import merge_changes, updated_since
+from .projection import project, root_fields, selected_fields
+from .store import EntityStore
+from .stream import ArrayStream
+try:
+    from . import schema
+except ImportError:  # pragma: no cover
+    schema = None
+
+from .types import MediaList
+from .utils import HEADERS, chunk_ids
+
+Flow = Generator[Any, Any, Any]
+
+
+class Send:
+    """Step posting a query. Answered with the `httpx.Response`, or with the response and an
+    iterator over its body chunks when streamed."""
+
+    __slots__ = ("query", "variables", "headers", "extensions", "persisted", "stream")
+
+    def __init__(
+            self,
+            query: Optional[str],
+            variables: dict,
+            headers: Dict[str, str],
+            extensions: Optional[dict] = None,
+            persisted: Optional[str] = None,
+            stream: bool = False,
+    ) -> None:
+        self.query = query
+        self.variables = variables
+        self.headers = headers
+        self.extensions = extensions
+        self.persisted = persisted
+        self.stream = stream
+
+
+class Read:
+    """Step reading the rest of a streamed response."""
+
+    __slots__ = ("response",)
+
+    def __init__(self, response: httpx.Response) -> None:
+        self.response = response
+
+
+class NextChunk:
+    """Step answered with the next body chunk of a streamed response, None at the end."""
+
+    __slots__ = ("chunks",)
+
+    def __init__(self, chunks: Any) -> None:
+        self.chunks = chunks
+
+
+class Blocking:
+    """Step calling a blocking function, which `AsyncClient` runs on a worker thread."""
+
+    __slots__ = ("function", "args")
+
+    def __init__(self, function: Callable[..., Any], *args: Any) -> None:
+        self.function = function
+        self.args = args
+
+
+class Parallel:
+    """Step running flows concurrently, answered with their results in order. The first
+    exception raised by one of them is raised."""
+
+    __slots__ = ("flows",)
+
+    def __init__(self, flows: List[Flow]) -> None:
+        self.flows = flows
+
+
+class Batch:
+    """Step handing a lookup to the `Batcher` of an `AsyncClient`."""
+
+    __slots__ = ("kind", "variables")
+
+    def __init__(self, kind: str, variables: dict) -> None:
+        self.kind = kind
+        self.variables = variables
+
+
+class Item:
+    """Output of a streaming flow, passed on to the caller."""
+
+    __slots__ = ("value",)
+
+    def __init__(self, value: Any) -> None:
+        self.value = value
+
+
+# Step waiting for the rate limiter.
+ACQUIRE = object()
+
+
+class BaseClient:
+    batcher: Any = None
+    _asynchronous = False
+
+    def __init__(
+            self,
+            *,
+            http2: bool,
+            max_connections: Optional[int],
+            max_keepalive_connections: Optional[int],
+            keepalive_expiry: Optional[float],
+            cache: Optional[Union[ResponseCache, DiskCache]],
+            max_retries: int,
+            lazy: bool,
+            decoder: Union[str, Decoder],
+            typed: bool,
+            base_url: str,
+            transport: Any,
+            headers: Optional[Dict[str, str]],
+            store: Optional[EntityStore],
+            hooks: Optional[Iterable[Hook]],
+            minify: bool,
+            persisted_queries: bool,
+    ) -> None:
+        self.http2 = http2
+        self.limits = httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_keepalive_connections,
+            keepalive_expiry=keepalive_expiry,
+        )
+        self.cache = cache
+        self.max_retries = max_retries
+        self.lazy = lazy
+        self.decoder = get_decoder(decoder)
+        if typed and schema is None:
+            raise ImportError("msgspec is not installed, install python-anilist[msgspec].")
+        self.typed = typed
+        self.base_url = base_url
+        self.transport = transport
+        self.headers = {**HEADERS, **(headers or {})}
+        self.store = store
+        self.hooks: List[Hook] = list(hooks or [])
+        self.minify = minify
+        self.persisted_queries = persisted_queries
+
+    def _recorder(self, query: str, variables: dict) -> Optional[Recorder]:
+        return Recorder(self.hooks, query, variables, asynchronous=self._asynchronous) if self.hooks else None
+
+    def _process(self, recorder: Optional[Recorder], function: Callable[..., Any], *args: Any) -> Any:
+        if recorder is None:
+            return function(*args)
+        start = perf_counter()
+        result = function(*args)
+        recorder.emit("process", start)
+        return result
+
+    def _throttled(self, response: httpx.Response) -> bool:
+        return (
+            self.rate_limiter is not None
+            and self.rate_limiter.update(response.headers, response.status_code) is not None
+        )
+
+    def _cached(self, method: str, *args: Any) -> Flow:
+        # DiskCache reads and writes SQLite, so it is not called on the event loop.
+        function = getattr(self.cache, method)
+        if isinstance(self.cache, DiskCache):
+            return (yield Blocking(function, *args))
+        return function(*args)
+
+    def _send(
+            self,
+            query: Optional[str],
+            variables: dict,
+            headers: Dict[str, str],
+            extensions: Optional[dict],
+            digest: Optional[str],
+            recorder: Optional[Recorder],
+    ) -> Flow:
+        # Sends a request, queueing it again while it is throttled, at most max_retries times.
+        for _ in range(self.max_retries + 1):
+            if self.rate_limiter is not None:
+                yield ACQUIRE
+            start = perf_counter()
+            response = yield Send(query, variables, headers, extensions, digest)
+            if recorder is not None:
+                recorder.response(start, response)
+            if not self._throttled(response):
+                break
+        return response
+
+    def _request(
+            self,
+            query: str,
+            variables: dict,
+            content_type: Optional[str] = None,
+            response_type: Optional[type] = None,
+            recorder: Optional[Recorder] = None,
+    ) -> Flow:
+        if recorder is None:
+            recorder = self._recorder(query, variables)
+        headers, stale = self.headers, None
+        if self.cache is not None and response_type is None:
+            data, stale = yield from self._cached("lookup", query, variables)
+            if data is not None:
+                return data
+            if stale is not None:
+                headers = {**headers, "If-None-Match": stale[1]}
+
+        extensions = recorder.extensions if recorder is not None else None
+        text = queries.minified(query) if self.minify else query
+        digest = queries.digest(text) if self.persisted_queries else None
+        response = yield from self._send(
+            text if digest is None else None, variables, headers, extensions, digest, recorder
+        )
+        if digest is not None and response.status_code != 429:
+            error = persisted_query_error(response.content, self.decoder)
+            if error is not None:
+                # The server does not know the hash yet: send the full text once, outside the retries.
+                if error == PERSISTED_QUERY_NOT_SUPPORTED:
+                    self.persisted_queries = False
+                    digest = None
+                response = yield from self._send(text, variables, headers, extensions, digest, recorder)
+        if response.status_code == 429:
+            response.raise_for_status()
+        if response.status_code == 304 and stale is not None:
+            yield from self._cached("set", query, variables, stale[0], content_type, stale[1])
+            return stale[0]
+
+        start = perf_counter()
+        if response_type is not None:
+            data = schema.decode(response.content, response_type)
+        else:
+            data = self.decoder(response.content)
+        if recorder is not None:
+            recorder.emit("decode", start)
+        if response_type is not None:
+            return data
+        if self.cache is not None:
+            yield from self._cached("set", query, variables, data, content_type, response.headers.get("ETag"))
+        return data
+
+    def _call(
+            self, query: str, variables: dict, content_type: str, function: Callable[..., Any], *args: Any
+    ) -> Flow:
+        # _request followed by the process_* function, timed as one call.
+        recorder = self._recorder(query, variables)
+        data = yield from self._request(query, variables, content_type, recorder=recorder)
+        return self._process(recorder, function, data, *args)
+
+    def _run(self, operation: Operation, variables: dict, *args: Any, query: Optional[str] = None) -> Flow:
+        # Runs a registered operation, passing the client attributes it names to its processor.
+        options = [getattr(self, name) for name in operation.options]
+        return (yield from self._call(
+            query or operation.text(), operation.bind(variables), operation.content_type, operation.processor,
+            *operation.args, *args, *options,
+        ))
+
+    def _stored(
+            self, kind: str, ids: List[int], query: str, fields: Optional[Union[str, List[str]]] = None
+    ) -> Dict[int, Any]:
+        if self.store is None or self.typed:
+            return {}
+        names = selected_fields(query, fields, kind) if kind in ("anime", "manga") else root_fields(query)
+        found = {}
+        for id in dict.fromkeys(ids):
+            item = self.store.lookup(kind, id, names, CONSTRUCTORS[kind])
+            if item is not None:
+                found[id] = item
+        return found
+
+    def _stream(
+            self, query: str, variables: dict, parser: ArrayStream, process: Callable[[Any, Dict[str, Any]], Any]
+    ) -> Flow:
+        # Streamed responses skip the cache, the rest mirrors _request. Every entry is passed
+        # to process() as it arrives, and its result, unless None, is yielded as an Item.
+        recorder = self._recorder(query, variables)
+        extensions = recorder.extensions if recorder is not None else None
+        text = queries.minified(query) if self.minify else query
+        for attempt in range(self.max_retries + 1):
+            if self.rate_limiter is not None:
+                yield ACQUIRE
+            start = perf_counter()
+            response, chunks = yield Send(text, variables, self.headers, extensions, stream=True)
+            if self._throttled(response) and attempt < self.max_retries:
+                yield Read(response)
+                continue
+            if response.status_code == 429:
+                yield Read(response)
+                response.raise_for_status()
+            size = 0
+            while True:
+                chunk = yield NextChunk(chunks)
+                if chunk is None:
+                    break
+                size += len(chunk)
+                for raw, context in parser.feed(chunk):
+                    item = process(self.decoder(raw), context)
+                    if item is not None:
+                        yield Item(item)
+            values = parser.close()
+            if recorder is not None:
+                recorder.response(start, response, size)
+            raise_for_errors(values)
+            return
+
+    def _resolve_user_id(self, id: Union[int, str]) -> Flow:
+        if isinstance(id, str) and id.isdecimal():
+            return int(id)
+        elif isinstance(id, str):
+            try:
+                return (yield from self._get_user(name=id)).id
+            except Exception:
+                raise TypeError(f"could not get userid from username '{id}'")
+        elif not isinstance(id, int):
+            raise TypeError(
+                f"id argument must be an int, not '{id.__class__.__name__}'"
+            )
+        return id
+
+    def _search(self, query: str, content_type: str, page: int, limit: int, pagination: bool) -> Flow:
+        operation = lookup(SEARCH, content_type)
+        if not isinstance(query, str):
+            raise TypeError(
+                f"query argument must be a string, not '{query.__class__.__name__}'"
+            )
+        if isinstance(limit, str) and limit.isdecimal():
+            limit = int(limit)
+        elif not isinstance(limit, int):
+            raise TypeError(
+                f"limit argument must be an int, not '{limit.__class__.__name__}'"
+            )
+
+        search, pages = yield from self._run(operation, dict(search=query, page=page, per_page=limit))
+
+        if pagination:
+            return search, pages
+        return search
+
+    def _get(
+            self,
+            id: Union[int, str],
+            content_type: str,
+            page: int,
+            limit: int,
+            pagination: bool,
+            fields: Optional[Union[str, List[str]]],
+    ) -> Flow:
+        operation = lookup(GET, content_type)
+        if isinstance(id, str) and id.isdecimal():
+            id = int(id)
+        elif not isinstance(id, int):
+            if operation.content_type == "user":
+                return (yield from self._get_user(name=id))
+            elif operation.content_type == "list":
+                try:
+                    user = yield from self._get_user(name=id)
+                    id = user.id
+                except Exception:
+                    raise TypeError("user not found")
+            else:
+                raise TypeError(
+                    f"id argument must be a string, not '{id.__class__.__name__}'"
+                )
+        if operation.content_type == "user":
+            raise TypeError("id argument must be a string for the user object.")
+
+        if operation.content_type == "list":
+            items, pages = yield from self._get_list(
+                user_id=id, limit=limit, page=page, content_type=operation.args[0]
+            )
+            if pagination:
+                return items, pages
+            return items
+        if operation.content_type in ("anime", "manga"):
+            return (yield from self._get_media(operation, id, fields))
+        return (yield from getattr(self, f"_{operation.method}")(id=id))
+
+    def _get_many(
+            self, ids: List[Union[int, str]], content_type: str, fields: Optional[Union[str, List[str]]]
+    ) -> Flow:
+        operation = lookup(GET_MANY, content_type)
+        ids = [int(id) if isinstance(id, str) and id.isdecimal() else id for id in ids]
+        for id in ids:
+            if not isinstance(id, int):
+                raise TypeError(
+                    f"id argument must be an int, not '{id.__class__.__name__}'"
+                )
+
+        return (yield from self._fetch_many(operation, ids, fields))
+
+    def _get_media(self, operation: Operation, id: int, fields: Optional[Union[str, List[str]]]) -> Flow:
+        query = project(operation.text(), fields, operation.content_type)
+        variables = operation.bind(dict(id=id))
+        if self.typed:
+            data = yield from self._request(query, variables, response_type=schema.MediaResponse)
+            return schema.process_media(data)
+        stored = self._stored(operation.content_type, [id], operation.text(), fields)
+        if stored:
+            return stored[id]
+        return (yield from self._run(operation, variables, query=query))
+
+    def _fetch_many(
+            self, operation: Operation, ids: List[int], fields: Optional[Union[str, List[str]]]
+    ) -> Flow:
+        query = project(operation.text(), fields, operation.content_type)
+        found = self._stored(operation.content_type, ids, operation.text(), fields)
+        chunks = chunk_ids([id for id in ids if id not in found])
+        pages = yield Parallel([
+            self._run(operation, dict(ids=chunk, per_page=len(chunk)), chunk, query=query) for chunk in chunks
+        ])
+        for chunk, items in zip(chunks, pages):
+            found.update(zip(chunk, items))
+        return [found[id] for id in ids]
+
+    def _get_character(self, id: int) -> Flow:
+        stored = self._stored("character", [id], queries.CHARACTER_GET_QUERY)
+        if stored:
+            return stored[id]
+        if self.batcher is not None:
+            return (yield Batch("character", dict(id=id)))
+        return (yield from self._run(GET["character"], dict(id=id)))
+
+    def _get_staff(self, id: int) -> Flow:
+        stored = self._stored("staff", [id], queries.STAFF_GET_QUERY)
+        if stored:
+            return stored[id]
+        if self.batcher is not None:
+            return (yield Batch("staff", dict(id=id)))
+        return (yield from self._run(GET["staff"], dict(id=id)))
+
+    def _get_user(self, name: str) -> Flow:
+        if self.typed:
+            data = yield from self._request(queries.USER_GET_QUERY, dict(name=name), response_type=schema.UserResponse)
+            return schema.process_user(data)
+        if self.batcher is not None:
+            return (yield Batch("user", dict(name=name)))
+        return (yield from self._run(GET["user"], dict(name=name)))
+
+    def _get_list(self, user_id: int, limit: int, page: int = 1, content_type: str = "anime") -> Flow:
+        operation = GET["list_manga" if "manga" in content_type else "list_anime"]
+        variables = dict(user_id=user_id, page=page, per_page=limit)
+        if self.typed:
+            data = yield from self._request(operation.text(), variables, response_type=schema.ListResponse)
+            return schema.process_list(data, content_type)
+        return (yield from self._run(operation, variables))
+
+    def _get_list_collection(self, user_id: Union[int, str], content_type: str, chunk_size: int) -> Flow:
+        if content_type not in ["anime", "manga"]:
+            raise TypeError("There is no such content type.")
+        if not isinstance(chunk_size, int) or not 1 <= chunk_size <= 500:
+            raise TypeError(f"chunk_size argument must be between 1 and 500, not {chunk_size!r}")
+        user_id = yield from self._resolve_user_id(user_id)
+        query = queries.LIST_COLLECTION_QUERY_MANGA if content_type == "manga" else queries.LIST_COLLECTION_QUERY_ANIME
+
+        groups: Dict[str, List[MediaList]] = {}
+        chunk = 1
+        while True:
+            variables = dict(user_id=user_id, chunk=chunk, per_chunk=chunk_size)
+            result = yield from self._call(
+                query, variables, "list", process_get_list_collection, content_type, self.lazy, self.store
+            )
+            if result is None:
+                break
+            entries, has_next = result
+            for status, items in entries.items():
+                groups.setdefault(status, []).extend(items)
+            if not has_next:
+                break
+            chunk += 1
+        return groups
+
+    def _stream_list(self, user_id: Union[int, str], content_type: str, limit: int, page: int) -> Flow:
+        if content_type not in ["anime", "manga"]:
+            raise TypeError("There is no such content type.")
+        user_id = yield from self._resolve_user_id(user_id)
+        is_manga = content_type == "manga"
+        query = queries.LIST_GET_QUERY_MANGA if is_manga else queries.LIST_GET_QUERY_ANIME
+        parser = ArrayStream(("data", content_type, "mediaList"))
+        yield from self._stream(
+            query, dict(user_id=user_id, page=page, per_page=limit), parser,
+            lambda item, _: process_list_entry(item, is_manga, self.lazy, self.store),
+        )
+
+    def _stream_list_collection(self, user_id: Union[int, str], content_type: str, chunk_size: int) -> Flow:
+        if content_type not in ["anime", "manga"]:
+            raise TypeError("There is no such content type.")
+        if not isinstance(chunk_size, int) or not 1 <= chunk_size <= 500:
+            raise TypeError(f"chunk_size argument must be between 1 and 500, not {chunk_size!r}")
+        user_id = yield from self._resolve_user_id(user_id)
+        is_manga = content_type == "manga"
+        query = queries.LIST_COLLECTION_QUERY_MANGA if is_manga else queries.LIST_COLLECTION_QUERY_ANIME
+
+        def entry(item: Any, group: Dict[str, Any]) -> Optional[Tuple[str, MediaList]]:
+            if group.get("isCustomList"):
+                return None
+            return group["status"], process_list_entry(item, is_manga, self.lazy, self.store)
+
+        chunk = 1
+        while True:
+            parser = ArrayStream(("data", content_type, "lists", "*", "entries"))
+            variables = dict(user_id=user_id, chunk=chunk, per_chunk=chunk_size)
+            yield from self._stream(query, variables, parser, entry)
+            collection = (parser.values.get("data") or {}).get(content_type) or {}
+            if not collection.get("hasNextChunk"):
+                return
+            chunk += 1
+
+    def _stream_activity(self, user_id: Union[int, str], content_type: str, limit: int, page: int) -> Flow:
+        if content_type not in ["anime", "manga"]:
+            raise TypeError("There is no such content type.")
+        user_id = yield from self._resolve_user_id(user_id)
+        is_manga = content_type == "manga"
+        query = queries.LIST_ACTIVITY_QUERY_MANGA if is_manga else queries.LIST_ACTIVITY_QUERY
+        variables = dict(user_id=user_id, page=page, per_page=limit, activity_type=f"{content_type.upper()}_LIST")
+        parser = ArrayStream(("data", "Page", "activities"))
+        yield from self._stream(
+            query, variables, parser, lambda item, _: process_list_activity_entry(item, is_manga, self.lazy, self.store)
+        )
+
+    def _sync_list(
+            self,
+            user_id: Union[int, str],
+            content_type: str,
+            since: Optional[int],
+            snapshot: Optional[Dict[int, MediaList]],
+            limit: int,
+    ) -> Flow:
+        if content_type not in ["anime", "manga"]:
+            raise TypeError("There is no such content type.")
+        user_id = yield from self._resolve_user_id(user_id)
+
+        changed = []
+        page = 1
+        while True:
+            result = yield from self._get_list(user_id=user_id, limit=limit, page=page, content_type=content_type)
+            if not result:
+                break
+            entries, pages = result
+            entries, reached = updated_since(entries, since, snapshot)
+            changed.extend(entries)
+            if reached or page >= pages.last:
+                break
+            page += 1
+        return changed, merge_changes(changed, since, snapshot)
+
+    def _get_list_item(self, name: str, id: int) -> Flow:
+        variables = dict(name=name, id=id)
+        return (yield from self._call(queries.LIST_ITEM_GET_QUERY, variables, "list", process_get_list_item))
+
+    def _get_activity(
+            self, id: Union[int, str], content_type: str, page: int, limit: int, pagination: bool
+    ) -> Flow:
+        operation = lookup(ACTIVITY, content_type)
+        id = yield from self._resolve_user_id(id)
+
+        variables = dict(user_id=id, page=page, per_page=limit)
+        if not operation.paged:
+            return (yield from self._run(operation, variables))
+        activity, pages = yield from self._run(operation, variables)
+        if pagination:
+            return activity, pages
+        return activity
+
+    def _search_pages(self, query: str, content_type: str, limit: int) -> Callable[[int], Flow]:
+        operation = lookup(SEARCH, content_type)
+        return lambda page: self._run(operation, dict(search=query, page=page, per_page=limit))
+
+    def _list_pages(self, user_id: Union[int, str], content_type: str, limit: int) -> Flow:
+        if content_type not in ["anime", "manga"]:
+            raise TypeError("There is no such content type.")
+        user_id = yield from self._resolve_user_id(user_id)
+        return lambda page: self._get_list(user_id=user_id, limit=limit, page=page, content_type=content_type)
+
+    def _activity_pages(self, id: Union[int, str], content_type: str, limit: int) -> Flow:
+        operation = lookup(ACTIVITY, content_type)
+        id = yield from self._resolve_user_id(id)
+
+        def fetch(page: int) -> Flow:
+            activity = yield from self._run(operation, dict(user_id=id, page=page, per_page=limit))
+            return activity if operation.paged else activity and (activity, None)
+
+        return fetch
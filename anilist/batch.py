@@ -0,0 +1,212 @@
+#!/usr/bin/env python3
+# SPDX-License-Identifier: MIT
+# Copyright (C) 2021-2022 Amano Team <https://amanoteam.com/> and the python-anilist contributors
+
+import asyncio
+import json
+import re
+from functools import lru_cache
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple
+
+from .client_process import raise_for_errors
+from .operations import GET
+from .store import EntityStore
+
+_COMMENT = re.compile(r"#[^\n]*")
+_VARIABLE = re.compile(r"\$(\w+)")
+_DEFINITION = re.compile(r"\$(\w+)\s*:\s*([^,$]+)")
+
+
+def split_query(query: str) -> Tuple[Dict[str, str], str]:
+    """Splits a single operation query into its variable definitions and root selection.
+
+    Args:
+        query (str): GraphQL query text, like the ones in `queries/_query_files`.
+
+    Returns:
+        Tuple[Dict[str, str], str]: Variable types (with defaults) by name, and the text
+        between the outermost braces.
+    """
+    query = _COMMENT.sub("", query).strip()
+    start = query.index("{")
+    header = query[:start]
+    definitions = {}
+    if "(" in header:
+        arguments = header[header.index("(") + 1:header.rindex(")")]
+        definitions = {name: kind.strip() for name, kind in _DEFINITION.findall(arguments)}
+    return definitions, query[start + 1:query.rindex("}")].strip()
+
+
+class BatchTemplate:
+    """Root selection of a `get` query that can be merged into a larger document.
+
+    Args:
+        query (str): Single item query text.
+        processor (Callable[[dict], Any]): `process_get_*` function for its response.
+        prefix (str): Alias prefix, like "c" for `c1: Character(...)`.
+    """
+
+    def __init__(self, query: str, processor: Callable[[dict], Any], prefix: str) -> None:
+        self.definitions, self.selection = split_query(query)
+        self.root = re.match(r"\w+", self.selection).group()
+        self.processor = processor
+        self.prefix = prefix
+
+    def render(self, alias: str) -> Tuple[List[str], str]:
+        """Renders the selection under an alias, renaming its variables to `<alias>_<name>`.
+
+        Returns:
+            Tuple[List[str], str]: Variable definitions and the aliased selection.
+        """
+        definitions = [f"${alias}_{name}: {kind}" for name, kind in self.definitions.items()]
+        selection = _VARIABLE.sub(lambda match: f"${alias}_{match.group(1)}", self.selection)
+        return definitions, f"{alias}: {selection}"
+
+    def process(self, item: Optional[dict], store: Optional[EntityStore] = None) -> Any:
+        if item is None:
+            return None
+        return self.processor({"data": {self.root: item}}, store)
+
+
+# Content type to the alias prefix of its template, the query and processor come from GET.
+TEMPLATE_QUERIES = {
+    "anime": "a",
+    "manga": "m",
+    "character": "c",
+    "staff": "s",
+    "user": "u",
+}
+
+
+@lru_cache(maxsize=None)
+def get_template(content_type: str) -> BatchTemplate:
+    """Returns the template of a content type, built on first use."""
+    operation = GET[content_type]
+    return BatchTemplate(operation.text(), operation.processor, TEMPLATE_QUERIES[content_type])
+
+
+def build_document(requests: List[Tuple[str, dict]]) -> Tuple[str, dict, List[str]]:
+    """Merges several lookups into one GraphQL document using field aliases.
+
+    Args:
+        requests (List[Tuple[str, dict]]): Content type and variables of each lookup.
+
+    Returns:
+        Tuple[str, dict, List[str]]: Document, its variables and the alias of each lookup.
+    """
+    definitions = []
+    selections = []
+    variables = {}
+    aliases = []
+    counters: Dict[str, int] = {}
+    for content_type, values in requests:
+        template = get_template(content_type)
+        counters[content_type] = counters.get(content_type, 0) + 1
+        alias = f"{template.prefix}{counters[content_type]}"
+        rendered_definitions, selection = template.render(alias)
+        definitions.extend(rendered_definitions)
+        selections.append(selection)
+        variables.update(
+            {f"{alias}_{name}": value for name, value in values.items() if name in template.definitions}
+        )
+        aliases.append(alias)
+
+    document = "query Batch({}) {{\n{}\n}}".format(", ".join(definitions), "\n".join(selections))
+    return document, variables, aliases
+
+
+class Batcher:
+    """Coalesces lookups issued within a short window into a single aliased request.
+
+    Lookups are queued by `load()` and sent together once `window` seconds have passed
+    since the first one, or as soon as `max_batch` distinct lookups are queued. Identical
+    lookups in the same batch share one alias.
+
+    Args:
+        client (AsyncClient): Client used to send the merged documents.
+        window (float, optional): Seconds to wait for more lookups. Defaults to 0.01.
+        max_batch (int, optional): Maximum distinct lookups per request. AniList rejects
+            documents above its complexity limit, so keep it low for heavy lookups. Defaults to 10.
+    """
+
+    def __init__(self, client, *, window: float = 0.01, max_batch: int = 10) -> None:
+        self.client = client
+        self.window = window
+        self.max_batch = max_batch
+        self._pending: Dict[Tuple[str, str], Tuple[str, dict, List[asyncio.Future]]] = {}
+        self._timer: Optional[asyncio.TimerHandle] = None
+        # Dispatch tasks in flight, referenced until done so they are not garbage collected.
+        self._tasks: Set[asyncio.Task] = set()
+
+    async def load(self, content_type: str, variables: dict) -> Any:
+        """Queues a lookup and waits for its result.
+
+        Args:
+            content_type (str): anime, manga, character, staff or user.
+            variables (dict): Variables of the single item query.
+
+        Raises:
+            TypeError: If the content type can not be batched.
+            ValueError: If AniList answered the merged document with errors and no data.
+
+        Returns:
+            Any: What the matching `process_get_*` function returns, None if not found.
+        """
+        if content_type not in TEMPLATE_QUERIES:
+            raise TypeError("There is no such content type.")
+
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        key = (content_type, json.dumps(variables, sort_keys=True, default=str))
+        if key in self._pending:
+            self._pending[key][2].append(future)
+        else:
+            self._pending[key] = (content_type, variables, [future])
+
+        if len(self._pending) >= self.max_batch:
+            self.flush()
+        elif self._timer is None:
+            self._timer = loop.call_later(self.window, self.flush)
+        return await future
+
+    def flush(self) -> None:
+        """Sends the queued lookups right away."""
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        if not self._pending:
+            return
+        batch = list(self._pending.values())
+        self._pending = {}
+        task = asyncio.ensure_future(self._dispatch(batch))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _dispatch(self, batch: List[Tuple[str, dict, List[asyncio.Future]]]) -> None:
+        document, variables, aliases = build_document([(kind, values) for kind, values, _ in batch])
+        content_type = None
+        if self.client.cache is not None:
+            content_type = min((kind for kind, _, _ in batch), key=self.client.cache.get_ttl)
+
+        try:
+            data = await self.client._query(document, variables, content_type)
+            raise_for_errors(data)
+        except Exception as error:
+            for _, _, futures in batch:
+                for future in futures:
+                    if not future.done():
+                        future.set_exception(error)
+            return
+
+        items = data.get("data") or {}
+        for alias, (kind, _, futures) in zip(aliases, batch):
+            try:
+                result = get_template(kind).process(items.get(alias), self.client.store)
+            except Exception as error:
+                for future in futures:
+                    if not future.done():
+                        future.set_exception(error)
+                continue
+            for future in futures:
+                if not future.done():
+                    future.set_result(result)
@@ -0,0 +1,459 @@
+#!/usr/bin/env python3
+# SPDX-License-Identifier: MIT
+# Copyright (C) 2021-2022 Amano Team <https://amanoteam.com/> and the python-anilist contributors
+
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+import zlib
+from collections import OrderedDict
+from typing import Dict, Hashable, Optional, Tuple
+
+DEFAULT_TTLS = {
+    "anime": 300.0,
+    "manga": 900.0,
+    "character": 3600.0,
+    "staff": 3600.0,
+    "user": 300.0,
+    "list": 60.0,
+    "activity": 30.0,
+}
+
+
+def cache_key(query: str, variables: Optional[dict]) -> Tuple[str, str]:
+    """Builds the cache key of a request.
+
+    Args:
+        query (str): GraphQL query text.
+        variables (dict, optional): Query variables.
+
+    Returns:
+        Tuple[str, str]: Query text and the variables serialized with sorted keys.
+    """
+    return query, json.dumps(variables, sort_keys=True, separators=(",", ":"), default=str)
+
+
+def _is_cacheable(data: Optional[dict]) -> bool:
+    return isinstance(data, dict) and bool(data.get("data")) and not data.get("errors")
+
+
+class ResponseCache:
+    """In-memory cache for API responses with LRU eviction and a TTL per content type.
+
+    Only successful responses are stored. The cache is thread-safe, so it can be shared
+    between clients.
+
+    Args:
+        max_size (int, optional): Maximum stored responses. Defaults to 1024.
+        ttl (float, optional): Seconds a response of an unlisted content type stays fresh. Defaults to 300.
+        ttls (Dict[str, float], optional): Seconds per content type, merged over `DEFAULT_TTLS`.
+            A TTL of 0 disables caching for that content type.
+
+    Attributes:
+        hits (int): Requests answered from the cache.
+        misses (int): Requests that were not in the cache or were expired.
+        evictions (int): Entries dropped to stay under `max_size`.
+    """
+
+    def __init__(
+        self,
+        *,
+        max_size: int = 1024,
+        ttl: float = 300.0,
+        ttls: Dict[str, float] = None,
+    ) -> None:
+        if max_size < 1:
+            raise TypeError("max_size argument must be at least 1")
+
+        self.max_size = max_size
+        self.ttl = ttl
+        self.ttls = dict(DEFAULT_TTLS)
+        if ttls:
+            self.ttls.update(ttls)
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+        self._entries: "OrderedDict[Hashable, Tuple[float, dict]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get_ttl(self, content_type: Optional[str]) -> float:
+        """Returns the TTL in seconds for the given content type."""
+        return self.ttls.get(content_type, self.ttl)
+
+    def get(self, query: str, variables: Optional[dict]) -> Optional[dict]:
+        """Returns a fresh cached response, if any.
+
+        Args:
+            query (str): GraphQL query text.
+            variables (dict, optional): Query variables.
+
+        Returns:
+            Optional[dict]: Decoded response.
+        """
+        key = cache_key(query, variables)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            expires, data = entry
+            if expires <= time.monotonic():
+                del self._entries[key]
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return data
+
+    def stale(self, query: str, variables: Optional[dict]) -> Optional[Tuple[dict, str]]:
+        """Returns an expired response and its ETag, for a conditional request.
+
+        Expired entries are dropped from memory, so this cache never has one.
+        """
+        return None
+
+    def lookup(self, query: str, variables: Optional[dict]) -> Tuple[Optional[dict], Optional[Tuple[dict, str]]]:
+        """Returns a fresh cached response, or an expired one to revalidate, see `DiskCache.lookup()`."""
+        return self.get(query, variables), None
+
+    def set(
+        self,
+        query: str,
+        variables: Optional[dict],
+        data: Optional[dict],
+        content_type: Optional[str] = None,
+        etag: Optional[str] = None,
+    ) -> None:
+        """Stores a decoded response. Error responses are ignored.
+
+        Args:
+            query (str): GraphQL query text.
+            variables (dict, optional): Query variables.
+            data (dict, optional): Decoded response.
+            content_type (str, optional): Content type used to pick the TTL.
+            etag (str, optional): ETag of the response. Not used by the in-memory cache.
+        """
+        if not _is_cacheable(data):
+            return
+        ttl = self.get_ttl(content_type)
+        if ttl <= 0:
+            return
+
+        key = cache_key(query, variables)
+        with self._lock:
+            self._entries[key] = (time.monotonic() + ttl, data)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self) -> None:
+        """Removes every entry. Counters are kept."""
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict[str, int]:
+        """Returns the cache counters.
+
+        Returns:
+            Dict[str, int]: size, hits, misses and evictions.
+        """
+        with self._lock:
+            return dict(
+                size=len(self._entries),
+                hits=self.hits,
+                misses=self.misses,
+                evictions=self.evictions,
+            )
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class DiskCache:
+    """SQLite cache for API responses that survives process restarts.
+
+    It has the same interface as `ResponseCache`, so it can be passed to `Client(cache=...)`
+    or `AsyncClient(cache=...)`. Responses are stored zlib compressed under a hash of the
+    query and variables, in a database in WAL mode so several processes can read it while
+    one writes. When the stored size goes over `max_bytes`, the least recently read
+    entries are evicted. The size is tracked as entries are written, and summed again
+    from the database only when it goes over `max_bytes`, so entries written by other
+    processes are counted then. Hits record their access time in memory, and the times are written
+    in one batch by the next `set()` or `close()`, or after `ACCESS_BATCH` hits, so readers
+    do not take the write lock on every read.
+
+    `AsyncClient` calls it on a worker thread, so reads and writes do not block the event loop.
+
+    Expired responses with an ETag are kept until evicted. The clients send their ETag in
+    `If-None-Match` and, when AniList answers 304 Not Modified, store them again with a new TTL.
+
+    Args:
+        path (str): Database file. It is created if missing.
+        max_bytes (int, optional): Maximum compressed size of the stored responses. Defaults to 64 MiB.
+        ttl (float, optional): Seconds a response of an unlisted content type stays fresh. Defaults to 300.
+        ttls (Dict[str, float], optional): Seconds per content type, merged over `DEFAULT_TTLS`.
+            A TTL of 0 disables caching for that content type.
+        compression (int, optional): zlib compression level. Defaults to 6.
+
+    Attributes:
+        hits (int): Requests answered from the cache by this instance.
+        misses (int): Requests that were not in the cache or were expired.
+        evictions (int): Entries this instance dropped to stay under `max_bytes`.
+    """
+
+    # Pending access times written at once, so cache hits do not each take the write lock.
+    ACCESS_BATCH = 256
+
+    def __init__(
+        self,
+        path: str,
+        *,
+        max_bytes: int = 64 * 1024 * 1024,
+        ttl: float = 300.0,
+        ttls: Dict[str, float] = None,
+        compression: int = 6,
+    ) -> None:
+        if max_bytes < 1:
+            raise TypeError("max_bytes argument must be at least 1")
+
+        self.path = os.fspath(path)
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.ttls = dict(DEFAULT_TTLS)
+        if ttls:
+            self.ttls.update(ttls)
+        self.compression = compression
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+        self._lock = threading.Lock()
+        self._connection: Optional[sqlite3.Connection] = None
+        self._pid: Optional[int] = None
+        self._accessed: Dict[str, float] = {}
+        self._bytes = 0
+        with self._lock:
+            self._connect()
+
+    def _connect(self) -> sqlite3.Connection:
+        # A connection must not be used across fork, so each process opens its own.
+        if self._connection is None or self._pid != os.getpid():
+            connection = sqlite3.connect(self.path, timeout=30, check_same_thread=False, isolation_level=None)
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+            connection.execute(
+                "CREATE TABLE IF NOT EXISTS responses ("
+                "key TEXT PRIMARY KEY, expires REAL NOT NULL, accessed REAL NOT NULL, "
+                "etag TEXT, size INTEGER NOT NULL, body BLOB NOT NULL)"
+            )
+            connection.execute("CREATE INDEX IF NOT EXISTS responses_accessed ON responses (accessed)")
+            self._connection = connection
+            self._pid = os.getpid()
+            self._accessed.clear()
+            self._bytes = self._stored_bytes(connection)
+        return self._connection
+
+    def _flush(self, connection: sqlite3.Connection) -> None:
+        if not self._accessed:
+            return
+        accessed = [(time, key) for key, time in self._accessed.items()]
+        self._accessed.clear()
+        with connection:
+            connection.execute("BEGIN")
+            connection.executemany("UPDATE responses SET accessed = MAX(accessed, ?) WHERE key = ?", accessed)
+
+    @staticmethod
+    def _stored_bytes(connection: sqlite3.Connection) -> int:
+        return connection.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+
+    @staticmethod
+    def key(query: str, variables: Optional[dict]) -> str:
+        """Returns the database key of a request, a SHA-256 of `cache_key()`."""
+        query, variables = cache_key(query, variables)
+        return hashlib.sha256(f"{query}\0{variables}".encode()).hexdigest()
+
+    def get_ttl(self, content_type: Optional[str]) -> float:
+        """Returns the TTL in seconds for the given content type."""
+        return self.ttls.get(content_type, self.ttl)
+
+    def _read(self, key: str) -> Optional[Tuple[float, Optional[str], bytes]]:
+        return self._connect().execute(
+            "SELECT expires, etag, body FROM responses WHERE key = ?", (key,)
+        ).fetchone()
+
+    def _fetch(
+        self, query: str, variables: Optional[dict]
+    ) -> Tuple[bool, Optional[Tuple[float, Optional[str], bytes]]]:
+        # Reads an entry, counting a hit and recording the access time when it is fresh.
+        key = self.key(query, variables)
+        now = time.time()
+        with self._lock:
+            row = self._read(key)
+            if row is None or row[0] <= now:
+                self.misses += 1
+                return False, row
+            self._accessed[key] = now
+            if len(self._accessed) >= self.ACCESS_BATCH:
+                self._flush(self._connect())
+            self.hits += 1
+        return True, row
+
+    def get(self, query: str, variables: Optional[dict]) -> Optional[dict]:
+        """Returns a fresh cached response, if any.
+
+        Args:
+            query (str): GraphQL query text.
+            variables (dict, optional): Query variables.
+
+        Returns:
+            Optional[dict]: Decoded response.
+        """
+        fresh, row = self._fetch(query, variables)
+        return json.loads(zlib.decompress(row[2])) if fresh else None
+
+    def lookup(self, query: str, variables: Optional[dict]) -> Tuple[Optional[dict], Optional[Tuple[dict, str]]]:
+        """Returns a fresh cached response or, failing that, an expired one and its ETag, with one read.
+
+        The clients use it instead of `get()` followed by `stale()`.
+
+        Args:
+            query (str): GraphQL query text.
+            variables (dict, optional): Query variables.
+
+        Returns:
+            Tuple[Optional[dict], Optional[Tuple[dict, str]]]: Fresh response, or None and the expired
+                response with its ETag, None if there is no entry with an ETag.
+        """
+        fresh, row = self._fetch(query, variables)
+        if fresh:
+            return json.loads(zlib.decompress(row[2])), None
+        if row is None or not row[1]:
+            return None, None
+        return None, (json.loads(zlib.decompress(row[2])), row[1])
+
+    def stale(self, query: str, variables: Optional[dict]) -> Optional[Tuple[dict, str]]:
+        """Returns an expired response and its ETag, for a conditional request.
+
+        Args:
+            query (str): GraphQL query text.
+            variables (dict, optional): Query variables.
+
+        Returns:
+            Optional[Tuple[dict, str]]: Decoded response and ETag, None if there is no entry with an ETag.
+        """
+        with self._lock:
+            row = self._read(self.key(query, variables))
+        if row is None or not row[1]:
+            return None
+        return json.loads(zlib.decompress(row[2])), row[1]
+
+    def set(
+        self,
+        query: str,
+        variables: Optional[dict],
+        data: Optional[dict],
+        content_type: Optional[str] = None,
+        etag: Optional[str] = None,
+    ) -> None:
+        """Stores a decoded response. Error responses are ignored.
+
+        Args:
+            query (str): GraphQL query text.
+            variables (dict, optional): Query variables.
+            data (dict, optional): Decoded response.
+            content_type (str, optional): Content type used to pick the TTL.
+            etag (str, optional): ETag of the response, sent back when it has expired.
+        """
+        if not _is_cacheable(data):
+            return
+        ttl = self.get_ttl(content_type)
+        if ttl <= 0:
+            return
+
+        key = self.key(query, variables)
+        body = zlib.compress(json.dumps(data, separators=(",", ":")).encode(), self.compression)
+        now = time.time()
+        with self._lock:
+            connection = self._connect()
+            replaced = connection.execute("SELECT size FROM responses WHERE key = ?", (key,)).fetchone()
+            connection.execute(
+                "INSERT OR REPLACE INTO responses (key, expires, accessed, etag, size, body) VALUES (?, ?, ?, ?, ?, ?)",
+                (key, now + ttl, now, etag, len(body), body),
+            )
+            self._bytes += len(body) - (replaced[0] if replaced else 0)
+            self._flush(connection)
+            self._evict(connection)
+
+    def _evict(self, connection: sqlite3.Connection) -> None:
+        if self._bytes <= self.max_bytes:
+            return
+        # Other processes may have written or evicted entries since the last scan.
+        self._bytes = self._stored_bytes(connection)
+        excess = self._bytes - self.max_bytes
+        if excess <= 0:
+            return
+        keys = []
+        for key, size in connection.execute("SELECT key, size FROM responses ORDER BY accessed"):
+            keys.append((key,))
+            excess -= size
+            self._bytes -= size
+            if excess <= 0:
+                break
+        connection.executemany("DELETE FROM responses WHERE key = ?", keys)
+        self.evictions += len(keys)
+
+    def purge(self) -> int:
+        """Removes expired entries, including those kept for their ETag.
+
+        Returns:
+            int: Removed entries.
+        """
+        with self._lock:
+            connection = self._connect()
+            removed = connection.execute("DELETE FROM responses WHERE expires <= ?", (time.time(),)).rowcount
+            self._bytes = self._stored_bytes(connection)
+            return removed
+
+    def clear(self) -> None:
+        """Removes every entry. Counters are kept."""
+        with self._lock:
+            self._connect().execute("DELETE FROM responses")
+            self._bytes = 0
+
+    def close(self) -> None:
+        """Closes the database connection. It is opened again when the cache is used."""
+        with self._lock:
+            if self._connection is not None:
+                if self._pid == os.getpid():
+                    self._flush(self._connection)
+                self._connection.close()
+                self._connection = None
+
+    def stats(self) -> Dict[str, int]:
+        """Returns the cache counters.
+
+        Returns:
+            Dict[str, int]: size, bytes, hits, misses and evictions.
+        """
+        with self._lock:
+            size, stored = self._connect().execute(
+                "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM responses"
+            ).fetchone()
+            return dict(
+                size=size,
+                bytes=stored,
+                hits=self.hits,
+                misses=self.misses,
+                evictions=self.evictions,
+            )
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._connect().execute("SELECT COUNT(*) FROM responses").fetchone()[0]
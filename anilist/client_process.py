@@ -1,4 +1,4 @@
-from typing import Optional, List, Tuple
+from typing import Dict, Optional, List, Tuple
 
 from .types import (
     Anime,
@@ -16,43 +16,46 @@ from .types import (
     TextActivity,
     User,
 )
+from .projection import ANIME_FIELDS, MANGA_FIELDS, REQUIRED
+from .store import EntityStore
+from .types.lazy import LazyObject
 
 
 def construct_manga_object(media) -> Manga:
     manga = Manga(
         id=media["id"],
         title=media["title"],
-        url=media["siteUrl"],
-        chapters=media["chapters"],
-        description=media["description"],
-        status=media["status"],
-        genres=media["genres"],
-        is_adult=media["isAdult"],
-        tags=media["tags"],
-        studios=media["studios"],
-        start_date=media["startDate"],
-        end_date=media["endDate"],
+        url=media.get("siteUrl"),
+        chapters=media.get("chapters"),
+        description=media.get("description"),
+        status=media.get("status"),
+        genres=media.get("genres"),
+        is_adult=media.get("isAdult"),
+        tags=media.get("tags"),
+        studios=media.get("studios"),
+        start_date=media.get("startDate"),
+        end_date=media.get("endDate"),
         season=dict(
-            name=media["season"],
-            year=media["seasonYear"],
-            number=media["seasonInt"],
-        ),
-        country=media["countryOfOrigin"],
-        cover=media["coverImage"],
-        banner=media["bannerImage"],
-        source=media["source"],
-        hashtag=media["hashtag"],
-        synonyms=media["synonyms"],
+            name=media.get("season"),
+            year=media.get("seasonYear"),
+            number=media.get("seasonInt"),
+        ) if "season" in media else None,
+        country=media.get("countryOfOrigin"),
+        cover=media.get("coverImage"),
+        banner=media.get("bannerImage"),
+        source=media.get("source"),
+        hashtag=media.get("hashtag"),
+        synonyms=media.get("synonyms"),
         score=dict(
-            mean=media["meanScore"],
-            average=media["averageScore"],
-        ),
-        next_airing=media["nextAiringEpisode"],
-        trailer=media["trailer"],
-        staff=media["staff"],
-        characters=media["characters"],
-        volumes=media["volumes"],
-        popularity=media["popularity"],
+            mean=media.get("meanScore"),
+            average=media.get("averageScore"),
+        ) if "meanScore" in media or "averageScore" in media else None,
+        next_airing=media.get("nextAiringEpisode"),
+        trailer=media.get("trailer"),
+        staff=media.get("staff"),
+        characters=media.get("characters"),
+        volumes=media.get("volumes"),
+        popularity=media.get("popularity"),
         rankings=[
             Ranking(
                 type=i["type"],
@@ -62,8 +65,9 @@ def construct_manga_object(media) -> Manga:
                 year=i["year"],
                 season=i["season"],
             )
-            for i in media["rankings"]
+            for i in media.get("rankings") or []
         ],
+        relations=media.get("relations"),
     )
 
     return manga
@@ -73,38 +77,38 @@ def construct_anime_object(media: dict) -> Anime:
     anime = Anime(
         id=media["id"],
         title=media["title"],
-        url=media["siteUrl"],
-        episodes=media["episodes"],
-        description=media["description"],
-        format=media["format"],
-        status=media["status"],
-        duration=media["duration"],
-        genres=media["genres"],
-        is_adult=media["isAdult"],
-        tags=media["tags"],
-        studios=media["studios"],
-        start_date=media["startDate"],
-        end_date=media["endDate"],
+        url=media.get("siteUrl"),
+        episodes=media.get("episodes"),
+        description=media.get("description"),
+        format=media.get("format"),
+        status=media.get("status"),
+        duration=media.get("duration"),
+        genres=media.get("genres"),
+        is_adult=media.get("isAdult"),
+        tags=media.get("tags"),
+        studios=media.get("studios"),
+        start_date=media.get("startDate"),
+        end_date=media.get("endDate"),
         season=dict(
-            name=media["season"],
-            year=media["seasonYear"],
-            number=media["seasonInt"],
-        ),
-        country=media["countryOfOrigin"],
-        cover=media["coverImage"],
-        banner=media["bannerImage"],
-        source=media["source"],
-        hashtag=media["hashtag"],
-        synonyms=media["synonyms"],
+            name=media.get("season"),
+            year=media.get("seasonYear"),
+            number=media.get("seasonInt"),
+        ) if "season" in media else None,
+        country=media.get("countryOfOrigin"),
+        cover=media.get("coverImage"),
+        banner=media.get("bannerImage"),
+        source=media.get("source"),
+        hashtag=media.get("hashtag"),
+        synonyms=media.get("synonyms"),
         score=dict(
-            mean=media["meanScore"],
-            average=media["averageScore"],
-        ),
-        next_airing=media["nextAiringEpisode"],
-        trailer=media["trailer"],
-        staff=media["staff"],
-        characters=media["characters"],
-        popularity=media["popularity"],
+            mean=media.get("meanScore"),
+            average=media.get("averageScore"),
+        ) if "meanScore" in media or "averageScore" in media else None,
+        next_airing=media.get("nextAiringEpisode"),
+        trailer=media.get("trailer"),
+        staff=media.get("staff"),
+        characters=media.get("characters"),
+        popularity=media.get("popularity"),
         rankings=[
             Ranking(
                 type=i["type"],
@@ -114,8 +118,9 @@ def construct_anime_object(media: dict) -> Anime:
                 year=i["year"],
                 season=i["season"],
             )
-            for i in media["rankings"]
+            for i in media.get("rankings") or []
         ],
+        relations=media.get("relations"),
     )
 
     return anime
@@ -125,12 +130,12 @@ def construct_character_object(media: dict) -> Character:
     return Character(
         id=media["id"],
         name=media["name"],
-        image=media["image"],
-        url=media["siteUrl"],
-        favorites=media["favourites"],
-        description=media["description"],
-        media=media["media"],
-        is_favorite=media["isFavourite"],
+        image=media.get("image"),
+        url=media.get("siteUrl"),
+        favorites=media.get("favourites"),
+        description=media.get("description"),
+        media=media.get("media"),
+        is_favorite=media.get("isFavourite"),
     )
 
 
@@ -138,18 +143,18 @@ def construct_staff_object(media: dict) -> Staff:
     return Staff(
         id=media["id"],
         name=media["name"],
-        language=media["languageV2"],
-        image=media["image"],
-        description=media["description"],
-        gender=media["gender"],
-        birth_date=media["dateOfBirth"],
-        death_date=media["dateOfDeath"],
-        url=media["siteUrl"],
-        favorites=media["favourites"],
-        occupations=media["primaryOccupations"],
-        age=media["age"],
-        years_active=media["yearsActive"],
-        home_town=media["homeTown"],
+        language=media.get("languageV2"),
+        image=media.get("image"),
+        description=media.get("description"),
+        gender=media.get("gender"),
+        birth_date=media.get("dateOfBirth"),
+        death_date=media.get("dateOfDeath"),
+        url=media.get("siteUrl"),
+        favorites=media.get("favourites"),
+        occupations=media.get("primaryOccupations"),
+        age=media.get("age"),
+        years_active=media.get("yearsActive"),
+        home_town=media.get("homeTown"),
     )
 
 
@@ -157,13 +162,38 @@ def construct_studio_object(media: dict) -> Studio:
     return Studio(
         id=media["id"],
         name=media["name"],
-        is_animation_studio=media["isAnimationStudio"],
-        url=media["siteUrl"],
-        favourites=media["favourites"],
+        is_animation_studio=media.get("isAnimationStudio"),
+        url=media.get("siteUrl"),
+        favourites=media.get("favourites"),
     )
 
 
-def process_search_anime(data: Optional[dict]) -> Optional[Tuple[List[Anime], PageInfo]]:
+CONSTRUCTORS = {
+    "anime": construct_anime_object,
+    "manga": construct_manga_object,
+    "character": construct_character_object,
+    "staff": construct_staff_object,
+    "studio": construct_studio_object,
+}
+
+
+def construct_object(kind: str, item: dict, store: Optional[EntityStore] = None):
+    """Builds the model of an entity, through the entity store when there is one.
+
+    The relations of anime and manga are merged into the store as well.
+    """
+    if store is None:
+        return CONSTRUCTORS[kind](item)
+    for edge in (item.get("relations") or {}).get("edges") or []:
+        node = edge["node"]
+        if node.get("type", "").lower() in ("anime", "manga"):
+            store.merge(node["type"].lower(), node)
+    return store.build(kind, item, CONSTRUCTORS[kind])
+
+
+def process_search_anime(
+        data: Optional[dict], store: Optional[EntityStore] = None
+) -> Optional[Tuple[List[Anime], PageInfo]]:
     if data["data"]:
         try:
             items = data["data"]["Page"]["media"]
@@ -175,7 +205,8 @@ def process_search_anime(data: Optional[dict]) -> Optional[Tuple[List[Anime], Pa
             )
 
             results = [
-                Anime(id=item["id"], title=item["title"], url=item["siteUrl"])
+                Anime(id=item["id"], title=item["title"], url=item["siteUrl"]) if store is None
+                else construct_object("anime", item, store)
                 for item in items
             ]
             return results, pagination
@@ -184,7 +215,9 @@ def process_search_anime(data: Optional[dict]) -> Optional[Tuple[List[Anime], Pa
     return None
 
 
-def process_search_manga(data: Optional[dict]) -> Optional[Tuple[List[Manga], PageInfo]]:
+def process_search_manga(
+        data: Optional[dict], store: Optional[EntityStore] = None
+) -> Optional[Tuple[List[Manga], PageInfo]]:
     if data["data"]:
         try:
             items = data["data"]["Page"]["media"]
@@ -196,7 +229,8 @@ def process_search_manga(data: Optional[dict]) -> Optional[Tuple[List[Manga], Pa
             )
 
             results = [
-                Manga(id=item["id"], title=item["title"], url=item["siteUrl"])
+                Manga(id=item["id"], title=item["title"], url=item["siteUrl"]) if store is None
+                else construct_object("manga", item, store)
                 for item in items
             ]
             return results, pagination
@@ -205,7 +239,9 @@ def process_search_manga(data: Optional[dict]) -> Optional[Tuple[List[Manga], Pa
     return None
 
 
-def process_search_character(data: dict) -> Optional[Tuple[List[Character], PageInfo]]:
+def process_search_character(
+        data: dict, store: Optional[EntityStore] = None
+) -> Optional[Tuple[List[Character], PageInfo]]:
     if data["data"]:
         try:
             items = data["data"]["Page"]["characters"]
@@ -217,7 +253,9 @@ def process_search_character(data: dict) -> Optional[Tuple[List[Character], Page
             )
 
             results = [
-                Character(id=item["id"], name=item["name"]) for item in items
+                Character(id=item["id"], name=item["name"]) if store is None
+                else construct_object("character", item, store)
+                for item in items
             ]
             return results, pagination
         except Exception:
@@ -225,7 +263,7 @@ def process_search_character(data: dict) -> Optional[Tuple[List[Character], Page
     return None
 
 
-def process_search_staff(data) -> Optional[Tuple[List[Staff], PageInfo]]:
+def process_search_staff(data, store: Optional[EntityStore] = None) -> Optional[Tuple[List[Staff], PageInfo]]:
     if data["data"]:
         try:
             items = data["data"]["Page"]["staff"]
@@ -236,7 +274,11 @@ def process_search_staff(data) -> Optional[Tuple[List[Staff], PageInfo]]:
                 last=page["lastPage"],
             )
 
-            results = [Staff(id=item["id"], name=item["name"]) for item in items]
+            results = [
+                Staff(id=item["id"], name=item["name"]) if store is None
+                else construct_object("staff", item, store)
+                for item in items
+            ]
             return results, pagination
         except Exception:
             raise
@@ -264,150 +306,96 @@ def process_search_user(data) -> Optional[Tuple[List[User], PageInfo]]:
     return None
 
 
-def process_get_anime(data) -> Optional[Anime]:
+def process_get_anime(data, store: Optional[EntityStore] = None) -> Optional[Anime]:
     if data["data"]:
         try:
             item = data["data"]["Page"]["media"][0]
-            return Anime(
-                id=item["id"],
-                title=item["title"],
-                url=item["siteUrl"],
-                episodes=item["episodes"],
-                description=item["description"],
-                format=item["format"],
-                status=item["status"],
-                duration=item["duration"],
-                genres=item["genres"],
-                is_adult=item["isAdult"],
-                tags=item["tags"],
-                studios=item["studios"],
-                start_date=item["startDate"],
-                end_date=item["endDate"],
-                season=dict(
-                    name=item["season"],
-                    year=item["seasonYear"],
-                    number=item["seasonInt"],
-                ),
-                country=item["countryOfOrigin"],
-                cover=item["coverImage"],
-                banner=item["bannerImage"],
-                source=item["source"],
-                hashtag=item["hashtag"],
-                synonyms=item["synonyms"],
-                score=dict(
-                    mean=item["meanScore"],
-                    average=item["averageScore"],
-                ),
-                next_airing=item["nextAiringEpisode"],
-                trailer=item["trailer"],
-                staff=item["staff"],
-                characters=item["characters"],
-                popularity=item["popularity"],
-                rankings=[
-                    Ranking(
-                        type=i["type"],
-                        all_time=i["allTime"],
-                        format=i["format"],
-                        rank=i["rank"],
-                        year=i["year"],
-                        season=i["season"],
-                    )
-                    for i in item["rankings"]
-                ],
-                relations=item["relations"],
-            )
+            return construct_object("anime", item, store)
         except Exception:
             raise
     return None
 
 
-def process_get_manga(data) -> Optional[Manga]:
+def process_get_manga(data, store: Optional[EntityStore] = None) -> Optional[Manga]:
     if data["data"]:
         try:
             item = data["data"]["Page"]["media"][0]
-            return Manga(
-                id=item["id"],
-                title=item["title"],
-                url=item["siteUrl"],
-                chapters=item["chapters"],
-                description=item["description"],
-                status=item["status"],
-                genres=item["genres"],
-                is_adult=item["isAdult"],
-                tags=item["tags"],
-                studios=item["studios"],
-                start_date=item["startDate"],
-                end_date=item["endDate"],
-                season=dict(
-                    name=item["season"],
-                    year=item["seasonYear"],
-                    number=item["seasonInt"],
-                ),
-                country=item["countryOfOrigin"],
-                cover=item["coverImage"],
-                banner=item["bannerImage"],
-                source=item["source"],
-                hashtag=item["hashtag"],
-                synonyms=item["synonyms"],
-                score=dict(
-                    mean=item["meanScore"],
-                    average=item["averageScore"],
-                ),
-                next_airing=item["nextAiringEpisode"],
-                trailer=item["trailer"],
-                staff=item["staff"],
-                characters=item["characters"],
-                volumes=item["volumes"],
-                popularity=item["popularity"],
-                rankings=[
-                    Ranking(
-                        type=i["type"],
-                        all_time=i["allTime"],
-                        format=i["format"],
-                        rank=i["rank"],
-                        year=i["year"],
-                        season=i["season"],
-                    )
-                    for i in item["rankings"]
-                ],
-                relations=item["relations"],
-            )
+            return construct_object("manga", item, store)
         except Exception:
             raise
     return None
 
 
-def process_get_character(data) -> Optional[Character]:
+def raise_for_errors(data) -> None:
+    """Raises when AniList answered with errors and no data.
+
+    Raises:
+        ValueError: With the messages of the errors.
+    """
+    if data.get("errors") and not data.get("data"):
+        messages = "; ".join(str(error.get("message", error)) for error in data["errors"])
+        raise ValueError(f"AniList returned errors: {messages}")
+
+
+def process_get_many_anime(
+        data, ids: List[int], store: Optional[EntityStore] = None
+) -> List[Optional[Anime]]:
+    raise_for_errors(data)
+    found = {}
+    if data["data"]:
+        try:
+            for item in data["data"]["Page"]["media"]:
+                found[item["id"]] = construct_object("anime", item, store)
+        except Exception:
+            raise
+    return [found.get(id) for id in ids]
+
+
+def process_get_many_manga(
+        data, ids: List[int], store: Optional[EntityStore] = None
+) -> List[Optional[Manga]]:
+    raise_for_errors(data)
+    found = {}
+    if data["data"]:
+        try:
+            for item in data["data"]["Page"]["media"]:
+                found[item["id"]] = construct_object("manga", item, store)
+        except Exception:
+            raise
+    return [found.get(id) for id in ids]
+
+
+def process_get_character(data, store: Optional[EntityStore] = None) -> Optional[Character]:
     if data["data"]:
         try:
             item = data["data"]["Character"]
-            return construct_character_object(item)
+            return construct_object("character", item, store)
         except Exception:
             raise
     return None
 
 
-def process_get_staff(data) -> Optional[Staff]:
+def process_get_staff(data, store: Optional[EntityStore] = None) -> Optional[Staff]:
     if data["data"]:
         try:
             item = data["data"]["Staff"]
-            return construct_staff_object(item)
+            return construct_object("staff", item, store)
         except Exception:
             raise
     return None
 
 
-def process_get_user(data) -> Optional[User]:
+def process_get_user(data, store: Optional[EntityStore] = None) -> Optional[User]:
     if data["data"]:
         try:
             item = data["data"]["User"]
 
             favourites = FavouritesUnion(
-                anime=[construct_anime_object(i) for i in item["favourites"]["anime"]["nodes"]],
-                manga=[construct_manga_object(i) for i in item["favourites"]["manga"]["nodes"]],
-                characters=[construct_character_object(i) for i in item["favourites"]["characters"]["nodes"]],
-                staff=[construct_staff_object(i) for i in item["favourites"]["staff"]["nodes"]],
-                studios=[construct_studio_object(i) for i in item["favourites"]["studios"]["nodes"]],
+                anime=[construct_object("anime", i, store) for i in item["favourites"]["anime"]["nodes"]],
+                manga=[construct_object("manga", i, store) for i in item["favourites"]["manga"]["nodes"]],
+                characters=[construct_object("character", i, store) for i in item["favourites"]["characters"]["nodes"]],
+                staff=[construct_object("staff", i, store) for i in item["favourites"]["staff"]["nodes"]],
+                studios=[construct_object("studio", i, store) for i in item["favourites"]["studios"]["nodes"]],
             )
 
             stat_anime = item["statistics"]["anime"]
@@ -471,62 +459,77 @@ def process_get_user(data) -> Optional[User]:
     return None
 
 
-def process_get_list(data: dict, content_type: str) -> Optional[Tuple[List[MediaList], PageInfo]]:
+def construct_media_list_object(item: dict, media=None) -> MediaList:
+    return MediaList(
+        id=item["id"],
+        status=item["status"],
+        score=item["score"],
+        progress=item["progress"],
+        repeat=item["repeat"],
+        priority=item["priority"],
+        start_date=item["startedAt"],
+        complete_date=item["completedAt"],
+        update_date=item["updatedAt"],
+        create_date=item["createdAt"],
+        media=media,
+    )
+
+
+def construct_list_activity_object(item: dict, media) -> ListActivity:
+    return ListActivity(
+        id=item["id"],
+        status=item["status"],
+        progress=item["progress"],
+        url=item["siteUrl"],
+        date=item["createdAt"],
+        media=media,
+    )
+
+
+def _lazy_fields(fields: Dict[str, List[str]]) -> Dict[str, List[str]]:
+    required = [key for name in REQUIRED for key in fields[name]]
+    return {name: required + keys for name, keys in fields.items()}
+
+
+_LAZY_ANIME_FIELDS = _lazy_fields(ANIME_FIELDS)
+_LAZY_MANGA_FIELDS = _lazy_fields(MANGA_FIELDS)
+
+
+def _lazy_media(media: dict, is_manga: bool) -> LazyObject:
+    if is_manga:
+        return LazyObject(Manga, construct_manga_object, media, fields=_LAZY_MANGA_FIELDS)
+    return LazyObject(Anime, construct_anime_object, media, fields=_LAZY_ANIME_FIELDS)
+
+
+def process_list_entry(
+        item: dict, is_manga: bool, lazy: bool = False, store: Optional[EntityStore] = None
+) -> MediaList:
+    kind = "manga" if is_manga else "anime"
+    if lazy:
+        if store is not None:
+            store.merge(kind, item["media"])
+        media = _lazy_media(item["media"], is_manga)
+        return LazyObject(MediaList, construct_media_list_object, item, media, values=dict(media=media))
+    return construct_media_list_object(item, construct_object(kind, item["media"], store))
+
+
+def process_get_list(
+        data: dict, content_type: str, lazy: bool = False, store: Optional[EntityStore] = None
+) -> Optional[Tuple[List[MediaList], PageInfo]]:
     is_manga = "manga" in content_type
     res = []
     if data["data"]:
         try:
-            if not is_manga:
-                pg = data["data"]["anime"]["pageInfo"]
-            else:
-                pg = data["data"]["manga"]["pageInfo"]
+            page = data["data"]["manga" if is_manga else "anime"]
+            pg = page["pageInfo"]
             pagination = PageInfo(
                 total_items=pg["total"],
                 current=pg["currentPage"],
                 last=pg["lastPage"],
             )
 
-            if not is_manga:
-                for item in data["data"]["anime"]["mediaList"]:
-                    media = item["media"]
-                    anime = construct_anime_object(media)
-
-                    res.append(
-                        MediaList(
-                            id=item["id"],
-                            status=item["status"],
-                            score=item["score"],
-                            progress=item["progress"],
-                            repeat=item["repeat"],
-                            priority=item["priority"],
-                            start_date=item["startedAt"],
-                            complete_date=item["completedAt"],
-                            update_date=item["updatedAt"],
-                            create_date=item["createdAt"],
-                            media=anime,
-                        )
-                    )
-
-            if is_manga:
-                for item in data["data"]["manga"]["mediaList"]:
-                    media = item["media"]
-                    manga = construct_manga_object(media)
-
-                    res.append(
-                        MediaList(
-                            id=item["id"],
-                            status=item["status"],
-                            score=item["score"],
-                            progress=item["progress"],
-                            repeat=item["repeat"],
-                            priority=item["priority"],
-                            start_date=item["startedAt"],
-                            complete_date=item["completedAt"],
-                            update_date=item["updatedAt"],
-                            create_date=item["createdAt"],
-                            media=manga,
-                        )
-                    )
+            for item in page["mediaList"]:
+                res.append(process_list_entry(item, is_manga, lazy, store))
 
             return res, pagination
 
@@ -535,63 +538,53 @@ def process_get_list(data: dict, content_type: str) -> Optional[Tuple[List[Media
     return None
 
 
-def process_get_list_item(data: dict) -> Optional[MediaList]:
+def process_get_list_collection(
+        data: dict, content_type: str, lazy: bool = False, store: Optional[EntityStore] = None
+) -> Optional[Tuple[Dict[str, List[MediaList]], bool]]:
+    is_manga = "manga" in content_type
     if data["data"]:
         try:
-            item = data["data"]["MediaList"]
-            return MediaList(
-                id=item["id"],
-                status=item["status"],
-                score=item["score"],
-                progress=item["progress"],
-                repeat=item["repeat"],
-                priority=item["priority"],
-                start_date=item["startedAt"],
-                complete_date=item["completedAt"],
-                update_date=item["updatedAt"],
-                create_date=item["createdAt"],
-            )
+            collection = data["data"]["manga" if is_manga else "anime"]
+            groups: Dict[str, List[MediaList]] = {}
+
+            # Entries of custom lists are also in their status list, so only status lists are read.
+            for group in collection["lists"]:
+                if group.get("isCustomList"):
+                    continue
+                entries = groups.setdefault(group["status"], [])
+                for item in group["entries"]:
+                    entries.append(process_list_entry(item, is_manga, lazy, store))
+
+            return groups, bool(collection.get("hasNextChunk"))
         except Exception:
             raise
     return None
 
 
-def process_get_anime_activity(data) -> Optional[Tuple[List[ListActivity], PageInfo]]:
+def process_get_list_item(data: dict) -> Optional[MediaList]:
     if data["data"]:
         try:
-            items = data["data"]["Page"]["activities"]
-            page = data["data"]["Page"]["pageInfo"]
-            pagination = PageInfo(
-                total_items=page["total"],
-                current=page["currentPage"],
-                last=page["lastPage"],
-            )
-
-            result = []
-
-            for item in items:
-                media = item["media"]
-
-                anime = construct_anime_object(media)
-
-                result.append(
-                    ListActivity(
-                        id=item["id"],
-                        status=item["status"],
-                        progress=item["progress"],
-                        url=item["siteUrl"],
-                        date=item["createdAt"],
-                        media=anime,
-                    )
-                )
-
-            return result, pagination
+            return construct_media_list_object(data["data"]["MediaList"])
         except Exception:
             raise
     return None
 
 
-def process_get_manga_activity(data: dict) -> Optional[Tuple[List[ListActivity], PageInfo]]:
+def process_list_activity_entry(
+        item: dict, is_manga: bool, lazy: bool = False, store: Optional[EntityStore] = None
+) -> ListActivity:
+    kind = "manga" if is_manga else "anime"
+    if lazy:
+        if store is not None:
+            store.merge(kind, item["media"])
+        media = _lazy_media(item["media"], is_manga)
+        return LazyObject(ListActivity, construct_list_activity_object, item, media, values=dict(media=media))
+    return construct_list_activity_object(item, construct_object(kind, item["media"], store))
+
+
+def _process_list_activity(
+        data: dict, is_manga: bool, lazy: bool, store: Optional[EntityStore]
+) -> Optional[Tuple[List[ListActivity], PageInfo]]:
     if data["data"]:
         try:
             items = data["data"]["Page"]["activities"]
@@ -602,29 +595,25 @@ def process_get_manga_activity(data: dict) -> Optional[Tuple[List[ListActivity],
                 last=page["lastPage"],
             )
 
-            result = []
-
-            for item in items:
-                media = item["media"]
-                manga = construct_manga_object(media)
-
-                result.append(
-                    ListActivity(
-                        id=item["id"],
-                        status=item["status"],
-                        progress=item["progress"],
-                        url=item["siteUrl"],
-                        date=item["createdAt"],
-                        media=manga,
-                    )
-                )
-
+            result = [process_list_activity_entry(item, is_manga, lazy, store) for item in items]
             return result, pagination
         except Exception:
             raise
     return None
 
 
+def process_get_anime_activity(
+        data, lazy: bool = False, store: Optional[EntityStore] = None
+) -> Optional[Tuple[List[ListActivity], PageInfo]]:
+    return _process_list_activity(data, False, lazy, store)
+
+
+def process_get_manga_activity(
+        data: dict, lazy: bool = False, store: Optional[EntityStore] = None
+) -> Optional[Tuple[List[ListActivity], PageInfo]]:
+    return _process_list_activity(data, True, lazy, store)
+
+
 def process_get_text_activity(data: dict) -> Optional[Tuple[List[TextActivity], PageInfo]]:
     if data["data"]:
         try:
@@ -699,5 +688,5 @@ def process_get_message_activity(data: dict) -> Optional[List[TextActivity]]:
     return None
 
 
-def process_get_message_activity_sent(data: dict) -> Optional[Tuple[List[TextActivity], PageInfo]]:
+def process_get_message_activity_sent(data: dict) -> Optional[List[TextActivity]]:
     return process_get_message_activity(data)  # Currently they are the same
@@ -0,0 +1,159 @@
+#!/usr/bin/env python3
+# SPDX-License-Identifier: MIT
+# Copyright (C) 2021-2022 Amano Team <https://amanoteam.com/> and the python-anilist contributors
+
+import asyncio
+from concurrent.futures import Executor, as_completed
+from typing import Any, Awaitable, Callable, Dict, Iterable, Iterator, List, Optional, Tuple, Union
+
+Progress = Callable[[int, int], None]
+
+
+def resolve_method(client: Any, method: Union[str, Callable]) -> Callable:
+    """Returns the client method to call for every item of `map()`.
+
+    Args:
+        client (Any): Client the method belongs to.
+        method (Union[str, Callable]): Method name, like "get_anime", or a callable.
+
+    Raises:
+        TypeError: If method is neither a public client method name nor a callable.
+
+    Returns:
+        Callable: The method.
+    """
+    if callable(method):
+        return method
+    if isinstance(method, str) and not method.startswith("_") and callable(getattr(client, method, None)):
+        return getattr(client, method)
+    raise TypeError(f"method argument must be a client method name or a callable, not {method!r}")
+
+
+def split_args(item: Any) -> Tuple[tuple, Dict[str, Any]]:
+    """Turns a `map()` item into call arguments: tuples are positional arguments,
+    dicts keyword arguments and anything else a single argument."""
+    if isinstance(item, tuple):
+        return item, {}
+    if isinstance(item, dict):
+        return (), item
+    return (item,), {}
+
+
+def check_concurrency(concurrency: int) -> None:
+    if not isinstance(concurrency, int) or concurrency < 1:
+        raise TypeError(f"concurrency argument must be a positive int, not {concurrency!r}")
+
+
+async def amap(
+    function: Callable[..., Awaitable[Any]],
+    items: Iterable[Any],
+    *,
+    concurrency: int,
+    progress: Optional[Progress] = None,
+) -> List[Any]:
+    """Awaits `function` for every item with at most `concurrency` calls in flight.
+
+    A fixed set of workers pulls items from a shared iterator, so memory does not grow
+    with the number of items. A failing call does not cancel the others.
+
+    Args:
+        function (Callable[..., Awaitable[Any]]): Coroutine function to call.
+        items (Iterable[Any]): Arguments of each call, see `split_args()`.
+        concurrency (int): Maximum calls in flight.
+        progress (Progress, optional): Called with the number of finished calls and the total
+            after each call. Defaults to None.
+
+    Returns:
+        List[Any]: Results in the order of the items, with the raised exception in place of failed calls.
+    """
+    items = list(items)
+    total = len(items)
+    results: List[Any] = [None] * total
+    pending = iter(enumerate(items))
+    done = 0
+
+    async def worker() -> None:
+        nonlocal done
+        for index, item in pending:
+            args, kwargs = split_args(item)
+            try:
+                results[index] = await function(*args, **kwargs)
+            except Exception as error:
+                results[index] = error
+            done += 1
+            if progress is not None:
+                progress(done, total)
+
+    await asyncio.gather(*(worker() for _ in range(min(concurrency, total))))
+    return results
+
+
+def _call(function: Callable[..., Any], item: Any) -> Any:
+    args, kwargs = split_args(item)
+    try:
+        return function(*args, **kwargs)
+    except Exception as error:
+        return error
+
+
+def tmap_as_completed(
+    executor: Optional[Executor],
+    function: Callable[..., Any],
+    items: Iterable[Any],
+    *,
+    progress: Optional[Progress] = None,
+) -> Iterator[Tuple[int, Any]]:
+    """Calls `function` for every item on an executor, yielding results as they finish.
+
+    Calls are submitted when iteration starts. Calls that have not started yet are
+    cancelled when the iterator is closed early.
+
+    Args:
+        executor (Executor, optional): Executor running the calls. None runs them one by one
+            in the calling thread, which callers use to avoid waiting on their own pool.
+        function (Callable[..., Any]): Function to call.
+        items (Iterable[Any]): Arguments of each call, see `split_args()`.
+        progress (Progress, optional): Called with the number of finished calls and the total
+            after each call. Defaults to None.
+
+    Yields:
+        Tuple[int, Any]: Index of the item and its result, or the raised exception for failed calls.
+    """
+    items = list(items)
+    total = len(items)
+    if executor is None:
+        for index, item in enumerate(items):
+            result = _call(function, item)
+            if progress is not None:
+                progress(index + 1, total)
+            yield index, result
+        return
+
+    futures = {executor.submit(_call, function, item): index for index, item in enumerate(items)}
+    try:
+        for done, future in enumerate(as_completed(futures), 1):
+            if progress is not None:
+                progress(done, total)
+            yield futures[future], future.result()
+    finally:
+        for future in futures:
+            future.cancel()
+
+
+def tmap(
+    executor: Optional[Executor],
+    function: Callable[..., Any],
+    items: Iterable[Any],
+    *,
+    progress: Optional[Progress] = None,
+) -> List[Any]:
+    """Ordered version of `tmap_as_completed()`.
+
+    Returns:
+        List[Any]: Results in the order of the items, with the raised exception in place of failed calls.
+    """
+    items = list(items)
+    results: List[Any] = [None] * len(items)
+    for index, result in tmap_as_completed(executor, function, items, progress=progress):
+        results[index] = result
+    return results
@@ -0,0 +1,54 @@
+#!/usr/bin/env python3
+# SPDX-License-Identifier: MIT
+# Copyright (C) 2021-2022 Amano Team <https://amanoteam.com/> and the python-anilist contributors
+
+import json
+from typing import Any, Callable, Union
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover
+    orjson = None
+
+try:
+    import msgspec
+except ImportError:  # pragma: no cover
+    msgspec = None
+
+Decoder = Callable[[bytes], Any]
+
+
+def get_decoder(decoder: Union[str, Decoder] = "auto") -> Decoder:
+    """Returns the function used to decode response bodies.
+
+    Args:
+        decoder (Union[str, Decoder], optional): "orjson", "msgspec", "json", "auto", or a callable
+            that takes the raw body bytes. "auto" picks orjson, then msgspec, whichever is
+            installed, and falls back to the standard library. Defaults to "auto".
+
+    Raises:
+        TypeError: If the decoder is unknown.
+        ImportError: If the requested library is not installed.
+
+    Returns:
+        Decoder: Function from bytes to the decoded document.
+    """
+    if callable(decoder):
+        return decoder
+    if decoder == "auto":
+        if orjson is not None:
+            return orjson.loads
+        if msgspec is not None:
+            return msgspec.json.decode
+        return json.loads
+    if decoder == "json":
+        return json.loads
+    if decoder == "orjson":
+        if orjson is None:
+            raise ImportError("orjson is not installed, install python-anilist[orjson].")
+        return orjson.loads
+    if decoder == "msgspec":
+        if msgspec is None:
+            raise ImportError("msgspec is not installed, install python-anilist[msgspec].")
+        return msgspec.json.decode
+    raise TypeError(f"There is no such decoder ({decoder}).")
@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+# SPDX-License-Identifier: MIT
+# Copyright (C) 2021-2022 Amano Team <https://amanoteam.com/> and the python-anilist contributors
+
+import hashlib
+import re
+from functools import lru_cache
+from typing import Optional
+
+from .decoder import Decoder
+
+PERSISTED_QUERY_NOT_FOUND = "PersistedQueryNotFound"
+PERSISTED_QUERY_NOT_SUPPORTED = "PersistedQueryNotSupported"
+
+_COMMENT = re.compile(r"#[^\n]*")
+_WHITESPACE = re.compile(r"[\s,]+")
+_PUNCTUATOR = re.compile(r" ?([!$():=@\[\]{|}]) ?")
+
+
+@lru_cache(maxsize=1024)
+def minify(query: str) -> str:
+    """Strips comments, the license header, commas and insignificant whitespace from a query.
+
+    Each query is minified once, on first use. Queries baked by `anilist.queries.build`
+    are already minified.
+
+    Args:
+        query (str): GraphQL query text, without string literals.
+
+    Returns:
+        str: Equivalent query text.
+    """
+    text = _COMMENT.sub("", query)
+    text = _WHITESPACE.sub(" ", text).strip()
+    return _PUNCTUATOR.sub(r"\1", text)
+
+
+@lru_cache(maxsize=1024)
+def query_hash(query: str) -> str:
+    """Returns the sha256 of a query, as used by automatic persisted queries.
+
+    Args:
+        query (str): GraphQL query text, as sent.
+
+    Returns:
+        str: Hex digest.
+    """
+    return hashlib.sha256(query.encode()).hexdigest()
+
+
+def persisted_query_error(content: bytes, decode: Decoder) -> Optional[str]:
+    """Returns the persisted query error of a response, if any.
+
+    Args:
+        content (bytes): Response body.
+        decode (Decoder): JSON decoder.
+
+    Returns:
+        Optional[str]: PERSISTED_QUERY_NOT_FOUND or PERSISTED_QUERY_NOT_SUPPORTED.
+    """
+    if b"PersistedQueryNot" not in content:
+        return None
+    try:
+        errors = decode(content).get("errors") or []
+    except (ValueError, AttributeError):
+        return None
+    for error in errors:
+        message = error.get("message") if isinstance(error, dict) else None
+        if message in (PERSISTED_QUERY_NOT_FOUND, PERSISTED_QUERY_NOT_SUPPORTED):
+            return message
+    return None
+
+
+def request_body(query: Optional[str], variables: dict, digest: Optional[str] = None) -> dict:
+    """Builds the JSON body of a GraphQL request.
+
+    Args:
+        query (str, optional): Query text, None to send only the hash.
+        variables (dict): Query variables.
+        digest (str, optional): sha256 of the query for automatic persisted queries. Defaults to None.
+
+    Returns:
+        dict: Request body.
+    """
+    body = dict(variables=variables) if query is None else dict(query=query, variables=variables)
+    if digest is not None:
+        body["extensions"] = {"persistedQuery": {"version": 1, "sha256Hash": digest}}
+    return body
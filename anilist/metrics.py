@@ -0,0 +1,263 @@
+#!/usr/bin/env python3
+# SPDX-License-Identifier: MIT
+# Copyright (C) 2021-2022 Amano Team <https://amanoteam.com/> and the python-anilist contributors
+
+import hashlib
+import re
+import threading
+from collections import deque
+from time import perf_counter
+from typing import TYPE_CHECKING, Any, Callable, Deque, Dict, Iterable, List, Optional, Tuple
+
+from .cache import cache_key
+from .queries import QUERY_NAMES
+
+if TYPE_CHECKING:
+    import httpx
+
+PHASES = ("connect", "server", "download", "decode", "process")
+QUANTILES = (0.5, 0.95, 0.99)
+
+_OPERATION = re.compile(r"^\s*query\s+(\w+)")
+_COMMENT = re.compile(r"#[^\n]*")
+
+
+def query_name(query: str) -> str:
+    """Returns the name of a query, like "ANIME_GET_QUERY".
+
+    Queries trimmed by `fields` keep the name of the query they come from. Other queries
+    are named after their GraphQL operation name, or "anonymous".
+
+    Args:
+        query (str): GraphQL query text.
+
+    Returns:
+        str: Query name.
+    """
+    name = QUERY_NAMES.get(query)
+    if name is None:
+        match = _OPERATION.match(_COMMENT.sub("", query))
+        name = match.group(1) if match else "anonymous"
+    return name
+
+
+def variables_hash(variables: Optional[dict]) -> str:
+    """Returns a short hash of query variables, stable across processes."""
+    return hashlib.sha256(cache_key("", variables)[1].encode()).hexdigest()[:16]
+
+
+class Span:
+    """Time spent in one phase of a client call.
+
+    Phases are "connect" (opening a new connection, with TLS), "server" (sending the
+    request until the response headers arrive), "download" (reading the body),
+    "decode" (JSON decoding) and "process" (building the models). "connect" is only
+    reported for requests that opened a connection, and transports that do not report
+    the time the headers arrived count the download as server time.
+
+    Attributes:
+        operation (str): Query name, see `query_name()`.
+        phase (str): Phase name.
+        start (float): `time.perf_counter()` at the start of the phase.
+        duration (float): Seconds spent in the phase.
+        variables_hash (str): Hash of the query variables, see `variables_hash()`.
+        bytes (int, optional): Size of the response body, None for cached responses.
+        status_code (int, optional): Response status code, None for cached responses.
+    """
+
+    __slots__ = ("operation", "phase", "start", "duration", "variables_hash", "bytes", "status_code")
+
+    def __init__(
+        self,
+        operation: str,
+        phase: str,
+        start: float,
+        duration: float,
+        variables_hash: str,
+        bytes: Optional[int] = None,
+        status_code: Optional[int] = None,
+    ) -> None:
+        self.operation = operation
+        self.phase = phase
+        self.start = start
+        self.duration = duration
+        self.variables_hash = variables_hash
+        self.bytes = bytes
+        self.status_code = status_code
+
+    def __repr__(self) -> str:
+        return f"<Span {self.operation} {self.phase} {self.duration * 1000:.3f}ms>"
+
+
+Hook = Callable[[Span], Any]
+
+
+class Recorder:
+    """Times the phases of one client call and passes a `Span` per phase to the hooks.
+
+    Args:
+        hooks (Iterable[Hook]): Callables receiving each span.
+        query (str): GraphQL query text.
+        variables (dict): Query variables.
+        asynchronous (bool, optional): Whether requests go through an `httpx.AsyncClient`. Defaults to False.
+
+    Attributes:
+        extensions (dict): httpx request extensions collecting the connection events.
+    """
+
+    def __init__(
+        self, hooks: Iterable[Hook], query: str, variables: Optional[dict], asynchronous: bool = False
+    ) -> None:
+        self.hooks = list(hooks)
+        self.operation = query_name(query)
+        self.variables_hash = variables_hash(variables)
+        self.bytes: Optional[int] = None
+        self.status_code: Optional[int] = None
+        self.extensions = {"trace": self._atrace if asynchronous else self._trace}
+        self._events: Dict[str, float] = {}
+
+    def _trace(self, name: str, info: dict) -> None:
+        self._events[name] = perf_counter()
+
+    async def _atrace(self, name: str, info: dict) -> None:
+        self._events[name] = perf_counter()
+
+    def _event(self, suffix: str) -> Optional[float]:
+        for name, time in self._events.items():
+            if name.endswith(suffix):
+                return time
+        return None
+
+    def emit(self, phase: str, start: float, end: Optional[float] = None) -> None:
+        """Passes a span to the hooks.
+
+        Args:
+            phase (str): Phase name.
+            start (float): `time.perf_counter()` at the start of the phase.
+            end (float, optional): `time.perf_counter()` at the end of the phase. Defaults to now.
+        """
+        if end is None:
+            end = perf_counter()
+        span = Span(self.operation, phase, start, end - start, self.variables_hash, self.bytes, self.status_code)
+        for hook in self.hooks:
+            hook(span)
+
+    def response(self, start: float, response: "httpx.Response", size: Optional[int] = None) -> None:
+        """Reports the connect, server and download spans of a request.
+
+        Args:
+            start (float): `time.perf_counter()` before the request was sent.
+            response (httpx.Response): Its response, with the body read.
+            size (int, optional): Body size of a streamed response, whose content is not kept.
+                Defaults to None, the size of the read body.
+        """
+        end = perf_counter()
+        self.bytes = len(response.content) if size is None else size
+        self.status_code = response.status_code
+
+        connected = self._event("connect_tcp.started")
+        if connected is not None:
+            ready = self._event("start_tls.complete") or self._event("connect_tcp.complete") or connected
+            self.emit("connect", connected, ready)
+            start = ready
+        headers = self._event("receive_response_headers.complete")
+        self.emit("server", start, headers or end)
+        if headers is not None:
+            self.emit("download", headers, end)
+        self._events.clear()
+
+
+class MetricsCollector:
+    """Hook keeping the duration of the recent spans of every operation and phase.
+
+    Pass it to `Client(hooks=[collector])`. Quantiles are computed over the last
+    `max_samples` spans of each operation and phase, counts and sums over all of them.
+
+    Args:
+        max_samples (int, optional): Spans kept per operation and phase. Defaults to 1024.
+    """
+
+    def __init__(self, *, max_samples: int = 1024) -> None:
+        if max_samples < 1:
+            raise TypeError("max_samples argument must be at least 1")
+        self.max_samples = max_samples
+        self._samples: Dict[Tuple[str, str], Deque[float]] = {}
+        self._totals: Dict[Tuple[str, str], List[float]] = {}  # [count, sum]
+        self._bytes: Dict[str, int] = {}
+        self._responses: Dict[Tuple[str, int], int] = {}
+        self._lock = threading.Lock()
+
+    def __call__(self, span: Span) -> None:
+        key = (span.operation, span.phase)
+        with self._lock:
+            samples = self._samples.get(key)
+            if samples is None:
+                samples = self._samples[key] = deque(maxlen=self.max_samples)
+                self._totals[key] = [0, 0.0]
+            samples.append(span.duration)
+            totals = self._totals[key]
+            totals[0] += 1
+            totals[1] += span.duration
+            if span.phase == "server":
+                self._bytes[span.operation] = self._bytes.get(span.operation, 0) + (span.bytes or 0)
+                response = (span.operation, span.status_code)
+                self._responses[response] = self._responses.get(response, 0) + 1
+
+    def quantiles(self) -> Dict[str, Dict[str, Dict[str, float]]]:
+        """Returns the span statistics of every operation.
+
+        Returns:
+            Dict[str, Dict[str, Dict[str, float]]]: By operation and phase, count, sum,
+            p50, p95 and p99 in seconds.
+        """
+        result: Dict[str, Dict[str, Dict[str, float]]] = {}
+        with self._lock:
+            for (operation, phase), samples in self._samples.items():
+                ordered = sorted(samples)
+                count, total = self._totals[operation, phase]
+                stats = {"count": count, "sum": total}
+                for quantile in QUANTILES:
+                    stats[f"p{round(quantile * 100)}"] = ordered[min(len(ordered) - 1, int(len(ordered) * quantile))]
+                result.setdefault(operation, {})[phase] = stats
+        return result
+
+    def prometheus(self) -> str:
+        """Returns the statistics in the Prometheus text exposition format.
+
+        Returns:
+            str: `anilist_phase_duration_seconds` summaries, `anilist_response_bytes_total`
+            and `anilist_responses_total` counters.
+        """
+        lines = [
+            "# HELP anilist_phase_duration_seconds Time spent in each phase of AniList calls.",
+            "# TYPE anilist_phase_duration_seconds summary",
+        ]
+        for operation, phases in sorted(self.quantiles().items()):
+            for phase, stats in sorted(phases.items(), key=lambda item: PHASES.index(item[0])):
+                labels = f'operation="{operation}",phase="{phase}"'
+                for quantile in QUANTILES:
+                    value = stats[f"p{round(quantile * 100)}"]
+                    lines.append(f'anilist_phase_duration_seconds{{{labels},quantile="{quantile}"}} {value!r}')
+                lines.append(f"anilist_phase_duration_seconds_sum{{{labels}}} {stats['sum']!r}")
+                lines.append(f"anilist_phase_duration_seconds_count{{{labels}}} {stats['count']}")
+
+        with self._lock:
+            sizes = sorted(self._bytes.items())
+            responses = sorted(self._responses.items(), key=lambda item: (item[0][0], item[0][1] or 0))
+        lines.append("# HELP anilist_response_bytes_total Bytes of AniList response bodies.")
+        lines.append("# TYPE anilist_response_bytes_total counter")
+        for operation, size in sizes:
+            lines.append(f'anilist_response_bytes_total{{operation="{operation}"}} {size}')
+        lines.append("# HELP anilist_responses_total AniList responses by status code.")
+        lines.append("# TYPE anilist_responses_total counter")
+        for (operation, status_code), count in responses:
+            lines.append(f'anilist_responses_total{{operation="{operation}",status="{status_code}"}} {count}')
+        return "\n".join(lines) + "\n"
+
+    def clear(self) -> None:
+        """Drops every statistic."""
+        with self._lock:
+            self._samples.clear()
+            self._totals.clear()
+            self._bytes.clear()
+            self._responses.clear()
@@ -0,0 +1,178 @@
+#!/usr/bin/env python3
+# SPDX-License-Identifier: MIT
+# Copyright (C) 2021-2022 Amano Team <https://amanoteam.com/> and the python-anilist contributors
+
+"""Registry of the operations behind `search`, `get`, `get_many` and `get_activity`.
+
+Both clients dispatch on these tables, so an operation added here is picked up by the
+sync and async dispatchers alike.
+"""
+
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from . import queries
+from .client_process import (
+    process_get_anime,
+    process_get_anime_activity,
+    process_get_character,
+    process_get_list,
+    process_get_manga,
+    process_get_manga_activity,
+    process_get_many_anime,
+    process_get_many_manga,
+    process_get_message_activity,
+    process_get_message_activity_sent,
+    process_get_staff,
+    process_get_text_activity,
+    process_get_user,
+    process_search_anime,
+    process_search_character,
+    process_search_manga,
+    process_search_staff,
+    process_search_user,
+)
+
+
+class Operation:
+    """A query with everything needed to run it and process its response.
+
+    Args:
+        method (str): Client method running the operation, like "search_anime".
+        query (str): Query name in `anilist.queries`, loaded on first use.
+        content_type (str): Content type of the response, used for the cache TTL.
+        processor (Callable[..., Any]): `process_*` function for the response.
+        variables (Dict[str, Any], optional): Variables added to those of every call. Defaults to None.
+        args (Tuple[Any, ...], optional): Arguments passed to the processor after the data. Defaults to ().
+        options (Tuple[str, ...], optional): Client attributes passed to the processor last,
+            like "lazy" or "store". Defaults to ().
+        paged (bool, optional): Whether the processor returns page info with the items. Defaults to True.
+    """
+
+    __slots__ = ("method", "query", "content_type", "processor", "variables", "args", "options", "paged")
+
+    def __init__(
+            self,
+            method: str,
+            query: str,
+            content_type: str,
+            processor: Callable[..., Any],
+            variables: Optional[Dict[str, Any]] = None,
+            args: Tuple[Any, ...] = (),
+            options: Tuple[str, ...] = (),
+            paged: bool = True,
+    ) -> None:
+        self.method = method
+        self.query = query
+        self.content_type = content_type
+        self.processor = processor
+        self.variables = variables or {}
+        self.args = args
+        self.options = options
+        self.paged = paged
+
+    def __repr__(self) -> str:
+        return f"<Operation {self.method} {self.query}>"
+
+    def text(self) -> str:
+        """Returns the query text."""
+        return queries.load(self.query)
+
+    def bind(self, variables: dict) -> dict:
+        """Returns the variables of a call, with the operation's own ones added."""
+        return {**variables, **self.variables} if self.variables else variables
+
+
+_CHARACTER_SEARCH = Operation(
+    "search_character", "CHARACTER_SEARCH_QUERY", "character", process_search_character, options=("store",)
+)
+
+SEARCH: Dict[str, Operation] = {
+    "anime": Operation(
+        "search_anime", "ANIME_SEARCH_QUERY", "anime", process_search_anime, {"MediaType": "ANIME"}, options=("store",)
+    ),
+    "manga": Operation(
+        "search_manga", "MANGA_SEARCH_QUERY", "manga", process_search_manga, {"MediaType": "MANGA"}, options=("store",)
+    ),
+    "character": _CHARACTER_SEARCH,
+    "char": _CHARACTER_SEARCH,
+    "staff": Operation("search_staff", "STAFF_SEARCH_QUERY", "staff", process_search_staff, options=("store",)),
+    "user": Operation("search_user", "USER_SEARCH_QUERY", "user", process_search_user),
+}
+
+_CHARACTER_GET = Operation(
+    "get_character", "CHARACTER_GET_QUERY", "character", process_get_character, paged=False, options=("store",)
+)
+
+GET: Dict[str, Operation] = {
+    "anime": Operation(
+        "get_anime", "ANIME_GET_QUERY", "anime", process_get_anime, {"MediaType": "ANIME"},
+        options=("store",), paged=False,
+    ),
+    "manga": Operation(
+        "get_manga", "MANGA_GET_QUERY", "manga", process_get_manga, {"MediaType": "MANGA"},
+        options=("store",), paged=False,
+    ),
+    "character": _CHARACTER_GET,
+    "char": _CHARACTER_GET,
+    "staff": Operation("get_staff", "STAFF_GET_QUERY", "staff", process_get_staff, options=("store",), paged=False),
+    "user": Operation("get_user", "USER_GET_QUERY", "user", process_get_user, options=("store",), paged=False),
+    "list_anime": Operation(
+        "get_list", "LIST_GET_QUERY_ANIME", "list", process_get_list, args=("anime",), options=("lazy", "store")
+    ),
+    "list_manga": Operation(
+        "get_list", "LIST_GET_QUERY_MANGA", "list", process_get_list, args=("manga",), options=("lazy", "store")
+    ),
+}
+
+GET_MANY: Dict[str, Operation] = {
+    "anime": Operation(
+        "get_many_anime", "ANIME_GET_MANY_QUERY", "anime", process_get_many_anime, options=("store",), paged=False
+    ),
+    "manga": Operation(
+        "get_many_manga", "MANGA_GET_MANY_QUERY", "manga", process_get_many_manga, options=("store",), paged=False
+    ),
+}
+
+ACTIVITY: Dict[str, Operation] = {
+    "anime": Operation(
+        "get_anime_activity", "LIST_ACTIVITY_QUERY", "activity", process_get_anime_activity,
+        {"activity_type": "ANIME_LIST"}, options=("lazy", "store"),
+    ),
+    "manga": Operation(
+        "get_manga_activity", "LIST_ACTIVITY_QUERY_MANGA", "activity", process_get_manga_activity,
+        {"activity_type": "MANGA_LIST"}, options=("lazy", "store"),
+    ),
+    "text": Operation("get_text_activity", "TEXT_ACTIVITY_QUERY", "activity", process_get_text_activity),
+    "message": Operation(
+        "get_message_activity", "MESSAGE_ACTIVITY_QUERY", "activity", process_get_message_activity, paged=False
+    ),
+    "message_sent": Operation(
+        "get_message_activity_sent", "MESSAGE_ACTIVITY_QUERY_SENT", "activity", process_get_message_activity_sent,
+        paged=False,
+    ),
+}
+
+
+def lookup(registry: Dict[str, Operation], content_type: str) -> Operation:
+    """Returns the operation of a content type, matched case insensitively.
+
+    Args:
+        registry (Dict[str, Operation]): SEARCH, GET, GET_MANY or ACTIVITY.
+        content_type (str): Content type, like "anime" or "char".
+
+    Raises:
+        TypeError: If content type is not a string.
+        TypeError: If the content type is invalid.
+
+    Returns:
+        Operation: Registered operation.
+    """
+    if not isinstance(content_type, str):
+        raise TypeError(
+            f"content_type argument must be a string, not '{content_type.__class__.__name__}'"
+        )
+    # Exact match first, lowercasing only for the rare mixed case content type.
+    operation = registry.get(content_type) or registry.get(content_type.lower())
+    if operation is None:
+        raise TypeError("There is no such content type.")
+    return operation
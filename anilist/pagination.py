@@ -0,0 +1,189 @@
+#!/usr/bin/env python3
+# SPDX-License-Identifier: MIT
+# Copyright (C) 2021-2022 Amano Team <https://amanoteam.com/> and the python-anilist contributors
+
+import asyncio
+from collections import deque
+from concurrent.futures import Executor
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, Iterator, List, Optional, Tuple
+
+from .types import PageInfo
+
+Page = Optional[Tuple[List[Any], Optional[PageInfo]]]
+
+
+def _last_page(result: Tuple[List[Any], Optional[PageInfo]], page: int, per_page: int) -> int:
+    items, pages = result
+    if pages is not None:
+        return pages.last
+    # Without pagination info, keep going one page at a time while pages come back full.
+    return page + 1 if len(items) >= per_page else page
+
+
+def _should_prefetch(page: int, last: int, per_page: int, max_items: Optional[int]) -> bool:
+    return page <= last and (max_items is None or (page - 1) * per_page < max_items)
+
+
+def iter_pages(
+    fetch: Callable[[int], Page],
+    *,
+    per_page: int,
+    max_items: Optional[int] = None,
+    concurrency: int = 2,
+    executor: Optional[Executor] = None,
+) -> Iterator[Any]:
+    """Yields the items of every page, fetching the next pages on an executor.
+
+    Args:
+        fetch (Callable[[int], Page]): Returns the items and pagination info of a page.
+        per_page (int): Items requested per page.
+        max_items (int, optional): Stop after this many items. Defaults to None.
+        concurrency (int, optional): Pages fetched ahead of the one being consumed. Defaults to 2.
+        executor (Executor, optional): Pool fetching the pages ahead, like the client's thread pool.
+            Defaults to None, which fetches each page when it is reached.
+
+    Yields:
+        Any: Page items, in order.
+    """
+    result = fetch(1)
+    if not result:
+        return
+    last = _last_page(result, 1, per_page)
+    count = 0
+    next_page = 2
+    pending = deque()
+    try:
+        while True:
+            while (
+                executor is not None
+                and len(pending) < concurrency
+                and _should_prefetch(next_page, last, per_page, max_items)
+            ):
+                pending.append((next_page, executor.submit(fetch, next_page)))
+                next_page += 1
+            for item in result[0]:
+                yield item
+                count += 1
+                if max_items is not None and count >= max_items:
+                    return
+            if pending:
+                page, future = pending.popleft()
+                result = future.result()
+            elif executor is None and _should_prefetch(next_page, last, per_page, max_items):
+                page = next_page
+                next_page += 1
+                result = fetch(page)
+            else:
+                return
+            if not result:
+                return
+            last = max(last, _last_page(result, page, per_page))
+    finally:
+        for _, future in pending:
+            future.cancel()
+
+
+async def aiter_pages(
+    fetch: Callable[[int], Awaitable[Page]],
+    *,
+    per_page: int,
+    max_items: Optional[int] = None,
+    concurrency: int = 2,
+) -> AsyncIterator[Any]:
+    """Yields the items of every page, fetching the next pages concurrently.
+
+    Args:
+        fetch (Callable[[int], Awaitable[Page]]): Returns the items and pagination info of a page.
+        per_page (int): Items requested per page.
+        max_items (int, optional): Stop after this many items. Defaults to None.
+        concurrency (int, optional): Pages fetched ahead of the one being consumed. Defaults to 2.
+
+    Yields:
+        Any: Page items, in order.
+    """
+    result = await fetch(1)
+    if not result:
+        return
+    last = _last_page(result, 1, per_page)
+    count = 0
+    next_page = 2
+    pending = deque()
+    try:
+        while True:
+            while len(pending) < concurrency and _should_prefetch(next_page, last, per_page, max_items):
+                pending.append((next_page, asyncio.ensure_future(fetch(next_page))))
+                next_page += 1
+            for item in result[0]:
+                yield item
+                count += 1
+                if max_items is not None and count >= max_items:
+                    return
+            if not pending:
+                return
+            page, task = pending.popleft()
+            result = await task
+            if not result:
+                return
+            last = max(last, _last_page(result, page, per_page))
+    finally:
+        for _, task in pending:
+            task.cancel()
+
+
+def updated_at(entry: Any) -> Optional[int]:
+    """Returns the update timestamp of a list entry, model or `anilist.schema` struct."""
+    date = getattr(entry, "update_date", None)
+    if date is not None:
+        return date.get_timestamp()
+    return getattr(entry, "updated_at", None)
+
+
+def updated_since(
+    entries: List[Any], since: Optional[int], snapshot: Optional[Dict[int, Any]] = None
+) -> Tuple[List[Any], bool]:
+    """Keeps the entries of a page sorted by update time, newest first, updated at or after a watermark.
+
+    Timestamps have a resolution of one second, so entries updated exactly at the watermark
+    are kept: a change made later in that second has the same timestamp. Those the snapshot
+    already holds with that timestamp are the ones seen by the previous sync and are dropped.
+
+    Args:
+        entries (List[Any]): List entries.
+        since (int, optional): Watermark timestamp. None keeps every entry.
+        snapshot (Dict[int, Any], optional): Previously synced entries by id. Defaults to None.
+
+    Returns:
+        Tuple[List[Any], bool]: Kept entries, and whether an older entry was reached so no later page can match.
+    """
+    if since is None:
+        return entries, False
+    kept = []
+    for entry in entries:
+        timestamp = updated_at(entry)
+        if timestamp is not None and timestamp < since:
+            return kept, True
+        if timestamp == since and snapshot is not None and entry.id in snapshot:
+            if updated_at(snapshot[entry.id]) == since:
+                continue
+        kept.append(entry)
+    return kept, False
+
+
+def merge_changes(changed: List[Any], since: Optional[int], snapshot: Optional[Dict[int, Any]]) -> Optional[int]:
+    """Stores changed list entries in a snapshot keyed by entry id and returns the new watermark.
+
+    Args:
+        changed (List[Any]): Entries updated since the watermark.
+        since (int, optional): Previous watermark.
+        snapshot (Dict[int, Any], optional): Entries by id, updated in place.
+
+    Returns:
+        Optional[int]: Latest update timestamp seen, or the previous watermark if nothing changed.
+    """
+    if snapshot is not None:
+        for entry in changed:
+            snapshot[entry.id] = entry
+    timestamps = [timestamp for timestamp in map(updated_at, changed) if timestamp is not None]
+    if since is not None:
+        timestamps.append(since)
+    return max(timestamps, default=None)
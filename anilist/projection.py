@@ -0,0 +1,233 @@
+#!/usr/bin/env python3
+# SPDX-License-Identifier: MIT
+# Copyright (C) 2021-2022 Amano Team <https://amanoteam.com/> and the python-anilist contributors
+
+import re
+from functools import lru_cache
+from typing import Dict, Iterable, List, Optional, Tuple, Union
+
+from .queries import QUERY_NAMES
+
+_SEPARATOR = re.compile(r"[\s,]*")
+_NAME = re.compile(r"\w+")
+_MEDIA = re.compile(r"\bmedia\s*\(")
+
+ANIME_FIELDS = {
+    "id": ["id"],
+    "title": ["title"],
+    "url": ["siteUrl"],
+    "episodes": ["episodes"],
+    "description": ["description"],
+    "format": ["format"],
+    "status": ["status"],
+    "duration": ["duration"],
+    "genres": ["genres"],
+    "is_adult": ["isAdult"],
+    "tags": ["tags"],
+    "studios": ["studios"],
+    "start_date": ["startDate"],
+    "end_date": ["endDate"],
+    "season": ["season", "seasonYear", "seasonInt"],
+    "country": ["countryOfOrigin"],
+    "cover": ["coverImage"],
+    "banner": ["bannerImage"],
+    "source": ["source"],
+    "hashtag": ["hashtag"],
+    "synonyms": ["synonyms"],
+    "score": ["meanScore", "averageScore"],
+    "popularity": ["popularity"],
+    "rankings": ["rankings"],
+    "next_airing": ["nextAiringEpisode"],
+    "trailer": ["trailer"],
+    "staff": ["staff"],
+    "characters": ["characters"],
+    "relations": ["relations"],
+}
+
+MANGA_FIELDS = {
+    key: value for key, value in ANIME_FIELDS.items() if key not in ["episodes", "format", "duration"]
+}
+MANGA_FIELDS.update(chapters=["chapters"], volumes=["volumes"])
+
+PRESETS = {
+    "minimal": ["id", "title", "url"],
+    "card": [
+        "id", "title", "url", "cover", "score", "format", "status", "episodes",
+        "chapters", "genres", "is_adult", "season", "popularity",
+    ],
+}
+
+# Fields the Anime and Manga constructors can not do without.
+REQUIRED = ["id", "title"]
+
+
+def _skip_group(text: str, pos: int, opening: str, closing: str) -> int:
+    depth = 0
+    for index in range(pos, len(text)):
+        if text[index] == opening:
+            depth += 1
+        elif text[index] == closing:
+            depth -= 1
+            if depth == 0:
+                return index + 1
+    raise ValueError(f"unbalanced '{opening}' in query")
+
+
+def split_fields(block: str) -> List[Tuple[str, str]]:
+    """Splits a selection set into its top level fields.
+
+    Args:
+        block (str): Text between the braces of a selection set.
+
+    Returns:
+        List[Tuple[str, str]]: Name and full text (arguments and sub-selection included) of each field.
+    """
+    fields = []
+    pos = _SEPARATOR.match(block).end()
+    while pos < len(block):
+        start = pos
+        pos = _NAME.match(block, pos).end()
+        name = block[start:pos]
+        lookahead = _SEPARATOR.match(block, pos).end()
+        if block.startswith("(", lookahead):
+            pos = _skip_group(block, lookahead, "(", ")")
+            lookahead = _SEPARATOR.match(block, pos).end()
+        if block.startswith("{", lookahead):
+            pos = _skip_group(block, lookahead, "{", "}")
+        fields.append((name, block[start:pos]))
+        pos = _SEPARATOR.match(block, pos).end()
+    return fields
+
+
+class Projection:
+    """Media query that can be rendered with a subset of its fields.
+
+    Args:
+        query (str): Query text with a `media(...) { ... }` selection.
+        fields (Dict[str, List[str]]): GraphQL fields behind each model attribute.
+    """
+
+    def __init__(self, query: str, fields: Dict[str, List[str]]) -> None:
+        start = query.index("{", _MEDIA.search(query).end())
+        end = _skip_group(query, start, "{", "}")
+        self.query = query
+        self.prefix = query[:start + 1]
+        self.suffix = query[end - 1:]
+        self.selection = dict(split_fields(query[start + 1:end - 1]))
+        self.fields = fields
+
+    def resolve(self, fields: Union[str, Iterable[str]]) -> Tuple[str, ...]:
+        """Turns a preset name or attribute names into the GraphQL fields to select.
+
+        Args:
+            fields (Union[str, Iterable[str]]): "minimal", "card", "full", or model attribute names.
+                GraphQL field names of the query are accepted as well.
+
+        Raises:
+            TypeError: If a preset or field is unknown.
+
+        Returns:
+            Tuple[str, ...]: GraphQL fields, in query order.
+        """
+        strict = True
+        if isinstance(fields, str):
+            if fields == "full":
+                return tuple(self.selection)
+            if fields not in PRESETS:
+                raise TypeError(f"There is no such fields preset ({fields}).")
+            # Presets are shared by anime and manga, so they may name fields only one of them has.
+            fields = PRESETS[fields]
+            strict = False
+
+        selected = set()
+        for field in REQUIRED + list(fields):
+            if field in self.fields:
+                selected.update(self.fields[field])
+            elif field in self.selection:
+                selected.add(field)
+            elif strict:
+                raise TypeError(f"There is no such field ({field}).")
+        return tuple(name for name in self.selection if name in selected)
+
+    def render(self, fields: Union[str, Iterable[str]]) -> str:
+        """Renders the query with only the given fields.
+
+        Args:
+            fields (Union[str, Iterable[str]]): See `resolve()`.
+
+        Returns:
+            str: Query text.
+        """
+        return _render(self, self.resolve(fields))
+
+
+@lru_cache(maxsize=128)
+def _render(projection: Projection, names: Tuple[str, ...]) -> str:
+    selection = "".join(projection.selection[name] + "\n" for name in names)
+    text = projection.prefix + "\n" + selection + projection.suffix
+    # Trimmed queries are reported under the name of the full one.
+    if projection.query in QUERY_NAMES:
+        QUERY_NAMES.setdefault(text, QUERY_NAMES[projection.query])
+    return text
+
+
+@lru_cache(maxsize=None)
+def _projection(query: str, media_type: str) -> Projection:
+    return Projection(query, MANGA_FIELDS if media_type == "manga" else ANIME_FIELDS)
+
+
+def project(
+    query: str,
+    fields: Optional[Union[str, Iterable[str]]],
+    media_type: str = "anime",
+) -> str:
+    """Trims a media query down to the requested fields.
+
+    Args:
+        query (str): Query text with a `media(...) { ... }` selection.
+        fields (Union[str, Iterable[str]], optional): "minimal", "card", "full", or model attribute names.
+            None selects every field.
+        media_type (str, optional): anime or manga, used to map attribute names. Defaults to "anime".
+
+    Returns:
+        str: Query text to send.
+    """
+    if fields is None or fields == "full":
+        return query
+    if not isinstance(fields, str):
+        fields = tuple(fields)
+    return _projection(query, media_type).render(fields)
+
+
+def selected_fields(
+    query: str,
+    fields: Optional[Union[str, Iterable[str]]],
+    media_type: str = "anime",
+) -> Tuple[str, ...]:
+    """Returns the GraphQL media fields `project()` selects for the given fields.
+
+    Args:
+        query (str): Query text with a `media(...) { ... }` selection.
+        fields (Union[str, Iterable[str]], optional): See `project()`.
+        media_type (str, optional): anime or manga. Defaults to "anime".
+
+    Returns:
+        Tuple[str, ...]: GraphQL fields, in query order.
+    """
+    return _projection(query, media_type).resolve("full" if fields is None else fields)
+
+
+@lru_cache(maxsize=None)
+def root_fields(query: str) -> Tuple[str, ...]:
+    """Returns the fields selected on the root field of a single item query, like `Character(id: $id)`.
+
+    Args:
+        query (str): Query text.
+
+    Returns:
+        Tuple[str, ...]: GraphQL fields, in query order.
+    """
+    start = query.index("{")
+    (_, root), = split_fields(query[start + 1:_skip_group(query, start, "{", "}") - 1])
+    start = root.index("{")
+    return tuple(name for name, _ in split_fields(root[start + 1:_skip_group(root, start, "{", "}") - 1]))
@@ -3,9 +3,27 @@
 #
 # SPDX-License-Identifier: MIT
 
-from importlib.resources import read_text
+"""GraphQL queries of the clients.
 
-from ._query_files import activity, get, search
+Queries are read from `_query_files` on first access, so importing this module does no
+resource I/O. `python -m anilist.queries.build` bakes the minified queries into a
+generated `_compiled` module, which is then used instead of the files.
+"""
+
+from typing import Dict, List
+
+from ..documents import minify, query_hash
+
+try:
+    from ._compiled import QUERIES as _COMPILED
+except ImportError:
+    _COMPILED: Dict[str, str] = {}
+
+try:
+    from ._compiled import HASHES as _COMPILED_HASHES
+except ImportError:
+    # Built before the hashes were baked in too.
+    _COMPILED_HASHES: Dict[str, str] = {}
 
 __all__ = (
     "ANIME_SEARCH_QUERY",
@@ -18,38 +36,196 @@ __all__ = (
     "CHARACTER_GET_QUERY",
     "STAFF_GET_QUERY",
     "USER_GET_QUERY",
+    "ANIME_GET_MANY_QUERY",
+    "MANGA_GET_MANY_QUERY",
     "LIST_GET_QUERY",
     "LIST_ITEM_GET_QUERY",
     "LIST_GET_QUERY_ANIME",
     "LIST_GET_QUERY_MANGA",
+    "LIST_COLLECTION_QUERY_ANIME",
+    "LIST_COLLECTION_QUERY_MANGA",
     "LIST_ACTIVITY_QUERY",
+    "LIST_ACTIVITY_QUERY_MANGA",
     "TEXT_ACTIVITY_QUERY",
     "MESSAGE_ACTIVITY_QUERY",
     "MESSAGE_ACTIVITY_QUERY_SENT",
     "MESSAGE_ACTIVITY_SENT_QUERY",
+    "QUERY_NAMES",
 )
 
-ANIME_SEARCH_QUERY = read_text(search, "anime_search.graphql")
-MANGA_SEARCH_QUERY = read_text(search, "manga_search.graphql")
-CHARACTER_SEARCH_QUERY = read_text(search, "character_search.graphql")
-STAFF_SEARCH_QUERY = read_text(search, "staff_search.graphql")
-USER_SEARCH_QUERY = read_text(search, "user_search.graphql")
-
-ANIME_GET_QUERY = read_text(get, "anime_get.graphql")
-MANGA_GET_QUERY = read_text(get, "manga_get.graphql")
-CHARACTER_GET_QUERY = read_text(get, "character_get.graphql")
-STAFF_GET_QUERY = read_text(get, "staff_get.graphql")
-USER_GET_QUERY = read_text(get, "user_get.graphql")
-LIST_GET_QUERY = read_text(get, "list_get.graphql")
-LIST_ITEM_GET_QUERY = read_text(get, "list_item_get.graphql")
-LIST_GET_QUERY_ANIME = read_text(get, "list_get_anime.graphql")
-LIST_GET_QUERY_MANGA = read_text(get, "list_get_manga.graphql")
-
-# I wonder if the activity queries should be lumped under "get" instead.
-# They function pretty much exactly the same.
-
-LIST_ACTIVITY_QUERY = read_text(activity, "list_activity.graphql")
-TEXT_ACTIVITY_QUERY = read_text(activity, "text_activity.graphql")
-MESSAGE_ACTIVITY_QUERY = read_text(activity, "message_activity.graphql")
-MESSAGE_ACTIVITY_QUERY_SENT = read_text(activity, "message_activity_sent.graphql")
-MESSAGE_ACTIVITY_SENT_QUERY = MESSAGE_ACTIVITY_QUERY_SENT
+# Query name to the package and file it is read from.
+FILES = {
+    "ANIME_SEARCH_QUERY": ("search", "anime_search.graphql"),
+    "MANGA_SEARCH_QUERY": ("search", "manga_search.graphql"),
+    "CHARACTER_SEARCH_QUERY": ("search", "character_search.graphql"),
+    "STAFF_SEARCH_QUERY": ("search", "staff_search.graphql"),
+    "USER_SEARCH_QUERY": ("search", "user_search.graphql"),
+    "ANIME_GET_QUERY": ("get", "anime_get.graphql"),
+    "MANGA_GET_QUERY": ("get", "manga_get.graphql"),
+    "CHARACTER_GET_QUERY": ("get", "character_get.graphql"),
+    "STAFF_GET_QUERY": ("get", "staff_get.graphql"),
+    "USER_GET_QUERY": ("get", "user_get.graphql"),
+    "LIST_GET_QUERY": ("get", "list_get.graphql"),
+    "LIST_ITEM_GET_QUERY": ("get", "list_item_get.graphql"),
+    "LIST_GET_QUERY_ANIME": ("get", "list_get_anime.graphql"),
+    "LIST_GET_QUERY_MANGA": ("get", "list_get_manga.graphql"),
+    # I wonder if the activity queries should be lumped under "get" instead.
+    # They function pretty much exactly the same.
+    "LIST_ACTIVITY_QUERY": ("activity", "list_activity.graphql"),
+    "TEXT_ACTIVITY_QUERY": ("activity", "text_activity.graphql"),
+    "MESSAGE_ACTIVITY_QUERY": ("activity", "message_activity.graphql"),
+    "MESSAGE_ACTIVITY_QUERY_SENT": ("activity", "message_activity_sent.graphql"),
+}
+
+_MANY = (
+    ("query($id: Int)", "query($ids: [Int], $per_page: Int = 50)"),
+    ("perPage: 1)", "perPage: $per_page)"),
+    ("media(id: $id,", "media(id_in: $ids,"),
+)
+
+
+def _collection(kind: str) -> tuple:
+    # Turns a list page query into a MediaListCollection query selecting the same entry fields.
+    return (
+        ("$page: Int = 1, $per_page: Int = 25", "$chunk: Int = 1, $per_chunk: Int = 500"),
+        (
+            f"Page(page: $page, perPage: $per_page) {{\n"
+            "        pageInfo {\n"
+            "            total\n"
+            "            currentPage\n"
+            "            lastPage\n"
+            "        }\n"
+            f"        mediaList(userId: $user_id, sort: UPDATED_TIME_DESC, type: {kind}) {{",
+            f"MediaListCollection(userId: $user_id, type: {kind}, chunk: $chunk, perChunk: $per_chunk, "
+            "sort: UPDATED_TIME_DESC) {\n"
+            "        hasNextChunk\n"
+            "        lists {\n"
+            "            name\n"
+            "            status\n"
+            "            isCustomList\n"
+            "            entries {",
+        ),
+        ("\n    }\n}", "\n        }\n    }\n}"),
+    )
+
+
+# Query name to the query it is derived from and the replacements applied to its text.
+DERIVED = {
+    "ANIME_GET_MANY_QUERY": ("ANIME_GET_QUERY", _MANY),
+    "MANGA_GET_MANY_QUERY": ("MANGA_GET_QUERY", _MANY),
+    "LIST_ACTIVITY_QUERY_MANGA": ("LIST_ACTIVITY_QUERY", (("episodes", "chapters\nvolumes"),)),
+    "LIST_COLLECTION_QUERY_ANIME": ("LIST_GET_QUERY_ANIME", _collection("ANIME")),
+    "LIST_COLLECTION_QUERY_MANGA": ("LIST_GET_QUERY_MANGA", _collection("MANGA")),
+}
+
+ALIASES = {
+    "MESSAGE_ACTIVITY_SENT_QUERY": "MESSAGE_ACTIVITY_QUERY_SENT",
+}
+
+# Query text to constant name, used to label metrics. Filled as queries are loaded.
+QUERY_NAMES: Dict[str, str] = {}
+
+# Query text to its minified form, filled as queries are loaded.
+_MINIFIED: Dict[str, str] = {}
+
+# Minified query text to its sha256, filled as built queries are loaded.
+_HASHES: Dict[str, str] = {}
+
+
+def source(name: str) -> str:
+    """Returns the text of a query as read from its `.graphql` file, ignoring any build.
+
+    Args:
+        name (str): Query name, like "ANIME_GET_QUERY".
+
+    Raises:
+        KeyError: If there is no such query.
+
+    Returns:
+        str: Query text.
+    """
+    # Imported here, importlib.resources is slow to import.
+    from importlib.resources import read_text
+
+    name = ALIASES.get(name, name)
+    if name in DERIVED:
+        base, replacements = DERIVED[name]
+        text = source(base)
+        for old, new in replacements:
+            text = text.replace(old, new)
+        return text
+    package, filename = FILES[name]
+    return read_text(f"{__name__}._query_files.{package}", filename)
+
+
+def load(name: str) -> str:
+    """Returns the text of a query, reading it on first use.
+
+    Args:
+        name (str): Query name, like "ANIME_GET_QUERY".
+
+    Raises:
+        KeyError: If there is no such query.
+
+    Returns:
+        str: Query text, minified when the queries were built.
+    """
+    name = ALIASES.get(name, name)
+    text = globals().get(name)
+    if text is None:
+        compiled = _COMPILED.get(name)
+        text = compiled or source(name)
+        QUERY_NAMES.setdefault(text, name)
+        _MINIFIED[text] = compiled or minify(text)
+        if compiled and name in _COMPILED_HASHES:
+            _HASHES[compiled] = _COMPILED_HASHES[name]
+        globals()[name] = text
+    return text
+
+
+def minified(text: str) -> str:
+    """Returns the minified form of a query text.
+
+    The form of the queries returned by `load()` is kept from their first load, so sending
+    them minified costs a dictionary lookup. Other texts, like batched documents, are
+    minified by `anilist.documents.minify`.
+
+    Args:
+        text (str): Query text.
+
+    Returns:
+        str: Minified query text.
+    """
+    return _MINIFIED.get(text) or minify(text)
+
+
+def digest(text: str) -> str:
+    """Returns the sha256 of a query text, as used by automatic persisted queries.
+
+    The hashes of built queries are baked in by `anilist.queries.build`, other texts are
+    hashed by `anilist.documents.query_hash`.
+
+    Args:
+        text (str): Query text, as sent.
+
+    Returns:
+        str: Hex digest.
+    """
+    return _HASHES.get(text) or query_hash(text)
+
+
+def names() -> List[str]:
+    """Returns the name of every query, aliases excluded."""
+    return [name for name in __all__ if name not in ALIASES and name != "QUERY_NAMES"]
+
+
+def __getattr__(name: str) -> str:
+    if name in __all__:
+        text = load(name)
+        globals()[name] = text
+        return text
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def __dir__() -> List[str]:
+    return sorted(set(globals()) | set(__all__))
@@ -0,0 +1,55 @@
+#!/usr/bin/env python3
+# SPDX-License-Identifier: MIT
+# Copyright (C) 2021-2022 Amano Team <https://amanoteam.com/> and the python-anilist contributors
+
+"""Bakes the minified queries and their hashes into `anilist/queries/_compiled.py`.
+
+Once the module exists, `anilist.queries` takes the queries from it instead of reading
+the `.graphql` files, and the clients send the minified text. Run it again after
+changing a query, or delete the module to go back to the files:
+
+    python -m anilist.queries.build [--output PATH]
+"""
+
+import argparse
+from pathlib import Path
+from typing import Dict
+
+from . import names, source
+from ..documents import minify, query_hash
+
+HEADER = """\
+# SPDX-License-Identifier: MIT
+# Generated by `python -m anilist.queries.build`, do not edit.
+
+"""
+
+
+def render(queries: Dict[str, str]) -> str:
+    lines = [HEADER + "QUERIES = {"]
+    lines.extend(f"    {name!r}: {text!r}," for name, text in queries.items())
+    lines.append("}")
+    # sha256 of each query for automatic persisted queries, so it is not hashed at runtime.
+    lines.append("")
+    lines.append("HASHES = {")
+    lines.extend(f"    {name!r}: {query_hash(text)!r}," for name, text in queries.items())
+    lines.append("}")
+    return "\n".join(lines) + "\n"
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument(
+        "--output", type=Path, default=Path(__file__).with_name("_compiled.py"), help="Module to write."
+    )
+    args = parser.parse_args()
+
+    # Always start from the files, not from a previous build.
+    queries = {name: minify(source(name)) for name in names()}
+    args.output.write_text(render(queries))
+    size = sum(len(text) for text in queries.values())
+    print(f"{len(queries)} queries ({size} bytes) written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
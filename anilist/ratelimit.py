@@ -0,0 +1,207 @@
+#!/usr/bin/env python3
+# SPDX-License-Identifier: MIT
+# Copyright (C) 2021-2022 Amano Team <https://amanoteam.com/> and the python-anilist contributors
+
+import asyncio
+import threading
+import time
+import weakref
+from typing import Dict, Mapping, Optional
+
+DEFAULT_LIMIT = 90
+DEFAULT_PERIOD = 60.0
+
+
+class BaseRateLimiter:
+    """Token bucket that follows the rate limit headers sent by AniList.
+
+    The bucket holds up to `limit` tokens and refills `limit` tokens every `period`
+    seconds. Every request takes one token, waiting when the bucket is empty, so bursts
+    are paced instead of being rejected. Responses correct the local estimate through
+    `update()`, and a 429 response blocks the bucket until its `Retry-After`.
+
+    Args:
+        limit (int, optional): Requests allowed per period. Defaults to 90.
+        period (float, optional): Period length in seconds. Defaults to 60.
+
+    Attributes:
+        limit (int): Requests allowed per period, updated from `X-RateLimit-Limit`.
+        queue_depth (int): Requests currently waiting for a token.
+        throttled (int): 429 responses received so far.
+    """
+
+    def __init__(self, *, limit: int = DEFAULT_LIMIT, period: float = DEFAULT_PERIOD) -> None:
+        self.limit = limit
+        self.period = period
+        self.queue_depth = 0
+        self.throttled = 0
+        self._tokens = float(limit)
+        self._updated = time.monotonic()
+        self._blocked_until = 0.0
+        # Guards the bucket, which may be shared between threads.
+        self._state = threading.Lock()
+
+    def _refill(self, now: float) -> None:
+        elapsed = now - self._updated
+        self._updated = now
+        self._tokens = min(float(self.limit), self._tokens + elapsed * self.limit / self.period)
+
+    def _reserve(self) -> float:
+        """Takes a token if one is available, otherwise returns the seconds to wait."""
+        now = time.monotonic()
+        self._refill(now)
+        if self._blocked_until > now:
+            return self._blocked_until - now
+        if self._tokens >= 1:
+            self._tokens -= 1
+            return 0.0
+        return (1 - self._tokens) * self.period / self.limit
+
+    def _update(self, headers: Mapping[str, str], status_code: int) -> Optional[float]:
+        now = time.monotonic()
+        self._refill(now)
+
+        limit = headers.get("X-RateLimit-Limit")
+        if limit and limit.isdecimal() and int(limit) > 0:
+            self.limit = int(limit)
+        remaining = headers.get("X-RateLimit-Remaining")
+        if remaining and remaining.isdecimal():
+            self._tokens = min(self._tokens, float(remaining))
+
+        if status_code != 429:
+            return None
+
+        self.throttled += 1
+        delay = None
+        retry_after = headers.get("Retry-After")
+        reset = headers.get("X-RateLimit-Reset")
+        if retry_after:
+            try:
+                delay = float(retry_after)
+            except ValueError:
+                pass
+        if delay is None and reset and reset.isdecimal():
+            delay = int(reset) - time.time()
+        if delay is None or delay < 0:
+            delay = self.period / self.limit
+
+        self._tokens = 0.0
+        self._blocked_until = max(self._blocked_until, now + delay)
+        return delay
+
+    @property
+    def budget(self) -> float:
+        """Tokens currently available. Zero while blocked by a 429 response."""
+        now = time.monotonic()
+        if self._blocked_until > now:
+            return 0.0
+        elapsed = now - self._updated
+        return min(float(self.limit), self._tokens + elapsed * self.limit / self.period)
+
+    @property
+    def retry_after(self) -> float:
+        """Seconds left until a 429 block is lifted, 0 if not blocked."""
+        return max(0.0, self._blocked_until - time.monotonic())
+
+    def stats(self) -> Dict[str, float]:
+        """Returns the current state of the limiter.
+
+        Returns:
+            Dict[str, float]: limit, budget, queue_depth, retry_after and throttled.
+        """
+        return dict(
+            limit=self.limit,
+            budget=self.budget,
+            queue_depth=self.queue_depth,
+            retry_after=self.retry_after,
+            throttled=self.throttled,
+        )
+
+
+class RateLimiter(BaseRateLimiter):
+    """Thread-safe rate limiter for the synchronous client."""
+
+    def __init__(self, *, limit: int = DEFAULT_LIMIT, period: float = DEFAULT_PERIOD) -> None:
+        super().__init__(limit=limit, period=period)
+        self._queue = threading.Lock()
+
+    def acquire(self) -> None:
+        """Blocks until a request may be sent."""
+        with self._state:
+            self.queue_depth += 1
+        try:
+            with self._queue:
+                while True:
+                    with self._state:
+                        delay = self._reserve()
+                    if delay <= 0:
+                        return
+                    time.sleep(delay)
+        finally:
+            with self._state:
+                self.queue_depth -= 1
+
+    def update(self, headers: Mapping[str, str], status_code: int) -> Optional[float]:
+        """Updates the limiter from a response.
+
+        Args:
+            headers (Mapping[str, str]): Response headers.
+            status_code (int): Response status code.
+
+        Returns:
+            Optional[float]: Seconds to wait before retrying if the request was throttled.
+        """
+        with self._state:
+            return self._update(headers, status_code)
+
+
+class AsyncRateLimiter(BaseRateLimiter):
+    """Rate limiter for the asynchronous client. Waiting requests are served in order.
+
+    It can be shared by event loops running in different threads: they take tokens
+    from the same bucket, and each loop queues its own waiting requests.
+    """
+
+    def __init__(self, *, limit: int = DEFAULT_LIMIT, period: float = DEFAULT_PERIOD) -> None:
+        super().__init__(limit=limit, period=period)
+        self._queues: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, asyncio.Lock]" = (
+            weakref.WeakKeyDictionary()
+        )
+
+    def _enqueue(self) -> asyncio.Lock:
+        # Before Python 3.10 a lock is bound to the loop it was created in, so each loop gets its own.
+        loop = asyncio.get_running_loop()
+        with self._state:
+            queue = self._queues.get(loop)
+            if queue is None:
+                queue = self._queues[loop] = asyncio.Lock()
+            self.queue_depth += 1
+        return queue
+
+    async def acquire(self) -> None:
+        """Waits until a request may be sent."""
+        queue = self._enqueue()
+        try:
+            async with queue:
+                while True:
+                    with self._state:
+                        delay = self._reserve()
+                    if delay <= 0:
+                        return
+                    await asyncio.sleep(delay)
+        finally:
+            with self._state:
+                self.queue_depth -= 1
+
+    def update(self, headers: Mapping[str, str], status_code: int) -> Optional[float]:
+        """Updates the limiter from a response.
+
+        Args:
+            headers (Mapping[str, str]): Response headers.
+            status_code (int): Response status code.
+
+        Returns:
+            Optional[float]: Seconds to wait before retrying if the request was throttled.
+        """
+        with self._state:
+            return self._update(headers, status_code)
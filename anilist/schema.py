@@ -0,0 +1,349 @@
+#!/usr/bin/env python3
+# SPDX-License-Identifier: MIT
+# Copyright (C) 2021-2022 Amano Team <https://amanoteam.com/> and the python-anilist contributors
+
+"""Typed schemas mirroring the selections of `anime_get`, `manga_get`, `list_get_*` and `user_get`.
+
+Response bodies are decoded by msgspec straight into these structs in a single pass,
+skipping the dict walking of `client_process`. Field names are the GraphQL names in
+snake case (`siteUrl` is `site_url`), and every field defaults to None so projected
+queries decode too. Requires msgspec.
+"""
+
+from functools import lru_cache
+from typing import Any, List, Optional, Tuple
+
+import msgspec
+
+from . import types
+
+
+class Struct(msgspec.Struct, rename="camel", gc=False):
+    # Decoded JSON can not hold reference cycles, so instances skip GC tracking.
+    pass
+
+
+class Title(Struct):
+    romaji: Optional[str] = None
+    english: Optional[str] = None
+    native: Optional[str] = None
+    user_preferred: Optional[str] = None
+
+
+class Name(Struct):
+    first: Optional[str] = None
+    middle: Optional[str] = None
+    last: Optional[str] = None
+    full: Optional[str] = None
+    native: Optional[str] = None
+    user_preferred: Optional[str] = None
+
+
+class FuzzyDate(Struct):
+    year: Optional[int] = None
+    month: Optional[int] = None
+    day: Optional[int] = None
+
+
+class Cover(Struct):
+    medium: Optional[str] = None
+    large: Optional[str] = None
+    extra_large: Optional[str] = None
+
+
+class Image(Struct):
+    medium: Optional[str] = None
+    large: Optional[str] = None
+
+
+class Tag(Struct):
+    name: Optional[str] = None
+
+
+class Studio(Struct):
+    id: Optional[int] = None
+    name: Optional[str] = None
+    is_animation_studio: Optional[bool] = None
+    site_url: Optional[str] = None
+    favourites: Optional[int] = None
+
+
+class StudioConnection(Struct):
+    nodes: List[Studio] = []
+
+
+class Ranking(Struct):
+    type: Optional[str] = None
+    all_time: Optional[bool] = None
+    format: Optional[str] = None
+    rank: Optional[int] = None
+    year: Optional[int] = None
+    season: Optional[str] = None
+
+
+class NextAiringEpisode(Struct):
+    time_until_airing: Optional[int] = None
+    airing_at: Optional[int] = None
+    episode: Optional[int] = None
+
+
+class Trailer(Struct):
+    id: Optional[str] = None
+    thumbnail: Optional[str] = None
+    site: Optional[str] = None
+
+
+class Staff(Struct):
+    id: Optional[int] = None
+    name: Optional[Name] = None
+    language_v2: Optional[str] = None
+    image: Optional[Image] = None
+    description: Optional[str] = None
+    primary_occupations: Optional[List[str]] = None
+    gender: Optional[str] = None
+    date_of_birth: Optional[FuzzyDate] = None
+    date_of_death: Optional[FuzzyDate] = None
+    age: Optional[int] = None
+    years_active: Optional[List[int]] = None
+    home_town: Optional[str] = None
+    site_url: Optional[str] = None
+    favourites: Optional[int] = None
+
+
+class StaffEdge(Struct):
+    node: Optional[Staff] = None
+    role: Optional[str] = None
+
+
+class StaffConnection(Struct):
+    edges: List[StaffEdge] = []
+    nodes: List[Staff] = []
+
+
+class Character(Struct):
+    id: Optional[int] = None
+    name: Optional[Name] = None
+    image: Optional[Image] = None
+    description: Optional[str] = None
+    gender: Optional[str] = None
+    date_of_birth: Optional[FuzzyDate] = None
+    age: Optional[str] = None
+    site_url: Optional[str] = None
+    favourites: Optional[int] = None
+
+
+class CharacterEdge(Struct):
+    node: Optional[Character] = None
+    role: Optional[str] = None
+
+
+class CharacterConnection(Struct):
+    edges: List[CharacterEdge] = []
+    nodes: List[Character] = []
+
+
+class Media(Struct):
+    type: Optional[str] = None
+    id: Optional[int] = None
+    title: Optional[Title] = None
+    site_url: Optional[str] = None
+    episodes: Optional[int] = None
+    chapters: Optional[int] = None
+    volumes: Optional[int] = None
+    description: Optional[str] = None
+    format: Optional[str] = None
+    status: Optional[str] = None
+    duration: Optional[int] = None
+    genres: Optional[List[str]] = None
+    is_adult: Optional[bool] = None
+    tags: Optional[List[Tag]] = None
+    studios: Optional[StudioConnection] = None
+    start_date: Optional[FuzzyDate] = None
+    end_date: Optional[FuzzyDate] = None
+    season: Optional[str] = None
+    season_year: Optional[int] = None
+    season_int: Optional[int] = None
+    country_of_origin: Optional[str] = None
+    cover_image: Optional[Cover] = None
+    banner_image: Optional[str] = None
+    source: Optional[str] = None
+    hashtag: Optional[str] = None
+    synonyms: Optional[List[str]] = None
+    mean_score: Optional[int] = None
+    average_score: Optional[int] = None
+    popularity: Optional[int] = None
+    rankings: Optional[List[Ranking]] = None
+    next_airing_episode: Optional[NextAiringEpisode] = None
+    trailer: Optional[Trailer] = None
+    staff: Optional[StaffConnection] = None
+    characters: Optional[CharacterConnection] = None
+    relations: Optional["MediaConnection"] = None
+
+
+class MediaEdge(Struct):
+    node: Optional[Media] = None
+    relation_type: Optional[str] = None
+
+
+class MediaConnection(Struct):
+    edges: List[MediaEdge] = []
+    nodes: List[Media] = []
+
+
+class MediaList(Struct):
+    id: Optional[int] = None
+    status: Optional[str] = None
+    score: Optional[float] = None
+    progress: Optional[int] = None
+    repeat: Optional[int] = None
+    priority: Optional[int] = None
+    started_at: Optional[FuzzyDate] = None
+    completed_at: Optional[FuzzyDate] = None
+    updated_at: Optional[int] = None
+    created_at: Optional[int] = None
+    media: Optional[Media] = None
+
+
+class PageInfo(Struct):
+    total: Optional[int] = None
+    current_page: Optional[int] = None
+    last_page: Optional[int] = None
+
+
+class Page(Struct):
+    page_info: Optional[PageInfo] = None
+    media: List[Media] = []
+    media_list: List[MediaList] = []
+
+
+class Favourites(Struct):
+    anime: Optional[MediaConnection] = None
+    manga: Optional[MediaConnection] = None
+    characters: Optional[CharacterConnection] = None
+    staff: Optional[StaffConnection] = None
+    studios: Optional[StudioConnection] = None
+
+
+class StatusStatistic(Struct):
+    status: Optional[str] = None
+    count: Optional[int] = None
+
+
+class GenreStatistic(Struct):
+    genre: Optional[str] = None
+    count: Optional[int] = None
+
+
+class TagStatistic(Struct):
+    tag: Optional[Tag] = None
+    count: Optional[int] = None
+
+
+class Statistic(Struct):
+    count: Optional[int] = None
+    mean_score: Optional[float] = None
+    minutes_watched: Optional[int] = None
+    episodes_watched: Optional[int] = None
+    chapters_read: Optional[int] = None
+    volumes_read: Optional[int] = None
+    statuses: List[StatusStatistic] = []
+    genres: List[GenreStatistic] = []
+    tags: List[TagStatistic] = []
+
+
+class Statistics(Struct):
+    anime: Optional[Statistic] = None
+    manga: Optional[Statistic] = None
+
+
+class UserOptions(Struct):
+    profile_color: Optional[str] = None
+
+
+class User(Struct):
+    id: Optional[int] = None
+    name: Optional[str] = None
+    about: Optional[str] = None
+    avatar: Optional[Image] = None
+    banner_image: Optional[str] = None
+    favourites: Optional[Favourites] = None
+    statistics: Optional[Statistics] = None
+    site_url: Optional[str] = None
+    donator_tier: Optional[int] = None
+    donator_badge: Optional[str] = None
+    created_at: Optional[int] = None
+    updated_at: Optional[int] = None
+    options: Optional[UserOptions] = None
+
+
+class MediaData(Struct):
+    page: Optional[Page] = msgspec.field(default=None, name="Page")
+
+
+class ListData(Struct):
+    anime: Optional[Page] = None
+    manga: Optional[Page] = None
+
+
+class UserData(Struct):
+    user: Optional[User] = msgspec.field(default=None, name="User")
+
+
+class MediaResponse(Struct):
+    """Response of `anime_get` and `manga_get`."""
+
+    data: Optional[MediaData] = None
+    errors: Optional[List[Any]] = None
+
+
+class ListResponse(Struct):
+    """Response of `list_get_anime` and `list_get_manga`."""
+
+    data: Optional[ListData] = None
+    errors: Optional[List[Any]] = None
+
+
+class UserResponse(Struct):
+    """Response of `user_get`."""
+
+    data: Optional[UserData] = None
+    errors: Optional[List[Any]] = None
+
+
+@lru_cache(maxsize=None)
+def _decoder(schema: type) -> msgspec.json.Decoder:
+    return msgspec.json.Decoder(schema)
+
+
+def decode(body: bytes, schema: type) -> Any:
+    """Decodes a response body into a schema.
+
+    Args:
+        body (bytes): Raw response body.
+        schema (type): MediaResponse, ListResponse or UserResponse.
+
+    Returns:
+        Any: Instance of the schema.
+    """
+    return _decoder(schema).decode(body)
+
+
+def process_media(response: MediaResponse) -> Optional[Media]:
+    if response.data and response.data.page and response.data.page.media:
+        return response.data.page.media[0]
+    return None
+
+
+def process_list(response: ListResponse, content_type: str) -> Optional[Tuple[List[MediaList], types.PageInfo]]:
+    # Pagination info is returned as the model the iterators and callers already expect.
+    page = response.data and (response.data.manga if "manga" in content_type else response.data.anime)
+    if page and page.page_info:
+        info = page.page_info
+        return page.media_list, types.PageInfo(total_items=info.total, current=info.current_page, last=info.last_page)
+    return None
+
+
+def process_user(response: UserResponse) -> Optional[User]:
+    if response.data:
+        return response.data.user
+    return None
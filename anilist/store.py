@@ -0,0 +1,162 @@
+#!/usr/bin/env python3
+# SPDX-License-Identifier: MIT
+# Copyright (C) 2021-2022 Amano Team <https://amanoteam.com/> and the python-anilist contributors
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+from .cache import DEFAULT_TTLS
+
+Entry = List[Any]  # [expires, fields, model]
+
+
+class EntityStore:
+    """Normalized store of the anime, manga, characters, staff and studios found in responses.
+
+    Entities are keyed by content type and id. Every response processed by a client with
+    a store merges the GraphQL fields of its entities into the stored ones, wherever they
+    appear: media of list entries and activities, user favourites, relations or search
+    results. The model built for an entity is shared by every response that contains it
+    until new fields arrive, so do not modify returned objects.
+
+    `get_anime`, `get_manga`, `get_many*`, `get_character` and `get_staff` are answered
+    from the store when the stored fields cover the requested ones.
+
+    Args:
+        max_entities (int, optional): Maximum stored entities, least recently used are dropped. Defaults to 10000.
+        ttl (float, optional): Seconds the fields of an unlisted content type stay fresh. Defaults to 300.
+        ttls (Dict[str, float], optional): Seconds per content type, merged over `DEFAULT_TTLS`.
+
+    Attributes:
+        hits (int): Lookups answered from the store.
+        misses (int): Lookups of missing, expired or partly known entities.
+    """
+
+    def __init__(
+        self,
+        *,
+        max_entities: int = 10000,
+        ttl: float = 300.0,
+        ttls: Dict[str, float] = None,
+    ) -> None:
+        if max_entities < 1:
+            raise TypeError("max_entities argument must be at least 1")
+
+        self.max_entities = max_entities
+        self.ttl = ttl
+        self.ttls = dict(DEFAULT_TTLS)
+        if ttls:
+            self.ttls.update(ttls)
+
+        self.hits = 0
+        self.misses = 0
+
+        self._entries: "OrderedDict[Tuple[str, int], Entry]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _merge(self, kind: str, item: dict) -> Entry:
+        key = (kind, item["id"])
+        now = time.monotonic()
+        entry = self._entries.get(key)
+        if entry is None or entry[0] <= now:
+            entry = [0.0, dict(item), None]
+            self._entries[key] = entry
+        else:
+            fields = entry[1]
+            for name, value in item.items():
+                if name not in fields or fields[name] != value:
+                    fields[name] = value
+                    entry[2] = None
+            self._entries.move_to_end(key)
+        entry[0] = now + self.ttls.get(kind, self.ttl)
+        while len(self._entries) > self.max_entities:
+            self._entries.popitem(last=False)
+        return entry
+
+    def merge(self, kind: str, item: dict) -> dict:
+        """Merges the fields of an entity into the store.
+
+        Args:
+            kind (str): anime, manga, character, staff or studio.
+            item (dict): GraphQL fields of the entity, with its id.
+
+        Returns:
+            dict: Every stored field of the entity.
+        """
+        with self._lock:
+            return self._merge(kind, item)[1]
+
+    def build(self, kind: str, item: dict, construct: Callable[[dict], Any]) -> Any:
+        """Merges an entity and returns its shared model.
+
+        Args:
+            kind (str): anime, manga, character, staff or studio.
+            item (dict): GraphQL fields of the entity, with its id.
+            construct (Callable[[dict], Any]): `construct_*_object` function for the model.
+
+        Returns:
+            Any: Model built from every stored field of the entity.
+        """
+        with self._lock:
+            entry = self._merge(kind, item)
+            if entry[2] is None:
+                entry[2] = construct(entry[1])
+            return entry[2]
+
+    def lookup(self, kind: str, id: int, fields: Iterable[str], construct: Callable[[dict], Any]) -> Optional[Any]:
+        """Returns the model of an entity when its stored fields are fresh and cover the given ones.
+
+        Args:
+            kind (str): anime, manga, character, staff or studio.
+            id (int): Entity id.
+            fields (Iterable[str]): GraphQL fields the caller needs.
+            construct (Callable[[dict], Any]): `construct_*_object` function for the model.
+
+        Returns:
+            Optional[Any]: Shared model of the entity.
+        """
+        with self._lock:
+            entry = self._entries.get((kind, id))
+            if entry is None or entry[0] <= time.monotonic() or not all(name in entry[1] for name in fields):
+                self.misses += 1
+                return None
+            self._entries.move_to_end((kind, id))
+            self.hits += 1
+            if entry[2] is None:
+                entry[2] = construct(entry[1])
+            return entry[2]
+
+    def get(self, kind: str, id: int) -> Optional[dict]:
+        """Returns the stored fields of an entity, if fresh.
+
+        Args:
+            kind (str): anime, manga, character, staff or studio.
+            id (int): Entity id.
+
+        Returns:
+            Optional[dict]: GraphQL fields.
+        """
+        with self._lock:
+            entry = self._entries.get((kind, id))
+            if entry is None or entry[0] <= time.monotonic():
+                return None
+            return dict(entry[1])
+
+    def clear(self) -> None:
+        """Removes every entity. Counters are kept."""
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict[str, int]:
+        """Returns the store counters.
+
+        Returns:
+            Dict[str, int]: size, hits and misses.
+        """
+        with self._lock:
+            return dict(size=len(self._entries), hits=self.hits, misses=self.misses)
+
+    def __len__(self) -> int:
+        return len(self._entries)
@@ -0,0 +1,283 @@
+#!/usr/bin/env python3
+# SPDX-License-Identifier: MIT
+# Copyright (C) 2021-2022 Amano Team <https://amanoteam.com/> and the python-anilist contributors
+
+import json
+import re
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+Path = Tuple[Union[str, int], ...]
+Item = Tuple[bytes, Dict[str, Any]]
+
+_WHITESPACE = re.compile(rb"[ \t\n\r]*")
+_STRUCTURE = re.compile(rb'["\\{}\[\]]')
+_STRING = re.compile(rb'"(?:[^"\\]|\\.)*"', re.DOTALL)
+_SCALAR = re.compile(rb"[^,}\] \t\n\r]+")
+
+_OPEN = b"{["
+_CLOSE = b"}]"
+_QUOTE = ord('"')
+_BACKSLASH = ord("\\")
+
+# Parser states.
+_VALUE = 0  # A value is expected.
+_KEY = 1  # An object key or "}" is expected.
+_COLON = 2  # ":" is expected.
+_NEXT = 3  # "," or the end of the container is expected.
+_SCAN = 4  # Inside a container value, looking for its end.
+
+
+class _Frame:
+    __slots__ = ("array", "key", "index", "values")
+
+    def __init__(self, array: bool, key: Union[str, int, None]) -> None:
+        self.array = array
+        self.key = key
+        self.index = 0
+        self.values: Dict[str, Any] = {}
+
+
+class ArrayStream:
+    """Incremental JSON parser that splits out the elements of the arrays at a path.
+
+    Chunks of a response body are passed to `feed()`, which returns the raw bytes of every
+    array element completed so far, so each one can be decoded and processed while the
+    rest of the body is still downloading. Only the element being read is buffered.
+
+    Values next to the path, like `pageInfo`, are decoded and kept by the object holding
+    them. Every element comes with the values the object holding its array had before
+    the array, like the `status` of a `MediaListCollection` list.
+
+    Args:
+        path (Path): Keys leading to the arrays, "*" matching any index of an array on the way,
+            like ("data", "anime", "lists", "*", "entries").
+    """
+
+    def __init__(self, path: Path) -> None:
+        self.path = tuple(path)
+        self.values: Dict[str, Any] = {}
+        self._buffer = bytearray()
+        self._pos = 0
+        self._state = _VALUE
+        self._frames: List[_Frame] = []
+        self._key: Optional[str] = None
+        # Balanced scan of a container value.
+        self._start = 0
+        self._scan = 0
+        self._depth = 0
+        self._in_string = False
+        self._capture = False
+
+    def _matches(self, path: Path) -> bool:
+        if len(path) > len(self.path):
+            return False
+        for key, pattern in zip(path, self.path):
+            if not (key == pattern or (pattern == "*" and isinstance(key, int))):
+                return False
+        return True
+
+    def _slot(self) -> Union[str, int]:
+        frame = self._frames[-1]
+        return frame.index if frame.array else self._key
+
+    def _container_path(self) -> Path:
+        return tuple(frame.key for frame in self._frames[1:])
+
+    def _in_target(self) -> bool:
+        if not self._frames or not self._frames[-1].array:
+            return False
+        path = self._container_path()
+        return len(path) == len(self.path) and self._matches(path)
+
+    def _store(self, value: Any) -> None:
+        frame = self._frames[-1]
+        if not frame.array:
+            frame.values[self._key] = value
+
+    def _context(self) -> Dict[str, Any]:
+        if len(self._frames) < 2 or self._frames[-2].array:
+            return {}
+        return dict(self._frames[-2].values)
+
+    def feed(self, chunk: bytes) -> List[Item]:
+        """Parses the next chunk of the body.
+
+        Args:
+            chunk (bytes): Next bytes of the body.
+
+        Raises:
+            ValueError: If the body is not valid JSON.
+
+        Returns:
+            List[Item]: Raw bytes of each completed element, with the values of the object holding its array.
+        """
+        buffer = self._buffer
+        buffer += chunk
+        items: List[Item] = []
+        while True:
+            if self._state == _SCAN:
+                if not self._scan_container():
+                    break
+                raw = bytes(buffer[self._start:self._pos])
+                if self._capture:
+                    items.append((raw, self._context()))
+                else:
+                    self._store(json.loads(raw))
+                self._state = _NEXT
+                continue
+
+            self._pos = _WHITESPACE.match(buffer, self._pos).end()
+            if self._pos >= len(buffer):
+                break
+            char = buffer[self._pos]
+
+            if self._state == _VALUE:
+                if char == ord("]") and self._frames and self._frames[-1].array and self._frames[-1].index == 0:
+                    # End of an empty array.
+                    self._close()
+                elif not self._frames:
+                    if char not in _OPEN:
+                        raise ValueError("expected an object or an array")
+                    self._open(char, None)
+                elif self._in_target():
+                    if char in _OPEN:
+                        self._begin_scan(capture=True)
+                        continue
+                    end = self._scalar_end()
+                    if end is None:
+                        break
+                    items.append((bytes(buffer[self._pos:end]), self._context()))
+                    self._pos = end
+                    self._state = _NEXT
+                elif char in _OPEN:
+                    slot = self._slot()
+                    if self._matches(self._container_path() + (slot,)):
+                        self._open(char, slot)
+                    else:
+                        self._begin_scan(capture=False)
+                else:
+                    end = self._scalar_end()
+                    if end is None:
+                        break
+                    self._store(json.loads(bytes(buffer[self._pos:end])))
+                    self._pos = end
+                    self._state = _NEXT
+            elif self._state == _KEY:
+                if char == ord("}"):
+                    self._close()
+                    continue
+                if char != _QUOTE:
+                    raise ValueError(f"expected an object key, not {chr(char)!r}")
+                match = _STRING.match(buffer, self._pos)
+                if match is None:
+                    break
+                self._key = json.loads(match.group())
+                self._pos = match.end()
+                self._state = _COLON
+            elif self._state == _COLON:
+                if char != ord(":"):
+                    raise ValueError(f"expected ':', not {chr(char)!r}")
+                self._pos += 1
+                self._state = _VALUE
+            else:
+                if not self._frames:
+                    raise ValueError("extra data after the document")
+                if char == ord(","):
+                    self._pos += 1
+                    frame = self._frames[-1]
+                    if frame.array:
+                        frame.index += 1
+                        self._state = _VALUE
+                    else:
+                        self._state = _KEY
+                elif char in _CLOSE:
+                    self._close()
+                else:
+                    raise ValueError(f"expected ',', not {chr(char)!r}")
+        self._compact()
+        return items
+
+    def _open(self, char: int, key: Union[str, int, None]) -> None:
+        array = char == ord("[")
+        self._frames.append(_Frame(array, key))
+        self._pos += 1
+        self._state = _VALUE if array else _KEY
+
+    def _close(self) -> None:
+        self._pos += 1
+        frame = self._frames.pop()
+        if not self._frames:
+            self.values = frame.values
+        elif not self._frames[-1].array:
+            # Objects on the path keep their values, like `hasNextChunk`, arrays are not kept.
+            self._key = frame.key
+            if not frame.array:
+                self._frames[-1].values[frame.key] = frame.values
+        self._state = _NEXT
+
+    def _begin_scan(self, capture: bool) -> None:
+        self._start = self._scan = self._pos
+        self._depth = 0
+        self._in_string = False
+        self._capture = capture
+        self._state = _SCAN
+
+    def _scan_container(self) -> bool:
+        buffer = self._buffer
+        search = _STRUCTURE.search
+        position, depth, in_string = self._scan, self._depth, self._in_string
+        while True:
+            match = search(buffer, position)
+            if match is None:
+                self._scan, self._depth, self._in_string = max(position, len(buffer)), depth, in_string
+                return False
+            char = buffer[match.start()]
+            position = match.end()
+            if in_string:
+                if char == _BACKSLASH:
+                    position += 1
+                elif char == _QUOTE:
+                    in_string = False
+            elif char == _QUOTE:
+                in_string = True
+            elif char in _OPEN:
+                depth += 1
+            elif char in _CLOSE:
+                depth -= 1
+                if depth == 0:
+                    self._pos = position
+                    return True
+
+    def _scalar_end(self) -> Optional[int]:
+        buffer = self._buffer
+        if buffer[self._pos] == _QUOTE:
+            match = _STRING.match(buffer, self._pos)
+            return match.end() if match else None
+        match = _SCALAR.match(buffer, self._pos)
+        if match is None:
+            raise ValueError(f"expected a value, not {chr(buffer[self._pos])!r}")
+        # A number touching the end of the buffer may go on in the next chunk.
+        if match.end() >= len(buffer):
+            return None
+        return match.end()
+
+    def _compact(self) -> None:
+        keep = self._start if self._state == _SCAN else self._pos
+        if keep >= 65536 or keep == len(self._buffer):
+            del self._buffer[:keep]
+            self._pos -= keep
+            self._start -= keep
+            self._scan -= keep
+
+    def close(self) -> Dict[str, Any]:
+        """Checks that the whole body was parsed.
+
+        Raises:
+            ValueError: If the body ended early.
+
+        Returns:
+            Dict[str, Any]: Values of the top level object outside the path.
+        """
+        if self._frames or self._state != _NEXT or self._buffer[self._pos:].strip():
+            raise ValueError("incomplete JSON document")
+        return self.values
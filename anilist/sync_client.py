@@ -3,12 +3,22 @@
 #
 # SPDX-License-Identifier: MIT
 
-from typing import List, Optional, Union
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple, Union
 
 import httpx
 
-from .client_process import *
-
+from .base_client import ACQUIRE, BaseClient, Blocking, Flow, Item, NextChunk, Parallel, Read, Send
+from .cache import DiskCache, ResponseCache
+from .concurrency import Progress, resolve_method, tmap, tmap_as_completed
+from .decoder import Decoder
+from .documents import request_body
+from .metrics import Hook, Recorder
+from .operations import ACTIVITY, GET, GET_MANY, SEARCH
+from .pagination import iter_pages
+from .ratelimit import RateLimiter
+from .store import EntityStore
 from .types import (
     Anime,
     Character,
@@ -20,47 +30,258 @@ from .types import (
     TextActivity,
     User,
 )
-from .utils import (
-    ANIME_GET_QUERY,
-    ANIME_SEARCH_QUERY,
-    API_URL,
-    CHARACTER_GET_QUERY,
-    CHARACTER_SEARCH_QUERY,
-    HEADERS,
-    LIST_ACTIVITY_QUERY,
-    LIST_GET_QUERY_ANIME,
-    LIST_GET_QUERY_MANGA,
-    LIST_ITEM_GET_QUERY,
-    MANGA_GET_QUERY,
-    MANGA_SEARCH_QUERY,
-    MESSAGE_ACTIVITY_QUERY,
-    MESSAGE_ACTIVITY_QUERY_SENT,
-    STAFF_GET_QUERY,
-    STAFF_SEARCH_QUERY,
-    TEXT_ACTIVITY_QUERY,
-    USER_GET_QUERY,
-    USER_SEARCH_QUERY,
-)
+from .utils import API_URL, HEADERS, MAX_PER_PAGE
 
 
-def api_query(query, variables, url=API_URL, headers=HEADERS):
-    with httpx.Client(http2=True) as session:
-        response = session.post(url=url, json=dict(query=query, variables=variables), headers=headers)
+def api_query(
+        query, variables, url=API_URL, headers=HEADERS, session=None, transport=None, extensions=None, persisted=None
+):
+    if session is not None:
+        return session.post(
+            url=url, json=request_body(query, variables, persisted), headers=headers, extensions=extensions
+        )
+    with httpx.Client(http2=True, transport=transport) as session:
+        response = session.post(
+            url=url, json=request_body(query, variables, persisted), headers=headers, extensions=extensions
+        )
     return response
 
 
-class Client:
-    def __init__(self):
-        self.httpx = None
+class Client(BaseClient):
+    def __init__(
+            self,
+            *,
+            http2: bool = True,
+            max_connections: Optional[int] = 100,
+            max_keepalive_connections: Optional[int] = 20,
+            keepalive_expiry: Optional[float] = 5.0,
+            cache: Optional[Union[ResponseCache, DiskCache]] = None,
+            rate_limit: Optional[int] = 90,
+            max_retries: int = 5,
+            lazy: bool = False,
+            decoder: Union[str, Decoder] = "auto",
+            typed: bool = False,
+            base_url: str = API_URL,
+            transport: Optional[httpx.BaseTransport] = None,
+            headers: Optional[Dict[str, str]] = None,
+            store: Optional[EntityStore] = None,
+            max_workers: int = 8,
+            hooks: Optional[Iterable[Hook]] = None,
+            minify: bool = False,
+            persisted_queries: bool = False,
+    ):
+        """Creates a client that reuses one connection pool for all of its requests.
+
+        The pool is opened on the first request and kept alive until `close()` is called
+        or the `with` block exits.
+
+        Args:
+            http2 (bool, optional): Option to use HTTP/2. Defaults to True.
+            max_connections (int, optional): Maximum open connections, None for no limit. Defaults to 100.
+            max_keepalive_connections (int, optional): Maximum idle connections kept alive. Defaults to 20.
+            keepalive_expiry (float, optional): Seconds before an idle connection is closed. Defaults to 5.0.
+            cache (Union[ResponseCache, DiskCache], optional): Cache for API responses. Defaults to None,
+                which disables caching.
+            rate_limit (int, optional): Requests per minute this client paces itself to. The limit is
+                corrected from AniList's rate limit headers. None disables pacing. Defaults to 90.
+            max_retries (int, optional): Times a throttled (429) request is queued again before
+                `httpx.HTTPStatusError` is raised. Defaults to 5.
+            lazy (bool, optional): Return list entries and list activities as `LazyObject`s that build
+                their models on first attribute access. Media attributes are built one at a time.
+                Defaults to False.
+            decoder (Union[str, Decoder], optional): JSON decoder for response bodies, see `get_decoder()`.
+                Defaults to "auto", which uses orjson or msgspec when installed.
+            typed (bool, optional): Decode `get_anime`, `get_manga`, `get_list` and `get_user` responses
+                with msgspec straight into the structs of `anilist.schema` instead of building the
+                model objects. Typed responses are not cached. Defaults to False.
+            base_url (str, optional): GraphQL endpoint, for example a caching proxy. Defaults to API_URL.
+            transport (httpx.BaseTransport, optional): Transport for the connection pool, like
+                `httpx.MockTransport`. When set, it handles `http2` and the pool limits itself. Defaults to None.
+            headers (Dict[str, str], optional): Extra request headers, merged over the default ones.
+                Defaults to None.
+            store (EntityStore, optional): Normalized store the anime, manga, characters, staff and studios
+                of every response are merged into, and single item lookups are answered from when it covers
+                the requested fields. Defaults to None.
+            max_workers (int, optional): Threads running `map()`, `map_as_completed()`, the
+                chunks of `get_many()` and the pages prefetched by `iter_*()`. The pool is started
+                on first use. Defaults to 8.
+            hooks (Iterable[Hook], optional): Callables receiving a `Span` for each phase of every call:
+                connect, server, download, decode and process. Streamed calls report connect, server
+                and download, the download span including the parsing of the entries as they arrive.
+                `MetricsCollector` keeps their quantiles. Defaults to None.
+            minify (bool, optional): Send queries without comments, the license header and
+                insignificant whitespace, about a quarter of their size. Defaults to False.
+            persisted_queries (bool, optional): Send automatic persisted queries: only the sha256 of
+                the query, followed by the full text when the server does not know the hash yet.
+                Turned off for the client when the server answers that it does not support them.
+                Defaults to False.
+
+        Raises:
+            ImportError: If typed is set and msgspec is not installed.
+            TypeError: If max_workers is not a positive int.
+        """
+        super().__init__(
+            http2=http2,
+            max_connections=max_connections,
+            max_keepalive_connections=max_keepalive_connections,
+            keepalive_expiry=keepalive_expiry,
+            cache=cache,
+            max_retries=max_retries,
+            lazy=lazy,
+            decoder=decoder,
+            typed=typed,
+            base_url=base_url,
+            transport=transport,
+            headers=headers,
+            store=store,
+            hooks=hooks,
+            minify=minify,
+            persisted_queries=persisted_queries,
+        )
+        self.rate_limiter: Optional[RateLimiter] = None
+        if rate_limit is not None:
+            self.rate_limiter = RateLimiter(limit=rate_limit)
+        if not isinstance(max_workers, int) or max_workers < 1:
+            raise TypeError(f"max_workers argument must be a positive int, not {max_workers!r}")
+        self.max_workers = max_workers
+        self.executor: Optional[ThreadPoolExecutor] = None
+        self.httpx: Optional[httpx.Client] = None
+        self._lock = threading.Lock()
+        self._local = threading.local()
 
     def __enter__(self):
-        self.httpx = httpx.Client()
+        self._session()
         return self
 
     def __exit__(self, *args):
-        self.httpx = None
+        self.close()
         return None
 
+    def _session(self) -> httpx.Client:
+        with self._lock:
+            if self.httpx is None:
+                self.httpx = httpx.Client(http2=self.http2, limits=self.limits, transport=self.transport)
+            return self.httpx
+
+    def _executor(self) -> Optional[ThreadPoolExecutor]:
+        # Calls made from one of the pool's own threads run inline, so they never wait on a full pool.
+        if getattr(self._local, "worker", False):
+            return None
+        with self._lock:
+            if self.executor is None:
+                self.executor = ThreadPoolExecutor(
+                    max_workers=self.max_workers, thread_name_prefix="anilist", initializer=self._mark_worker
+                )
+            return self.executor
+
+    def _mark_worker(self) -> None:
+        self._local.worker = True
+
+    def _fan_out(self, function: Callable[[Any], Any], items: List[Any]) -> List[Any]:
+        executor = self._executor() if len(items) > 1 else None
+        results = tmap(executor, function, [(item,) for item in items])
+        for result in results:
+            if isinstance(result, Exception):
+                raise result
+        return results
+
+    def close(self) -> None:
+        """Waits for running `map()` calls, then closes the thread pool and the connection pool.
+        New ones are opened on the next request."""
+        with self._lock:
+            executor, self.executor = self.executor, None
+        if executor is not None:
+            executor.shutdown(wait=True)
+        with self._lock:
+            if self.httpx is not None:
+                self.httpx.close()
+                self.httpx = None
+
+    def _drive(self, flow: Flow) -> Any:
+        # Runs a flow of base_client, blocking on every step it yields.
+        value, error = None, None
+        while True:
+            try:
+                step = flow.send(value) if error is None else flow.throw(error)
+            except StopIteration as stop:
+                return stop.value
+            value, error = None, None
+            try:
+                value = self._perform(step)
+            except Exception as exc:
+                error = exc
+
+    def _drive_stream(self, flow: Flow) -> Iterator[Any]:
+        # Same as _drive, yielding the items of a streaming flow. Responses are closed
+        # when the caller stops iterating before the end.
+        responses = []
+        value, error = None, None
+        try:
+            while True:
+                try:
+                    step = flow.send(value) if error is None else flow.throw(error)
+                except StopIteration:
+                    return
+                value, error = None, None
+                if isinstance(step, Item):
+                    yield step.value
+                    continue
+                try:
+                    value = self._perform(step)
+                except Exception as exc:
+                    error = exc
+                else:
+                    if isinstance(step, Send) and step.stream:
+                        responses.append(value[0])
+        finally:
+            flow.close()
+            for response in responses:
+                response.close()
+
+    def _perform(self, step: Any) -> Any:
+        if isinstance(step, Send):
+            session = self._session()
+            if step.stream:
+                request = session.build_request(
+                    "POST", self.base_url, json=request_body(step.query, step.variables), headers=step.headers,
+                    extensions=step.extensions,
+                )
+                response = session.send(request, stream=True)
+                return response, response.iter_bytes()
+            return api_query(
+                step.query, step.variables, url=self.base_url, headers=step.headers, session=session,
+                extensions=step.extensions, persisted=step.persisted,
+            )
+        if step is ACQUIRE:
+            return self.rate_limiter.acquire()
+        if isinstance(step, NextChunk):
+            return next(step.chunks, None)
+        if isinstance(step, Read):
+            return step.response.read()
+        if isinstance(step, Blocking):
+            return step.function(*step.args)
+        if isinstance(step, Parallel):
+            return self._fan_out(self._drive, step.flows)
+        raise TypeError(f"unknown step {step!r}")
+
+    def _pages(
+            self, fetch: Callable[[int], Flow], limit: int, max_items: Optional[int], concurrency: int
+    ) -> Iterator[Any]:
+        return iter_pages(
+            lambda page: self._drive(fetch(page)),
+            per_page=limit, max_items=max_items, concurrency=concurrency, executor=self._executor(),
+        )
+
+    def _query(
+            self,
+            query: str,
+            variables: dict,
+            content_type: Optional[str] = None,
+            response_type: Optional[type] = None,
+            recorder: Optional[Recorder] = None,
+    ) -> dict:
+        return self._drive(self._request(query, variables, content_type, response_type, recorder))
+
     def search(
             self,
             query: str,
@@ -91,39 +312,7 @@ class Client:
         Returns:
             Union[Anime, Manga, Character, Staff, User], optional: Search results.
         """
-        if isinstance(content_type, str):
-            content_type = content_type.lower()
-        else:
-            raise TypeError(
-                f"content_type argument must be a string, not '{content_type.__class__.__name__}'"
-            )
-        if not isinstance(query, str):
-            raise TypeError(
-                f"query argument must be a string, not '{query.__class__.__name__}'"
-            )
-        if isinstance(limit, str) and limit.isdecimal():
-            limit = int(limit)
-        elif not isinstance(limit, int):
-            raise TypeError(
-                f"limit argument must be an int, not '{limit.__class__.__name__}'"
-            )
-
-        if content_type == "anime":
-            search, pages = self.search_anime(query=query, page=page, limit=limit)
-        elif content_type == "manga":
-            search, pages = self.search_manga(query=query, page=page, limit=limit)
-        elif content_type in ["char", "character"]:
-            search, pages = self.search_character(query=query, page=page, limit=limit)
-        elif content_type == "staff":
-            search, pages = self.search_staff(query=query, page=page, limit=limit)
-        elif content_type == "user":
-            search, pages = self.search_user(query=query, page=page, limit=limit)
-        else:
-            raise TypeError("There is no such content type.")
-
-        if pagination:
-            return search, pages
-        return search
+        return self._drive(self._search(query, content_type, page, limit, pagination))
 
     def get(
             self,
@@ -132,6 +321,7 @@ class Client:
             page: int = 1,
             limit: int = 25,
             pagination: bool = False,
+            fields: Optional[Union[str, List[str]]] = None,
     ) -> Optional[Tuple[Union[Anime, Manga, Character, Staff, List[MediaList], User], PageInfo]]:
         """Gets specified item from given id.
 
@@ -141,6 +331,8 @@ class Client:
             page (int, optional): Current page. Defaults to 1. Only used for lists.
             limit (int, optional): Maximum items per page. Defaults to 25. Only used for lists.
             pagination (bool, optional): Option to return pagination info. Only used for lists. Defaults to False.
+            fields (Union[str, List[str]], optional): Fields to request, as a preset ("minimal", "card" or "full")
+                or a list of attribute names. Only used for anime and manga. Defaults to None, every field.
 
         Raises:
             TypeError: If content type is not a string.
@@ -153,126 +345,200 @@ class Client:
             Optional[Union[Anime, Manga, Character, Staff, List[MediaList], User], PageInfo]:
             Returned items.
         """
-        if isinstance(content_type, str):
-            content_type = content_type.lower()
-        else:
-            raise TypeError(
-                f"content_type argument must be a string, not '{content_type.__class__.__name__}'"
-            )
-        if isinstance(id, str) and id.isdecimal():
-            id = int(id)
-        elif not isinstance(id, int):
-            if content_type == "user":
-                return self.get_user(name=id)
-            elif content_type == "list_anime" or content_type == "list_manga":
-                try:
-                    user = self.get_user(name=id)
-                    id = user.id
-                except Exception:
-                    raise TypeError("user not found")
-            else:
-                raise TypeError(
-                    f"id argument must be a string, not '{id.__class__.__name__}'"
-                )
-        if content_type == "anime":
-            return self.get_anime(id=id)
-        elif content_type == "manga":
-            return self.get_manga(id=id)
-        elif content_type in ["char", "character"]:
-            return self.get_character(id=id)
-        elif content_type == "staff":
-            return self.get_staff(id=id)
-        elif content_type == "list_anime":
-            anime, pages = self.get_list(
-                user_id=id, limit=limit, page=page, content_type="anime"
-            )
-            if pagination:
-                return anime, pages
-            return anime
-        elif content_type == "list_manga":
-            manga, pages = self.get_list(
-                user_id=id, limit=limit, page=page, content_type="manga"
-            )
-            if pagination:
-                return manga, pages
-            return manga
-        elif content_type == "user":
-            raise TypeError("id argument must be a string for the user object.")
-        else:
-            raise TypeError("There is no such content type.")
-
-    @staticmethod
-    def search_anime(query: str, limit: int, page: int = 1) -> Optional[Tuple[List[Anime], PageInfo]]:
-        response = api_query(ANIME_SEARCH_QUERY, dict(search=query, page=page, per_page=limit, MediaType="ANIME"))
-        data: Optional[dict] = response.json()
-        return process_search_anime(data)
-
-    @staticmethod
-    def search_manga(query: str, limit: int, page: int = 1) -> Optional[Tuple[List[Manga], PageInfo]]:
-        response = api_query(MANGA_SEARCH_QUERY, dict(search=query, page=page, per_page=limit, MediaType="MANGA"))
-        data = response.json()
-        return process_search_manga(data)
-
-    @staticmethod
-    def search_character(query: str, limit: int, page: int = 1) -> Optional[Tuple[List[Character], PageInfo]]:
-        response = api_query(CHARACTER_SEARCH_QUERY, dict(search=query, page=page, per_page=limit))
-        data = response.json()
-        return process_search_character(data)
-
-    @staticmethod
-    def search_staff(query: str, limit: int, page: int = 1) -> Optional[Tuple[List[Staff], PageInfo]]:
-        response = api_query(STAFF_SEARCH_QUERY, dict(search=query, page=page, per_page=limit))
-        data = response.json()
-        return process_search_staff(data)
-
-    @staticmethod
-    def search_user(query: str, limit: int, page: int = 1) -> Optional[Tuple[List[User], PageInfo]]:
-        response = api_query(USER_SEARCH_QUERY, dict(search=query, page=page, per_page=limit))
-        data = response.json()
-        return process_search_user(data)
-
-    @staticmethod
-    def get_anime(id: int) -> Optional[Anime]:
-        response = api_query(ANIME_GET_QUERY, dict(id=id, MediaType="ANIME"))
-        data = response.json()
-        return process_get_anime(data)
-
-    @staticmethod
-    def get_manga(id: int) -> Optional[Manga]:
-        response = api_query(MANGA_GET_QUERY, dict(id=id, MediaType="MANGA"))
-        data = response.json()
-        return process_get_manga(data)
-
-    @staticmethod
-    def get_character(id: int) -> Optional[Character]:
-        response = api_query(CHARACTER_GET_QUERY, dict(id=id))
-        data = response.json()
-        return process_get_character(data)
-
-    @staticmethod
-    def get_staff(id: int) -> Optional[Staff]:
-        response = api_query(STAFF_GET_QUERY, dict(id=id))
-        data = response.json()
-        return process_get_staff(data)
-
-    @staticmethod
-    def get_user(name: str) -> Optional[User]:
-        response = api_query(USER_GET_QUERY, dict(name=name))
-        data = response.json()
-        return process_get_user(data)
-
-    @staticmethod
+        return self._drive(self._get(id, content_type, page, limit, pagination, fields))
+
+    def get_many(
+            self,
+            ids: List[Union[int, str]],
+            content_type: str = "anime",
+            fields: Optional[Union[str, List[str]]] = None,
+    ) -> List[Optional[Union[Anime, Manga]]]:
+        """Gets several items at once, packing up to 50 ids in each request.
+
+        Args:
+            ids (List[Union[int, str]]): Item ids.
+            content_type (str, optional): anime or manga. Defaults to "anime".
+            fields (Union[str, List[str]], optional): Fields to request, as a preset ("minimal", "card" or "full")
+                or a list of attribute names. Defaults to None, every field.
+
+        Raises:
+            TypeError: If content type is not a string.
+            TypeError: If an id is not an int.
+            TypeError: If the content type is invalid.
+
+        Returns:
+            List[Optional[Union[Anime, Manga]]]: Items in the same order as the given ids, None for missing ones.
+        """
+        return self._drive(self._get_many(ids, content_type, fields))
+
+    def search_anime(self, query: str, limit: int, page: int = 1) -> Optional[Tuple[List[Anime], PageInfo]]:
+        return self._drive(self._run(SEARCH["anime"], dict(search=query, page=page, per_page=limit)))
+
+    def search_manga(self, query: str, limit: int, page: int = 1) -> Optional[Tuple[List[Manga], PageInfo]]:
+        return self._drive(self._run(SEARCH["manga"], dict(search=query, page=page, per_page=limit)))
+
+    def search_character(
+            self, query: str, limit: int, page: int = 1
+    ) -> Optional[Tuple[List[Character], PageInfo]]:
+        return self._drive(self._run(SEARCH["character"], dict(search=query, page=page, per_page=limit)))
+
+    def search_staff(self, query: str, limit: int, page: int = 1) -> Optional[Tuple[List[Staff], PageInfo]]:
+        return self._drive(self._run(SEARCH["staff"], dict(search=query, page=page, per_page=limit)))
+
+    def search_user(self, query: str, limit: int, page: int = 1) -> Optional[Tuple[List[User], PageInfo]]:
+        return self._drive(self._run(SEARCH["user"], dict(search=query, page=page, per_page=limit)))
+
+    def get_anime(self, id: int, fields: Optional[Union[str, List[str]]] = None) -> Optional[Anime]:
+        return self._drive(self._get_media(GET["anime"], id, fields))
+
+    def get_manga(self, id: int, fields: Optional[Union[str, List[str]]] = None) -> Optional[Manga]:
+        return self._drive(self._get_media(GET["manga"], id, fields))
+
+    def get_many_anime(
+            self, ids: List[int], fields: Optional[Union[str, List[str]]] = None
+    ) -> List[Optional[Anime]]:
+        return self._drive(self._fetch_many(GET_MANY["anime"], ids, fields))
+
+    def get_many_manga(
+            self, ids: List[int], fields: Optional[Union[str, List[str]]] = None
+    ) -> List[Optional[Manga]]:
+        return self._drive(self._fetch_many(GET_MANY["manga"], ids, fields))
+
+    def get_character(self, id: int) -> Optional[Character]:
+        return self._drive(self._get_character(id))
+
+    def get_staff(self, id: int) -> Optional[Staff]:
+        return self._drive(self._get_staff(id))
+
+    def get_user(self, name: str) -> Optional[User]:
+        return self._drive(self._get_user(name))
+
     def get_list(
-            user_id: int, limit: int, page: int = 1, content_type: str = "anime"
+            self, user_id: int, limit: int, page: int = 1, content_type: str = "anime"
     ) -> Optional[Tuple[List[MediaList], PageInfo]]:
-        is_manga = "manga" in content_type
-        response = api_query(LIST_GET_QUERY_ANIME if not is_manga else LIST_GET_QUERY_MANGA,
-                             dict(user_id=user_id, page=page, per_page=limit))
-        data = response.json()
-        return process_get_list(data, content_type)
-
-    @staticmethod
-    def get_list_item(name: str, id: int) -> Optional[MediaList]:
+        return self._drive(self._get_list(user_id, limit, page, content_type))
+
+    def get_list_collection(
+            self, user_id: Union[int, str], content_type: str = "anime", chunk_size: int = 500
+    ) -> Dict[str, List[MediaList]]:
+        """Fetches a user's whole list with AniList's MediaListCollection, up to 500 entries per request.
+
+        Each chunk is turned into `MediaList` objects as soon as it arrives. Entries of custom
+        lists are left out, as they also appear under their status.
+
+        Args:
+            user_id (Union[int, str]): Username or userid.
+            content_type (str, optional): anime or manga. Defaults to "anime".
+            chunk_size (int, optional): Entries per request, at most 500. Defaults to 500.
+
+        Raises:
+            TypeError: If the content type is invalid.
+            TypeError: If user_id is invalid.
+            TypeError: If chunk_size is not between 1 and 500.
+
+        Returns:
+            Dict[str, List[MediaList]]: Entries by status (CURRENT, PLANNING, COMPLETED, DROPPED, PAUSED
+                or REPEATING), most recently updated first.
+        """
+        return self._drive(self._get_list_collection(user_id, content_type, chunk_size))
+
+    def stream_list(
+            self, user_id: Union[int, str], content_type: str = "anime", limit: int = MAX_PER_PAGE, page: int = 1
+    ) -> Iterator[MediaList]:
+        """Yields the entries of a list page while the response is still downloading.
+
+        The body is parsed incrementally, so each entry is built as soon as it has arrived and
+        only one entry's JSON is held at a time. Streamed responses are not cached.
+
+        Args:
+            user_id (Union[int, str]): Username or userid.
+            content_type (str, optional): anime or manga. Defaults to "anime".
+            limit (int, optional): Maximum items per page. Defaults to 50.
+            page (int, optional): Current page. Defaults to 1.
+
+        Raises:
+            TypeError: If the content type is invalid.
+            TypeError: If user_id is invalid.
+
+        Yields:
+            MediaList: List entries, most recently updated first.
+        """
+        return self._drive_stream(self._stream_list(user_id, content_type, limit, page))
+
+    def stream_list_collection(
+            self, user_id: Union[int, str], content_type: str = "anime", chunk_size: int = 500
+    ) -> Iterator[Tuple[str, MediaList]]:
+        """Streaming version of `get_list_collection()`, yielding entries as they arrive.
+
+        Args:
+            user_id (Union[int, str]): Username or userid.
+            content_type (str, optional): anime or manga. Defaults to "anime".
+            chunk_size (int, optional): Entries per request, at most 500. Defaults to 500.
+
+        Raises:
+            TypeError: If the content type is invalid.
+            TypeError: If user_id is invalid.
+            TypeError: If chunk_size is not between 1 and 500.
+
+        Yields:
+            Tuple[str, MediaList]: Status of the list holding the entry, and the entry.
+        """
+        return self._drive_stream(self._stream_list_collection(user_id, content_type, chunk_size))
+
+    def stream_activity(
+            self, user_id: Union[int, str], content_type: str = "anime", limit: int = MAX_PER_PAGE, page: int = 1
+    ) -> Iterator[ListActivity]:
+        """Yields the list activities of a page while the response is still downloading.
+
+        Args:
+            user_id (Union[int, str]): Username or userid.
+            content_type (str, optional): anime or manga. Defaults to "anime".
+            limit (int, optional): Maximum items per page. Defaults to 50.
+            page (int, optional): Current page. Defaults to 1.
+
+        Raises:
+            TypeError: If the content type is invalid.
+            TypeError: If user_id is invalid.
+
+        Yields:
+            ListActivity: List activities, newest first.
+        """
+        return self._drive_stream(self._stream_activity(user_id, content_type, limit, page))
+
+    def sync_list(
+            self,
+            user_id: Union[int, str],
+            content_type: str = "anime",
+            since: Optional[int] = None,
+            snapshot: Optional[Dict[int, MediaList]] = None,
+            limit: int = MAX_PER_PAGE,
+    ) -> Tuple[List[MediaList], Optional[int]]:
+        """Fetches the entries of a user's list updated since a watermark.
+
+        Lists are sorted by update time, so pages are fetched one at a time until an entry
+        older than the watermark shows up. Pass the returned watermark as `since` on the next
+        sync. Entries removed from the list are not reported. Entries updated in the same second
+        as the watermark are returned again, so changes made later in that second are not missed,
+        unless `snapshot` already holds them with that update time.
+
+        Args:
+            user_id (Union[int, str]): Username or userid.
+            content_type (str, optional): anime or manga. Defaults to "anime".
+            since (int, optional): Timestamp of the last sync. Defaults to None, which fetches the whole list.
+            snapshot (Dict[int, MediaList], optional): Previously synced entries by entry id. Changed
+                entries are stored in it in place. Defaults to None.
+            limit (int, optional): Maximum items per page. Defaults to 50.
+
+        Raises:
+            TypeError: If the content type is invalid.
+            TypeError: If user_id is invalid.
+
+        Returns:
+            Tuple[List[MediaList], Optional[int]]: Changed entries, most recently updated first, and the new watermark.
+        """
+        return self._drive(self._sync_list(user_id, content_type, since, snapshot, limit))
+
+    def get_list_item(self, name: str, id: int) -> Optional[MediaList]:
         """Returns an item in a list item from user.
 
         Args:
@@ -282,9 +548,7 @@ class Client:
         Returns:
             Optional[MediaList]: List item.
         """
-        response = api_query(LIST_ITEM_GET_QUERY, dict(name=name, d=id))
-        data = response.json()
-        return process_get_list_item(data)
+        return self._drive(self._get_list_item(name, id))
 
     def get_activity(
             self,
@@ -298,7 +562,7 @@ class Client:
 
         Args:
             id (Union[int, str]): Username or userid.
-            content_type (str, optional): anime, manga, text or message. Defaults to "anime".
+            content_type (str, optional): anime, manga, text, message or message_sent. Defaults to "anime".
             page (int, optional): Current page. Defaults to 1.
             limit (int, optional): Maximum items per page. Defaults to 25.
             pagination (bool, optional): Option to return pagination info. Defaults to False.
@@ -310,81 +574,161 @@ class Client:
         Returns:
             Union[Optional[(ListActivity, PageInfo)], Optional[ListActivity]]: User activity.
         """
-        if isinstance(content_type, str):
-            content_type = content_type.lower()
-        else:
-            raise TypeError(
-                f"content_type argument must be a string, not '{content_type.__class__.__name__}'"
-            )
-        if isinstance(id, str) and id.isdecimal():
-            id = int(id)
-        elif isinstance(id, str):
-            try:
-                user = self.get_user(name=id)
-                id = user.id
-            except Exception:
-                raise TypeError(f"could not get userid from username '{id}'")
-        elif not isinstance(id, int):
-            raise TypeError(
-                f"id argument must be an int, not '{id.__class__.__name__}'"
-            )
+        return self._drive(self._get_activity(id, content_type, page, limit, pagination))
 
-        activity: ListActivity
-        pages: PageInfo
-        if content_type == "anime":
-            activity, pages = self.get_anime_activity(user_id=id, page=page, limit=limit)
-        elif content_type == "manga":
-            activity, pages = self.get_manga_activity(user_id=id, page=page, limit=limit)
-        elif content_type == "text":
-            activity, pages = self.get_text_activity(user_id=id, page=page, limit=limit)
-        elif content_type == "message":
-            return self.get_message_activity(user_id=id, page=page, limit=limit)
-        else:
-            raise TypeError(f"Invalid content_type ({content_type}")
-
-        if pagination:
-            return activity, pages
-        return activity
-
-    @staticmethod
-    def get_anime_activity(user_id: int, limit: int, page: int = 1) \
+    def get_anime_activity(self, user_id: int, limit: int, page: int = 1) \
             -> Optional[Tuple[List[ListActivity], PageInfo]]:
-        response = api_query(LIST_ACTIVITY_QUERY,
-                             dict(user_id=user_id, page=page, per_page=limit, activity_type="ANIME_LIST"))
-        data = response.json()
-        return process_get_anime_activity(data)
+        return self._drive(self._run(ACTIVITY["anime"], dict(user_id=user_id, page=page, per_page=limit)))
 
-    @staticmethod
-    def get_manga_activity(user_id: int, limit: int, page: int = 1) \
+    def get_manga_activity(self, user_id: int, limit: int, page: int = 1) \
             -> Optional[Tuple[List[ListActivity], PageInfo]]:
-        MANGA_ACTIVITY_QUERY = LIST_ACTIVITY_QUERY.replace(
-            "episodes", "chapters\nvolumes"
-        )
-        response = api_query(MANGA_ACTIVITY_QUERY,
-                             dict(user_id=user_id, page=page, per_page=limit, activity_type="MANGA_LIST"))
-        data = response.json()
-        return process_get_manga_activity(data)
+        return self._drive(self._run(ACTIVITY["manga"], dict(user_id=user_id, page=page, per_page=limit)))
 
-    @staticmethod
     def get_text_activity(
-            user_id: int, limit: int, page: int = 1
+            self, user_id: int, limit: int, page: int = 1
     ) -> Optional[Tuple[List[TextActivity], PageInfo]]:
-        response = api_query(TEXT_ACTIVITY_QUERY, dict(user_id=user_id, page=page, per_page=limit))
-        data = response.json()
-        return process_get_text_activity(data)
+        return self._drive(self._run(ACTIVITY["text"], dict(user_id=user_id, page=page, per_page=limit)))
 
-    @staticmethod
     def get_message_activity(
-            user_id: int, limit: int, page: int = 1
+            self, user_id: int, limit: int, page: int = 1
     ) -> Optional[Tuple[List[TextActivity], PageInfo]]:
-        response = api_query(MESSAGE_ACTIVITY_QUERY, dict(user_id=user_id, page=page, per_page=limit))
-        data = response.json()
-        return process_get_message_activity(data)
+        return self._drive(self._run(ACTIVITY["message"], dict(user_id=user_id, page=page, per_page=limit)))
 
-    @staticmethod
     def get_message_activity_sent(
-            user_id: int, limit: int, page: int = 1
+            self, user_id: int, limit: int, page: int = 1
     ) -> Optional[Tuple[List[TextActivity], PageInfo]]:
-        response = api_query(MESSAGE_ACTIVITY_QUERY_SENT, dict(user_id=user_id, page=page, per_page=limit))
-        data = response.json()
-        return process_get_message_activity_sent(data)
+        return self._drive(self._run(ACTIVITY["message_sent"], dict(user_id=user_id, page=page, per_page=limit)))
+
+    def map(
+            self,
+            method: Union[str, Callable[..., Any]],
+            args: Iterable[Any],
+            progress: Optional[Progress] = None,
+    ) -> List[Any]:
+        """Calls a client method for every item of args on the client's thread pool.
+
+        The threads share this client's connection pool and rate limiter, so at most
+        `max_workers` requests are in flight. A failing call does not stop the others.
+
+        Args:
+            method (Union[str, Callable[..., Any]]): Method name, like "get_anime", or a callable.
+            args (Iterable[Any]): Arguments of each call. Tuples are passed as positional arguments,
+                dicts as keyword arguments and anything else as the only argument.
+            progress (Progress, optional): Called with the number of finished calls and the total
+                after each call. Defaults to None.
+
+        Raises:
+            TypeError: If method is not a client method name or a callable.
+
+        Returns:
+            List[Any]: Results in the order of args, with the raised exception in place of failed calls.
+        """
+        function = resolve_method(self, method)
+        return tmap(self._executor(), function, args, progress=progress)
+
+    def map_as_completed(
+            self,
+            method: Union[str, Callable[..., Any]],
+            args: Iterable[Any],
+            progress: Optional[Progress] = None,
+    ) -> Iterator[Tuple[int, Any]]:
+        """Same as `map()`, but yields every result as soon as its call finishes.
+
+        Calls start when iteration begins, and those not started yet are cancelled
+        if the iterator is closed early.
+
+        Args:
+            method (Union[str, Callable[..., Any]]): Method name, like "get_anime", or a callable.
+            args (Iterable[Any]): Arguments of each call, as in `map()`.
+            progress (Progress, optional): Called with the number of finished calls and the total
+                after each call. Defaults to None.
+
+        Raises:
+            TypeError: If method is not a client method name or a callable.
+
+        Returns:
+            Iterator[Tuple[int, Any]]: Index in args and result of each call, or the raised exception.
+        """
+        function = resolve_method(self, method)
+        return tmap_as_completed(self._executor(), function, args, progress=progress)
+
+    def iter_search(
+            self,
+            query: str,
+            content_type: str = "anime",
+            limit: int = 10,
+            max_items: Optional[int] = None,
+            concurrency: int = 2,
+    ) -> Iterator[Union[Anime, Manga, Character, Staff, User]]:
+        """Iterates over every search result, fetching the next pages ahead of time.
+
+        Args:
+            query (str): Search query.
+            content_type (str, optional): anime, manga, character, staff or user. Defaults to "anime".
+            limit (int, optional): Maximum items per page. Defaults to 10.
+            max_items (int, optional): Stop after this many items. Defaults to None.
+            concurrency (int, optional): Pages fetched ahead of the one being consumed. Defaults to 2.
+
+        Raises:
+            TypeError: If content type is not a string.
+            TypeError: If the content type is invalid.
+
+        Returns:
+            Iterator[Union[Anime, Manga, Character, Staff, User]]: Search results.
+        """
+        return self._pages(self._search_pages(query, content_type, limit), limit, max_items, concurrency)
+
+    def iter_list(
+            self,
+            user_id: Union[int, str],
+            content_type: str = "anime",
+            limit: int = 25,
+            max_items: Optional[int] = None,
+            concurrency: int = 2,
+    ) -> Iterator[MediaList]:
+        """Iterates over every entry in a user's list, fetching the next pages ahead of time.
+
+        Args:
+            user_id (Union[int, str]): Username or userid.
+            content_type (str, optional): anime or manga. Defaults to "anime".
+            limit (int, optional): Maximum items per page. Defaults to 25.
+            max_items (int, optional): Stop after this many items. Defaults to None.
+            concurrency (int, optional): Pages fetched ahead of the one being consumed. Defaults to 2.
+
+        Raises:
+            TypeError: If the content type is invalid.
+            TypeError: If user_id is invalid.
+
+        Returns:
+            Iterator[MediaList]: List entries, most recently updated first.
+        """
+        fetch = self._drive(self._list_pages(user_id, content_type, limit))
+        return self._pages(fetch, limit, max_items, concurrency)
+
+    def iter_activity(
+            self,
+            id: Union[int, str],
+            content_type: str = "anime",
+            limit: int = 25,
+            max_items: Optional[int] = None,
+            concurrency: int = 2,
+    ) -> Iterator[Union[ListActivity, TextActivity]]:
+        """Iterates over every activity of a user, fetching the next pages ahead of time.
+
+        Args:
+            id (Union[int, str]): Username or userid.
+            content_type (str, optional): anime, manga, text, message or message_sent. Defaults to "anime".
+            limit (int, optional): Maximum items per page. Defaults to 25.
+            max_items (int, optional): Stop after this many items. Defaults to None.
+            concurrency (int, optional): Pages fetched ahead of the one being consumed. Defaults to 2.
+
+        Raises:
+            TypeError: If content type is not a string.
+            TypeError: If id is invalid.
+            TypeError: If the content type is invalid.
+
+        Returns:
+            Iterator[Union[ListActivity, TextActivity]]: User activity.
+        """
+        fetch = self._drive(self._activity_pages(id, content_type, limit))
+        return self._pages(fetch, limit, max_items, concurrency)
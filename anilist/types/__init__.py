@@ -3,25 +3,7 @@
 #
 # SPDX-License-Identifier: MIT
 
-from .activity import ListActivity, ListActivityStatus, TextActivity
-from .anime import Anime
-from .character import Character
-from .cover import Cover
-from .date import Date
-from .favourites import FavouritesUnion
-from .image import Image
-from .manga import Manga
-from .medialist import MediaList
-from .name import Name
-from .next_airing import NextAiring
-from .page import PageInfo
-from .score import Score
-from .season import Season
-from .staff import Staff, Studio
-from .statistics import Ranking, Statistic, StatisticsUnion
-from .title import Title
-from .trailer import Trailer
-from .user import User
+from typing import TYPE_CHECKING, Any, List
 
 __all__ = [
     "Anime",
@@ -32,6 +14,7 @@ __all__ = [
     "Image",
     "ListActivity",
     "ListActivityStatus",
+    "LazyObject",
     "Name",
     "NextAiring",
     "Manga",
@@ -49,3 +32,67 @@ __all__ = [
     "Studio",
     "User",
 ]
+
+# Model name to the submodule defining it, imported on first access (PEP 562).
+_MODULES = {
+    "ListActivity": "activity",
+    "ListActivityStatus": "activity",
+    "TextActivity": "activity",
+    "Anime": "anime",
+    "Character": "character",
+    "Cover": "cover",
+    "Date": "date",
+    "FavouritesUnion": "favourites",
+    "Image": "image",
+    "LazyObject": "lazy",
+    "Manga": "manga",
+    "MediaList": "medialist",
+    "Name": "name",
+    "NextAiring": "next_airing",
+    "PageInfo": "page",
+    "Score": "score",
+    "Season": "season",
+    "Staff": "staff",
+    "Studio": "staff",
+    "Ranking": "statistics",
+    "Statistic": "statistics",
+    "StatisticsUnion": "statistics",
+    "Title": "title",
+    "Trailer": "trailer",
+    "User": "user",
+}
+
+if TYPE_CHECKING:  # pragma: no cover
+    from .activity import ListActivity, ListActivityStatus, TextActivity
+    from .anime import Anime
+    from .character import Character
+    from .cover import Cover
+    from .date import Date
+    from .favourites import FavouritesUnion
+    from .image import Image
+    from .lazy import LazyObject
+    from .manga import Manga
+    from .medialist import MediaList
+    from .name import Name
+    from .next_airing import NextAiring
+    from .page import PageInfo
+    from .score import Score
+    from .season import Season
+    from .staff import Staff, Studio
+    from .statistics import Ranking, Statistic, StatisticsUnion
+    from .title import Title
+    from .trailer import Trailer
+    from .user import User
+
+
+def __getattr__(name: str) -> Any:
+    if name not in _MODULES:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    # __import__ goes through the same path as import statements, so -X importtime reports the module.
+    value = getattr(__import__(_MODULES[name], globals(), None, (name,), 1), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> List[str]:
+    return sorted(set(globals()) | set(__all__))
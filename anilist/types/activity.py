@@ -26,6 +26,8 @@ class ListActivityStatus:
         progress (Union[List[int], int], optional): Activity progress.
     """
 
+    __slots__ = ("string", "type", "progress")
+
     MAP = {
         "PLANS TO WATCH": 0,
         "WATCHED EPISODE": 1,
@@ -103,6 +105,8 @@ class ListActivity(Hashable):
         media (Union[Anime, Manga], optional): Activity media.
     """
 
+    __slots__ = ("id", "date", "status", "url", "media")
+
     def __init__(
         self,
         *,
@@ -147,6 +151,8 @@ class TextActivity(Hashable):
         recipient (User, optional): Activity recipient.
     """
 
+    __slots__ = ("id", "reply_count", "date", "user", "text", "text_html", "url", "recipient")
+
     def __init__(
         self,
         *,
@@ -21,6 +21,39 @@ from .trailer import Trailer
 class Anime(Hashable):
     """Anime object."""
 
+    __slots__ = (
+        "id",
+        "title",
+        "url",
+        "episodes",
+        "description",
+        "description_short",
+        "format",
+        "status",
+        "duration",
+        "genres",
+        "is_adult",
+        "tags",
+        "studios",
+        "start_date",
+        "end_date",
+        "season",
+        "country",
+        "cover",
+        "banner",
+        "source",
+        "hashtag",
+        "synonyms",
+        "score",
+        "next_airing",
+        "trailer",
+        "staff",
+        "characters",
+        "popularity",
+        "rankings",
+        "relations",
+    )
+
     def __init__(
         self,
         *,
@@ -14,6 +14,21 @@ from .object import Hashable
 class Character(Hashable):
     """Character object."""
 
+    __slots__ = (
+        "id",
+        "name",
+        "role",
+        "image",
+        "url",
+        "favorites",
+        "description",
+        "media",
+        "birth_date",
+        "age",
+        "gender",
+        "is_favorite",
+    )
+
     def __init__(
         self,
         *,
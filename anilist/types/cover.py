@@ -11,6 +11,8 @@ from .object import Object
 class Cover(Object):
     """Cover object. Contains URL's for each size."""
 
+    __slots__ = ("medium", "large", "extra_large")
+
     def __init__(
         self,
         *,
@@ -4,12 +4,15 @@
 # SPDX-License-Identifier: MIT
 
 from datetime import date, datetime
-from typing import Callable, Dict
 
+from .object import Object
 
-class Date:
+
+class Date(Object):
     """Date object containing year, month and day."""
 
+    __slots__ = ("year", "month", "day", "timestamp")
+
     def __init__(
         self,
         *,
@@ -63,12 +66,3 @@ class Date:
         )
 
         return round(dt.timestamp())
-
-    def raw(self) -> Dict:
-        return self.__dict__
-
-    def __repr__(self) -> Callable:
-        return self.__str__()
-
-    def __str__(self) -> str:
-        return str(self.raw())
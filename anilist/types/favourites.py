@@ -17,6 +17,8 @@ class FavouritesUnion(Object):
     anime, manga, character, staff and studio
     favourites of a user."""
 
+    __slots__ = ("anime", "manga", "characters", "staff", "studios")
+
     def __init__(
             self,
             *,
@@ -11,6 +11,8 @@ from .object import Object
 class Image(Object):
     """Image object."""
 
+    __slots__ = ("medium", "large")
+
     def __init__(
         self,
         *,
@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+# SPDX-License-Identifier: MIT
+# Copyright (C) 2021-2022 Amano Team <https://amanoteam.com/> and the python-anilist contributors
+
+from typing import Any, Callable, Dict, List, Optional
+
+
+class LazyObject:
+    """Stands in for a model until one of its attributes is read.
+
+    The model is built by `factory(raw, *args)` on first access and kept, so the raw
+    response data is only turned into objects for the entries that are actually used.
+    Attributes listed in `fields` are built on their own instead, from a copy of `raw`
+    holding only their keys, and cached. `isinstance()` checks against the model class
+    hold without building anything.
+
+    Args:
+        cls (type): Class of the model `factory` returns.
+        factory (Callable[..., Any]): Builds the model.
+        raw (dict): Response data of the model.
+        *args: Further arguments for `factory`.
+        fields (Dict[str, List[str]], optional): Keys of `raw` needed to build each attribute on its own.
+        values (Dict[str, Any], optional): Attribute values known in advance, like an already lazy media.
+    """
+
+    __slots__ = ("_cls", "_factory", "_raw", "_args", "_fields", "_values", "_target")
+
+    def __init__(
+            self,
+            cls: type,
+            factory: Callable[..., Any],
+            raw: dict,
+            *args: Any,
+            fields: Optional[Dict[str, List[str]]] = None,
+            values: Optional[Dict[str, Any]] = None,
+    ) -> None:
+        self._cls = cls
+        self._factory = factory
+        self._raw = raw
+        self._args = args
+        self._fields = fields
+        self._values = values
+        self._target = None
+
+    def _materialize(self) -> Any:
+        if self._factory is not None:
+            self._target = self._factory(self._raw, *self._args)
+            self._factory = None
+            self._raw = self._args = self._fields = None
+        return self._target
+
+    @property
+    def __class__(self) -> type:
+        return self._cls
+
+    def __getattr__(self, name: str) -> Any:
+        if self._values is not None and name in self._values:
+            return self._values[name]
+        if self._fields is None or name not in self._fields:
+            return getattr(self._materialize(), name)
+
+        raw = {key: self._raw[key] for key in self._fields[name] if key in self._raw}
+        value = getattr(self._factory(raw, *self._args), name)
+        if self._values is None:
+            self._values = {}
+        self._values[name] = value
+        return value
+
+    def __dir__(self) -> List[str]:
+        return dir(self._materialize())
+
+    def __eq__(self, other) -> bool:
+        return self._materialize() == other
+
+    def __hash__(self) -> int:
+        return hash(self._materialize())
+
+    def __repr__(self) -> str:
+        return repr(self._materialize())
+
+    def __str__(self) -> str:
+        return str(self._materialize())
+
+    def __reduce_ex__(self, protocol: int):
+        return self._materialize().__reduce_ex__(protocol)
@@ -21,6 +21,38 @@ from .trailer import Trailer
 class Manga(Hashable):
     """Manga object."""
 
+    __slots__ = (
+        "id",
+        "title",
+        "url",
+        "chapters",
+        "description",
+        "description_short",
+        "status",
+        "genres",
+        "is_adult",
+        "tags",
+        "studios",
+        "start_date",
+        "end_date",
+        "season",
+        "country",
+        "cover",
+        "banner",
+        "source",
+        "hashtag",
+        "synonyms",
+        "score",
+        "next_airing",
+        "trailer",
+        "staff",
+        "characters",
+        "volumes",
+        "popularity",
+        "rankings",
+        "relations",
+    )
+
     def __init__(
         self,
         *,
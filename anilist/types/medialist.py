@@ -14,6 +14,20 @@ from .object import Hashable
 class MediaList(Hashable):
     """List item containing state of a entry in a user's list."""
 
+    __slots__ = (
+        "id",
+        "status",
+        "score",
+        "progress",
+        "repeat",
+        "priority",
+        "start_date",
+        "complete_date",
+        "update_date",
+        "create_date",
+        "media",
+    )
+
     def __init__(
         self,
         *,
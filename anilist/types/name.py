@@ -11,6 +11,8 @@ from .object import Object
 class Name(Object):
     """Name object."""
 
+    __slots__ = ("first", "full", "native", "last", "alternative")
+
     def __init__(
         self,
         *,
@@ -12,6 +12,8 @@ from .object import Object
 class NextAiring(Object):
     """Status of an airing anime."""
 
+    __slots__ = ("time_until", "at", "episode")
+
     def __init__(
         self,
         *,
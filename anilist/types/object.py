@@ -1,11 +1,37 @@
-from typing import Dict
+from functools import lru_cache
+from typing import Dict, Tuple
+
+
+@lru_cache(maxsize=None)
+def _slot_names(cls: type) -> Tuple[str, ...]:
+    names = []
+    for base in reversed(cls.__mro__):
+        for name in base.__dict__.get("__slots__", ()):
+            if not name.startswith("__") and name not in names:
+                names.append(name)
+    return tuple(names)
 
 
 class Object:
+    """Base model class.
+
+    Models declare their attributes in `__slots__`, so instances carry no `__dict__`.
+    Optional attributes are only set when the API returned them, and reading an
+    unset one raises AttributeError, like before.
+    """
+
     __slots__ = ()
 
     def raw(self) -> Dict:
-        return self.__dict__
+        raw = {}
+        for name in _slot_names(type(self)):
+            try:
+                raw[name] = getattr(self, name)
+            except AttributeError:
+                pass
+        # Subclasses defined outside the package may still use a __dict__.
+        raw.update(getattr(self, "__dict__", {}))
+        return raw
 
     def __repr__(self) -> str:
         return self.__str__()
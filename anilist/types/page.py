@@ -11,6 +11,8 @@ from .object import Object
 class PageInfo(Object):
     """Page object. Contains Pagination info."""
 
+    __slots__ = ("total_items", "current", "last")
+
     def __init__(
         self,
         *,
@@ -11,6 +11,8 @@ from .object import Object
 class Score(Object):
     """Mean and average score union."""
 
+    __slots__ = ("mean", "average")
+
     def __init__(
         self,
         *,
@@ -11,6 +11,8 @@ from .object import Object
 class Season(Object):
     """Season object that represents a season."""
 
+    __slots__ = ("name", "year", "number")
+
     def __init__(
         self,
         *,
@@ -14,6 +14,8 @@ from .object import Hashable
 class Studio(Hashable):
     """Studio object."""
 
+    __slots__ = ("id", "name", "is_animation_studio", "url", "favourites")
+
     def __init__(
         self,
         *,
@@ -35,6 +37,25 @@ class Studio(Hashable):
 class Staff(Hashable):
     """Staff object."""
 
+    __slots__ = (
+        "id",
+        "name",
+        "role",
+        "language",
+        "image",
+        "url",
+        "favorites",
+        "description",
+        "occupations",
+        "gender",
+        "birth_date",
+        "death_date",
+        "age",
+        "years_active",
+        "home_town",
+        "is_favorite",
+    )
+
     def __init__(
         self,
         *,
@@ -11,6 +11,8 @@ from .object import Object
 class Ranking(Object):
     """Ranking of a media object."""
 
+    __slots__ = ("type", "format", "rank", "all_time", "year", "season")
+
     def __init__(
         self,
         *,
@@ -34,6 +36,18 @@ class Ranking(Object):
 class Statistic(Object):
     """Statistic object of a user."""
 
+    __slots__ = (
+        "count",
+        "mean_score",
+        "minutes_watched",
+        "episodes_watched",
+        "chapters_read",
+        "volumes_read",
+        "statuses",
+        "genres",
+        "tags",
+    )
+
     def __init__(
         self,
         *,
@@ -64,6 +78,8 @@ class Statistic(Object):
 class StatisticsUnion(Object):
     """Union containing anime and manga statistics of a user."""
 
+    __slots__ = ("anime", "manga")
+
     def __init__(self, *, anime: Statistic, manga: Statistic) -> None:
         self.anime = anime
         self.manga = manga
@@ -11,6 +11,8 @@ from .object import Object
 class Title(Object):
     """Title object."""
 
+    __slots__ = ("romaji", "english", "native")
+
     def __init__(
         self,
         *,
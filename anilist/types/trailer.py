@@ -11,6 +11,8 @@ from .object import Hashable
 class Trailer(Hashable):
     """Contains data for anime trailers."""
 
+    __slots__ = ("id", "thumbnail", "site", "url")
+
     def __init__(
         self,
         *,
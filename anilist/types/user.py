@@ -45,6 +45,21 @@ def get_profile_color(color: str) -> Tuple[int, int, int]:
 class User(Hashable):
     """User object."""
 
+    __slots__ = (
+        "id",
+        "name",
+        "created_at",
+        "updated_at",
+        "about",
+        "image",
+        "favourites",
+        "statistics",
+        "url",
+        "donator_tier",
+        "donator_badge",
+        "profile_color",
+    )
+
     def __init__(
         self,
         *,
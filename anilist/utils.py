@@ -2,30 +2,34 @@
 # SPDX-License-Identifier: MIT
 # Copyright (C) 2021-2022 Amano Team <https://amanoteam.com/> and the python-anilist contributors
 
-from .queries import (
-    ANIME_GET_QUERY,
-    ANIME_SEARCH_QUERY,
-    CHARACTER_GET_QUERY,
-    CHARACTER_SEARCH_QUERY,
-    LIST_ACTIVITY_QUERY,
-    LIST_GET_QUERY,
-    LIST_GET_QUERY_ANIME,
-    LIST_GET_QUERY_MANGA,
-    LIST_ITEM_GET_QUERY,
-    MANGA_GET_QUERY,
-    MANGA_SEARCH_QUERY,
-    MESSAGE_ACTIVITY_QUERY,
-    MESSAGE_ACTIVITY_QUERY_SENT,
-    MESSAGE_ACTIVITY_SENT_QUERY,
-    STAFF_GET_QUERY,
-    STAFF_SEARCH_QUERY,
-    TEXT_ACTIVITY_QUERY,
-    USER_GET_QUERY,
-    USER_SEARCH_QUERY,
-)
+from typing import List
+
+from . import queries
 
 API_URL = "https://graphql.anilist.co"
+MAX_PER_PAGE = 50
 HEADERS = {
     "Content-Type": "application/json",
     "Accept": "application/json",
 }
+
+
+def chunk_ids(ids: List[int], size: int = MAX_PER_PAGE) -> List[List[int]]:
+    """Splits ids into chunks that fit in one page, skipping duplicates.
+
+    Args:
+        ids (List[int]): Item ids.
+        size (int, optional): Maximum ids per chunk. Defaults to MAX_PER_PAGE.
+
+    Returns:
+        List[List[int]]: Chunks of unique ids, in the order they were first seen.
+    """
+    unique = list(dict.fromkeys(ids))
+    return [unique[i:i + size] for i in range(0, len(unique), size)]
+
+
+def __getattr__(name: str) -> str:
+    # The queries used to be imported here, keep them reachable without loading them all up front.
+    if name in queries.__all__:
+        return getattr(queries, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,46 @@
+#!/usr/bin/env python3
+# SPDX-License-Identifier: MIT
+# Copyright (C) 2021-2022 Amano Team <https://amanoteam.com/> and the python-anilist contributors
+
+"""Compares the JSON decoders available to `Client(decoder=...)`.
+
+Run from the repository root:
+
+    python benchmarks/bench_decode.py [repeat]
+"""
+
+import json
+import sys
+import timeit
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from anilist.decoder import get_decoder  # noqa: E402
+from payloads import list_page, media  # noqa: E402
+
+
+def main(repeat: int = 20) -> None:
+    bodies = {
+        "anime_get": json.dumps({"data": {"Page": {"media": [media(1)]}}}).encode(),
+        "list_get_anime, 50 entries": json.dumps(list_page(50)).encode(),
+        "list_get_anime, 500 entries": json.dumps(list_page(500)).encode(),
+    }
+    decoders = {}
+    for name in ["json", "orjson", "msgspec"]:
+        try:
+            decoders[name] = get_decoder(name)
+        except ImportError:
+            print(f"{name} is not installed, skipped")
+
+    for payload, body in bodies.items():
+        print(f"{payload} ({len(body) / 1024:.0f} KiB), best of {repeat}")
+        baseline = None
+        for name, decoder in decoders.items():
+            best = min(timeit.repeat(lambda: decoder(body), number=1, repeat=repeat))
+            baseline = baseline or best
+            print(f"  {name:<10} {best * 1000:8.3f} ms  {baseline / best:5.1f}x")
+
+
+if __name__ == "__main__":
+    main(*(int(arg) for arg in sys.argv[1:]))
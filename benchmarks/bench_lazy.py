@@ -0,0 +1,48 @@
+#!/usr/bin/env python3
+# SPDX-License-Identifier: MIT
+# Copyright (C) 2021-2022 Amano Team <https://amanoteam.com/> and the python-anilist contributors
+
+"""Compares eager and lazy processing of a list page.
+
+Run from the repository root:
+
+    python benchmarks/bench_lazy.py [entries] [repeat]
+"""
+
+import sys
+import timeit
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from anilist.client_process import process_get_list  # noqa: E402
+from payloads import list_page  # noqa: E402
+
+
+def main(entries: int = 500, repeat: int = 20) -> None:
+    data = list_page(entries)
+
+    def eager():
+        process_get_list(data, "anime")
+
+    def lazy():
+        process_get_list(data, "anime", lazy=True)
+
+    def lazy_titles():
+        for entry in process_get_list(data, "anime", lazy=True)[0]:
+            entry.media.title
+
+    def lazy_titles_status():
+        for entry in process_get_list(data, "anime", lazy=True)[0]:
+            entry.media.title
+            entry.status
+
+    print(f"{entries} list entries, best of {repeat}")
+    for name, function in [("eager", eager), ("lazy", lazy), ("lazy, media titles", lazy_titles),
+                           ("lazy, titles and status", lazy_titles_status)]:
+        best = min(timeit.repeat(function, number=1, repeat=repeat))
+        print(f"  {name:<20} {best * 1000:8.2f} ms")
+
+
+if __name__ == "__main__":
+    main(*(int(arg) for arg in sys.argv[1:]))
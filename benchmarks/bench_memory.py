@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+# SPDX-License-Identifier: MIT
+# Copyright (C) 2021-2022 Amano Team <https://amanoteam.com/> and the python-anilist contributors
+
+"""Measures the memory held by model objects built from a list page.
+
+Run from the repository root:
+
+    python benchmarks/bench_memory.py [entries]
+"""
+
+import gc
+import sys
+import tracemalloc
+from collections import Counter
+from pathlib import Path
+from typing import Tuple
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from anilist.client_process import process_get_list  # noqa: E402
+from payloads import list_page  # noqa: E402
+
+
+def count_objects(root) -> Tuple[Counter, int]:
+    """Counts the model objects reachable from root and their shallow size."""
+    counts = Counter()
+    size = 0
+    seen = set()
+    stack = [root]
+    while stack:
+        obj = stack.pop()
+        if id(obj) in seen:
+            continue
+        seen.add(id(obj))
+        if type(obj).__module__.startswith("anilist.types"):
+            counts[type(obj).__name__] += 1
+            size += sys.getsizeof(obj) + sys.getsizeof(getattr(obj, "__dict__", None))
+            stack.extend(getattr(obj, name) for name in type(obj).__slots__ if hasattr(obj, name))
+        elif isinstance(obj, (list, tuple)):
+            stack.extend(obj)
+    return counts, size
+
+
+def main(entries: int = 2000) -> None:
+    data = list_page(entries)
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    result, _ = process_get_list(data, "anime")
+    gc.collect()
+    used = tracemalloc.get_traced_memory()[0] - before
+    tracemalloc.stop()
+
+    counts, size = count_objects(result)
+    total = sum(counts.values())
+    print(f"{entries} list entries, {total} model objects")
+    for name, count in counts.most_common():
+        print(f"  {name:<18} {count:>8}")
+    print(f"memory held:        {used / 1024 / 1024:.2f} MiB")
+    print(f"bytes per entry:    {used / entries:.0f}")
+    print(f"bytes per object:   {used / total:.0f}")
+    print(f"model object bytes: {size / total:.0f} per object, strings and lists excluded")
+
+
+if __name__ == "__main__":
+    main(*(int(arg) for arg in sys.argv[1:]))
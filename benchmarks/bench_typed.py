@@ -0,0 +1,45 @@
+#!/usr/bin/env python3
+# SPDX-License-Identifier: MIT
+# Copyright (C) 2021-2022 Amano Team <https://amanoteam.com/> and the python-anilist contributors
+
+"""Compares model construction from decoded dicts with typed decoding into `anilist.schema` structs.
+
+Run from the repository root:
+
+    python benchmarks/bench_typed.py [entries] [repeat]
+"""
+
+import json
+import sys
+import timeit
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from anilist import schema  # noqa: E402
+from anilist.client_process import process_get_list  # noqa: E402
+from anilist.decoder import get_decoder  # noqa: E402
+from payloads import list_page  # noqa: E402
+
+
+def main(entries: int = 500, repeat: int = 20) -> None:
+    body = json.dumps(list_page(entries)).encode()
+    cases = {}
+    for name in ["json", "orjson", "msgspec"]:
+        try:
+            decoder = get_decoder(name)
+        except ImportError:
+            continue
+        cases[f"{name} + process_get_list"] = lambda decoder=decoder: process_get_list(decoder(body), "anime")
+    cases["typed schema"] = lambda: schema.process_list(schema.decode(body, schema.ListResponse), "anime")
+
+    print(f"list_get_anime, {entries} entries ({len(body) / 1024:.0f} KiB), best of {repeat}")
+    baseline = None
+    for name, function in cases.items():
+        best = min(timeit.repeat(function, number=1, repeat=repeat))
+        baseline = baseline or best
+        print(f"  {name:<28} {best * 1000:8.2f} ms  {baseline / best:5.1f}x")
+
+
+if __name__ == "__main__":
+    main(*(int(arg) for arg in sys.argv[1:]))
@@ -0,0 +1,52 @@
+#!/usr/bin/env python3
+# SPDX-License-Identifier: MIT
+# Copyright (C) 2021-2022 Amano Team <https://amanoteam.com/> and the python-anilist contributors
+
+"""Compares two result files written by `run.py --json`.
+
+    python benchmarks/compare.py before.json after.json [--threshold 10]
+
+Metrics that got worse by more than the threshold (in percent) are flagged. For
+`requests_per_second` higher is better, for everything else lower is better.
+"""
+
+import argparse
+import json
+import sys
+from pathlib import Path
+
+HIGHER_IS_BETTER = {"requests_per_second"}
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("before")
+    parser.add_argument("after")
+    parser.add_argument("--threshold", type=float, default=10.0, help="Regression threshold in percent.")
+    args = parser.parse_args()
+
+    before = json.loads(Path(args.before).read_text())
+    after = json.loads(Path(args.after).read_text())
+    print(f"{before['metadata']['commit']} -> {after['metadata']['commit']}")
+
+    regressions = 0
+    for section, rows in after["results"].items():
+        print(f"\n{section}")
+        for row, metrics in rows.items():
+            for metric, value in metrics.items():
+                old = before["results"].get(section, {}).get(row, {}).get(metric)
+                if not old:
+                    continue
+                change = (value - old) / old * 100
+                worse = -change if metric in HIGHER_IS_BETTER else change
+                flag = ""
+                if worse > args.threshold:
+                    flag = "  <- regression"
+                    regressions += 1
+                print(f"  {row:<24} {metric:<24} {old:>14.3f} {value:>14.3f} {change:>+8.1f}%{flag}")
+
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,209 @@
+# SPDX-License-Identifier: MIT
+# Copyright (C) 2021-2022 Amano Team <https://amanoteam.com/> and the python-anilist contributors
+
+"""Response fixtures for every query in anilist/queries and a transport that replays them.
+
+Fixtures are generated by `payloads.py`. A recorded response saved as
+`benchmarks/recorded/<query>.json` replaces the generated one for that query.
+"""
+
+import asyncio
+import json
+import time
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Callable, Dict, List, NamedTuple
+
+import httpx
+
+import payloads
+from anilist import client_process
+from anilist.queries import (
+    ANIME_GET_MANY_QUERY,
+    ANIME_GET_QUERY,
+    ANIME_SEARCH_QUERY,
+    CHARACTER_GET_QUERY,
+    CHARACTER_SEARCH_QUERY,
+    LIST_ACTIVITY_QUERY,
+    LIST_ACTIVITY_QUERY_MANGA,
+    LIST_COLLECTION_QUERY_ANIME,
+    LIST_COLLECTION_QUERY_MANGA,
+    LIST_GET_QUERY,
+    LIST_GET_QUERY_ANIME,
+    LIST_GET_QUERY_MANGA,
+    LIST_ITEM_GET_QUERY,
+    MANGA_GET_MANY_QUERY,
+    MANGA_GET_QUERY,
+    MANGA_SEARCH_QUERY,
+    MESSAGE_ACTIVITY_QUERY,
+    MESSAGE_ACTIVITY_QUERY_SENT,
+    STAFF_GET_QUERY,
+    STAFF_SEARCH_QUERY,
+    TEXT_ACTIVITY_QUERY,
+    USER_GET_QUERY,
+    USER_SEARCH_QUERY,
+)
+
+ROOT = Path(__file__).resolve().parent
+QUERY_FILES = ROOT.parent / "anilist" / "queries" / "_query_files"
+RECORDED = ROOT / "recorded"
+
+MANY_IDS = list(range(1, 51))
+PAGE_SIZE = 50
+COLLECTION_SIZE = 500
+
+
+class Fixture(NamedTuple):
+    query: str
+    generate: Callable[[], dict]
+    process: Callable[[dict], Any]
+
+
+FIXTURES: Dict[str, Fixture] = {
+    "anime_search": Fixture(
+        ANIME_SEARCH_QUERY, lambda: payloads.media_search("ANIME"), client_process.process_search_anime,
+    ),
+    "manga_search": Fixture(
+        MANGA_SEARCH_QUERY, lambda: payloads.media_search("MANGA"), client_process.process_search_manga,
+    ),
+    "character_search": Fixture(
+        CHARACTER_SEARCH_QUERY,
+        lambda: payloads.search("characters", [payloads.character(i) for i in range(10)]),
+        client_process.process_search_character,
+    ),
+    "staff_search": Fixture(
+        STAFF_SEARCH_QUERY,
+        lambda: payloads.search("staff", [payloads.staff(i) for i in range(10)]),
+        client_process.process_search_staff,
+    ),
+    "user_search": Fixture(
+        USER_SEARCH_QUERY,
+        lambda: payloads.search("users", [payloads.user_summary(i) for i in range(10)]),
+        client_process.process_search_user,
+    ),
+    "anime_get": Fixture(ANIME_GET_QUERY, lambda: payloads.media_get("ANIME"), client_process.process_get_anime),
+    "manga_get": Fixture(MANGA_GET_QUERY, lambda: payloads.media_get("MANGA"), client_process.process_get_manga),
+    "anime_get_many": Fixture(
+        ANIME_GET_MANY_QUERY,
+        lambda: payloads.media_get("ANIME", MANY_IDS),
+        lambda data: client_process.process_get_many_anime(data, MANY_IDS),
+    ),
+    "manga_get_many": Fixture(
+        MANGA_GET_MANY_QUERY,
+        lambda: payloads.media_get("MANGA", MANY_IDS),
+        lambda data: client_process.process_get_many_manga(data, MANY_IDS),
+    ),
+    "character_get": Fixture(
+        CHARACTER_GET_QUERY,
+        lambda: {"data": {"Character": payloads.character(1)}},
+        client_process.process_get_character,
+    ),
+    "staff_get": Fixture(
+        STAFF_GET_QUERY, lambda: {"data": {"Staff": payloads.staff(1)}}, client_process.process_get_staff,
+    ),
+    "user_get": Fixture(USER_GET_QUERY, payloads.user, client_process.process_get_user),
+    "list_get": Fixture(
+        LIST_GET_QUERY,
+        lambda: {"data": {**payloads.list_page(PAGE_SIZE)["data"], **payloads.list_page(PAGE_SIZE, "manga")["data"]}},
+        lambda data: client_process.process_get_list(data, "anime"),
+    ),
+    "list_get_anime": Fixture(
+        LIST_GET_QUERY_ANIME,
+        lambda: payloads.list_page(PAGE_SIZE),
+        lambda data: client_process.process_get_list(data, "anime"),
+    ),
+    "list_get_manga": Fixture(
+        LIST_GET_QUERY_MANGA,
+        lambda: payloads.list_page(PAGE_SIZE, "manga"),
+        lambda data: client_process.process_get_list(data, "manga"),
+    ),
+    "list_collection_anime": Fixture(
+        LIST_COLLECTION_QUERY_ANIME,
+        lambda: payloads.list_collection(COLLECTION_SIZE),
+        lambda data: client_process.process_get_list_collection(data, "anime"),
+    ),
+    "list_collection_manga": Fixture(
+        LIST_COLLECTION_QUERY_MANGA,
+        lambda: payloads.list_collection(COLLECTION_SIZE, "manga"),
+        lambda data: client_process.process_get_list_collection(data, "manga"),
+    ),
+    "list_item_get": Fixture(LIST_ITEM_GET_QUERY, payloads.list_item, client_process.process_get_list_item),
+    "list_activity": Fixture(
+        LIST_ACTIVITY_QUERY,
+        lambda: payloads.list_activity(PAGE_SIZE),
+        client_process.process_get_anime_activity,
+    ),
+    "list_activity_manga": Fixture(
+        LIST_ACTIVITY_QUERY_MANGA,
+        lambda: payloads.list_activity(PAGE_SIZE, "MANGA"),
+        client_process.process_get_manga_activity,
+    ),
+    "text_activity": Fixture(
+        TEXT_ACTIVITY_QUERY, lambda: payloads.text_activity(PAGE_SIZE), client_process.process_get_text_activity,
+    ),
+    "message_activity": Fixture(
+        MESSAGE_ACTIVITY_QUERY,
+        lambda: payloads.message_activity(PAGE_SIZE),
+        client_process.process_get_message_activity,
+    ),
+    "message_activity_sent": Fixture(
+        MESSAGE_ACTIVITY_QUERY_SENT,
+        lambda: payloads.message_activity(PAGE_SIZE),
+        client_process.process_get_message_activity_sent,
+    ),
+}
+
+
+def missing() -> List[str]:
+    """Returns the query files without a fixture."""
+    return sorted(path.stem for path in QUERY_FILES.glob("*/*.graphql") if path.stem not in FIXTURES)
+
+
+@lru_cache(maxsize=None)
+def body(name: str) -> bytes:
+    """Returns the response body of a fixture, recorded if available."""
+    recorded = RECORDED / f"{name}.json"
+    if recorded.exists():
+        return recorded.read_bytes()
+    return json.dumps(FIXTURES[name].generate()).encode()
+
+
+def data(name: str) -> dict:
+    return json.loads(body(name))
+
+
+@lru_cache(maxsize=None)
+def _routes() -> Dict[str, str]:
+    return {fixture.query: name for name, fixture in FIXTURES.items()}
+
+
+def _respond(request: httpx.Request) -> httpx.Response:
+    query = json.loads(request.content)["query"]
+    routes = _routes()
+    if query not in routes:
+        return httpx.Response(400, json={"data": None, "errors": [{"message": "Unknown query", "status": 400}]})
+    return httpx.Response(200, content=body(routes[query]), headers={"Content-Type": "application/json"})
+
+
+def transport(latency: float = 0.0) -> httpx.MockTransport:
+    """Returns a transport answering every known query with its fixture.
+
+    Args:
+        latency (float, optional): Seconds each response is delayed, to emulate the network. Defaults to 0.
+    """
+    def handler(request: httpx.Request) -> httpx.Response:
+        if latency:
+            time.sleep(latency)
+        return _respond(request)
+
+    return httpx.MockTransport(handler)
+
+
+def async_transport(latency: float = 0.0) -> httpx.MockTransport:
+    """Asynchronous version of `transport()`, delaying responses without blocking the event loop."""
+    async def handler(request: httpx.Request) -> httpx.Response:
+        if latency:
+            await asyncio.sleep(latency)
+        return _respond(request)
+
+    return httpx.MockTransport(handler)
@@ -0,0 +1,308 @@
+# SPDX-License-Identifier: MIT
+# Copyright (C) 2021-2022 Amano Team <https://amanoteam.com/> and the python-anilist contributors
+
+"""Generated response payloads shaped like the ones returned by the queries in anilist/queries.
+
+They are deterministic, so results can be compared across commits.
+"""
+
+from typing import List
+
+
+def name(first: str, last: str) -> dict:
+    return {
+        "first": first,
+        "middle": None,
+        "last": last,
+        "full": f"{first} {last}",
+        "native": None,
+        "userPreferred": f"{first} {last}",
+    }
+
+
+def date(year: int, month: int = 1, day: int = 1) -> dict:
+    return {"year": year, "month": month, "day": day}
+
+
+def avatar(id: int) -> dict:
+    return {"large": f"https://example.org/{id}/l.png", "medium": f"https://example.org/{id}/m.png"}
+
+
+def page_info(total: int, page: int = 1, last: int = 1) -> dict:
+    return {"total": total, "currentPage": page, "lastPage": last}
+
+
+def media(id: int, type: str = "ANIME", relations: int = 0) -> dict:
+    item = {
+        "type": type,
+        "id": id,
+        "title": {"romaji": f"Title {id}", "english": f"English {id}", "native": f"Native {id}"},
+        "siteUrl": f"https://anilist.co/{type.lower()}/{id}",
+        "episodes": 12 if type == "ANIME" else None,
+        "chapters": None if type == "ANIME" else 120,
+        "volumes": None if type == "ANIME" else 12,
+        "description": "Description " * 20,
+        "format": "TV" if type == "ANIME" else "MANGA",
+        "status": "FINISHED",
+        "duration": 24 if type == "ANIME" else None,
+        "genres": ["Drama", "Mystery"],
+        "isAdult": False,
+        "tags": [{"name": "Vampire"}, {"name": "Urban Fantasy"}],
+        "studios": {"nodes": [{"name": "Shaft"}]},
+        "startDate": date(2009, 7, 3),
+        "endDate": date(2009, 9, 25),
+        "season": "SUMMER",
+        "seasonYear": 2009,
+        "seasonInt": 93,
+        "countryOfOrigin": "JP",
+        "coverImage": {"medium": "m.png", "large": "l.png", "extraLarge": "xl.png"},
+        "bannerImage": "banner.png",
+        "source": "LIGHT_NOVEL",
+        "hashtag": "#tag",
+        "synonyms": ["Synonym"],
+        "meanScore": 83,
+        "averageScore": 82,
+        "popularity": 1000,
+        "rankings": [{"type": "RATED", "allTime": True, "format": "TV", "rank": 100, "year": None, "season": None}],
+        "nextAiringEpisode": {"timeUntilAiring": 3600, "airingAt": 1650000000, "episode": 3},
+        "trailer": {"id": "abc", "thumbnail": "t.png", "site": "youtube"},
+        "staff": {"edges": [{"node": {"id": i, "name": name("A", "B")}, "role": "Director"} for i in range(4)]},
+        "characters": {"edges": [{"node": {"id": i, "name": name("C", "D")}, "role": "MAIN"} for i in range(4)]},
+    }
+    if relations:
+        item["relations"] = {
+            "edges": [
+                {
+                    "node": {
+                        "id": id + i,
+                        "title": item["title"],
+                        "type": type,
+                        "siteUrl": item["siteUrl"],
+                        "episodes": item["episodes"],
+                        "chapters": item["chapters"],
+                        "description": item["description"],
+                        "format": item["format"],
+                        "status": "FINISHED",
+                        "isAdult": False,
+                        "coverImage": item["coverImage"],
+                        "bannerImage": None,
+                    },
+                    "relationType": "SEQUEL",
+                }
+                for i in range(1, relations + 1)
+            ]
+        }
+    return item
+
+
+def media_get(type: str = "ANIME", ids: List[int] = (1,)) -> dict:
+    items = [media(id, type, relations=3) for id in ids]
+    return {"data": {"Page": {"pageInfo": page_info(len(items)), "media": items}}}
+
+
+def media_search(type: str = "ANIME", items: int = 10) -> dict:
+    results = [
+        {"id": id, "title": {"romaji": f"Title {id}", "english": None, "native": None},
+         "siteUrl": f"https://anilist.co/{type.lower()}/{id}"}
+        for id in range(1, items + 1)
+    ]
+    return {"data": {"Page": {"pageInfo": page_info(100), "media": results}}}
+
+
+def character(id: int) -> dict:
+    return {
+        "id": id,
+        "name": name("Hitagi", "Senjougahara"),
+        "image": avatar(id),
+        "siteUrl": f"https://anilist.co/character/{id}",
+        "favourites": 10000,
+        "description": "Description " * 20,
+        "gender": "Female",
+        "dateOfBirth": date(1991, 7, 7),
+        "age": "18",
+        "media": {
+            "edges": [
+                {"node": {"id": i, "type": "ANIME", "title": {"romaji": f"Title {i}", "english": None, "native": None}}}
+                for i in range(5)
+            ]
+        },
+        "isFavourite": False,
+    }
+
+
+def staff(id: int) -> dict:
+    return {
+        "id": id,
+        "name": name("Akiyuki", "Shinbo"),
+        "languageV2": "Japanese",
+        "image": avatar(id),
+        "description": "Description " * 20,
+        "primaryOccupations": ["Director"],
+        "gender": "Male",
+        "dateOfBirth": date(1961, 9, 27),
+        "dateOfDeath": date(None, None, None),
+        "age": 60,
+        "yearsActive": [1982],
+        "homeTown": "Fukushima",
+        "siteUrl": f"https://anilist.co/staff/{id}",
+        "favourites": 5000,
+    }
+
+
+def studio(id: int) -> dict:
+    return {
+        "id": id,
+        "name": f"Studio {id}",
+        "isAnimationStudio": True,
+        "siteUrl": f"https://anilist.co/studio/{id}",
+        "favourites": 100,
+    }
+
+
+def search(key: str, items: List[dict]) -> dict:
+    return {"data": {"Page": {"pageInfo": page_info(100), key: items}}}
+
+
+def statistic(media_type: str) -> dict:
+    stat = {
+        "count": 500,
+        "meanScore": 75.5,
+        "statuses": [{"status": status, "count": 100} for status in ["CURRENT", "COMPLETED", "DROPPED"]],
+        "genres": [{"genre": f"Genre {i}", "count": 50 - i} for i in range(15)],
+        "tags": [{"tag": {"name": f"Tag {i}"}, "count": 50 - i} for i in range(30)],
+    }
+    if media_type == "ANIME":
+        stat.update(minutesWatched=100000, episodesWatched=4000)
+    else:
+        stat.update(chaptersRead=10000, volumesRead=1000)
+    return stat
+
+
+def user_summary(id: int) -> dict:
+    return {"id": id, "name": f"user{id}", "avatar": avatar(id)}
+
+
+def user(id: int = 1, favourites: int = 25) -> dict:
+    return {
+        "data": {
+            "User": {
+                "id": id,
+                "name": f"user{id}",
+                "about": "About " * 20,
+                "avatar": avatar(id),
+                "bannerImage": None,
+                "favourites": {
+                    "anime": {"nodes": [media(i) for i in range(favourites)]},
+                    "manga": {"nodes": [media(i, "MANGA") for i in range(favourites)]},
+                    "characters": {"nodes": [character(i) for i in range(favourites)]},
+                    "staff": {"nodes": [staff(i) for i in range(favourites)]},
+                    "studios": {"nodes": [studio(i) for i in range(favourites)]},
+                },
+                "statistics": {"anime": statistic("ANIME"), "manga": statistic("MANGA")},
+                "siteUrl": f"https://anilist.co/user/user{id}",
+                "donatorTier": 1,
+                "donatorBadge": "Donator",
+                "createdAt": 1600000000,
+                "updatedAt": 1650000000,
+                "options": {"profileColor": "blue"},
+            }
+        }
+    }
+
+
+def list_entry(id: int, type: str = "ANIME") -> dict:
+    return {
+        "id": id,
+        "status": "COMPLETED",
+        "score": 80,
+        "progress": 12,
+        "repeat": 1,
+        "priority": 1,
+        "startedAt": date(2020, 1, 1),
+        "completedAt": date(2020, 2, 1),
+        "updatedAt": 1650000000,
+        "createdAt": 1600000000,
+        "media": media(id, type),
+    }
+
+
+def list_page(entries: int, content_type: str = "anime") -> dict:
+    return {
+        "data": {
+            content_type: {
+                "pageInfo": page_info(entries),
+                "mediaList": [list_entry(id, content_type.upper()) for id in range(entries)],
+            }
+        }
+    }
+
+
+def list_collection(entries: int, content_type: str = "anime") -> dict:
+    statuses = ["CURRENT", "PLANNING", "COMPLETED", "DROPPED", "PAUSED"]
+    lists = [
+        {
+            "name": status.title(),
+            "status": status,
+            "isCustomList": False,
+            "entries": [
+                list_entry(id, content_type.upper()) for id in range(entries) if id % len(statuses) == index
+            ],
+        }
+        for index, status in enumerate(statuses)
+    ]
+    return {"data": {content_type: {"hasNextChunk": False, "lists": lists}}}
+
+
+def list_item() -> dict:
+    entry = list_entry(1)
+    del entry["media"]
+    return {"data": {"MediaList": entry}}
+
+
+def list_activity(items: int, type: str = "ANIME") -> dict:
+    activities = [
+        {
+            "type": f"{type}_LIST",
+            "id": id,
+            "status": "watched episode" if type == "ANIME" else "read chapter",
+            "progress": "1 - 3",
+            "siteUrl": f"https://anilist.co/activity/{id}",
+            "createdAt": 1650000000 - id,
+            "media": media(id, type),
+        }
+        for id in range(1, items + 1)
+    ]
+    return {"data": {"Page": {"pageInfo": page_info(items), "activities": activities}}}
+
+
+def text_activity(items: int) -> dict:
+    activities = [
+        {
+            "id": id,
+            "replyCount": 2,
+            "text": "Text " * 20,
+            "textHtml": "<p>" + "Text " * 20 + "</p>",
+            "siteUrl": f"https://anilist.co/activity/{id}",
+            "createdAt": 1650000000 - id,
+            "user": user_summary(1),
+        }
+        for id in range(1, items + 1)
+    ]
+    return {"data": {"Page": {"pageInfo": page_info(items), "activities": activities}}}
+
+
+def message_activity(items: int) -> dict:
+    activities = [
+        {
+            "id": id,
+            "recipient": user_summary(1),
+            "messenger": user_summary(2),
+            "replyCount": 0,
+            "text": "Message " * 10,
+            "textHtml": "<p>" + "Message " * 10 + "</p>",
+            "siteUrl": f"https://anilist.co/activity/{id}",
+            "createdAt": 1650000000 - id,
+        }
+        for id in range(1, items + 1)
+    ]
+    return {"data": {"Page": {"pageInfo": page_info(items), "activities": activities}}}
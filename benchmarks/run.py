@@ -0,0 +1,231 @@
+#!/usr/bin/env python3
+# SPDX-License-Identifier: MIT
+# Copyright (C) 2021-2022 Amano Team <https://amanoteam.com/> and the python-anilist contributors
+
+"""Offline benchmark suite.
+
+Every query is answered from the fixtures in `fixtures.py` through an httpx mock
+transport, so nothing leaves the machine and runs on different commits can be
+compared with `compare.py`.
+
+Run from the repository root:
+
+    python benchmarks/run.py [--quick] [--json results.json] [--only import,parse,memory,latency,throughput]
+"""
+
+import argparse
+import asyncio
+import gc
+import json
+import platform
+import statistics
+import subprocess
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Any, Callable, Dict, List
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import anilist  # noqa: E402
+import fixtures  # noqa: E402
+from anilist.decoder import get_decoder  # noqa: E402
+from bench_memory import count_objects  # noqa: E402
+
+SECTIONS = ["import", "parse", "memory", "latency", "throughput"]
+
+# Statements timed in a fresh interpreter, after the interpreter itself has started.
+IMPORTS = {
+    "anilist": "import anilist",
+    "anilist_client": "import anilist; anilist.Client",
+    "anilist_types": "import anilist; anilist.types.Anime",
+}
+
+# Client calls timed end to end, by the fixture that answers them.
+CALLS: Dict[str, Callable[[Any], Any]] = {
+    "anime_search": lambda client: client.search_anime("title", 10),
+    "character_search": lambda client: client.search_character("name", 10),
+    "user_search": lambda client: client.search_user("name", 10),
+    "anime_get": lambda client: client.get_anime(1),
+    "manga_get": lambda client: client.get_manga(1),
+    "anime_get_many": lambda client: client.get_many_anime(fixtures.MANY_IDS),
+    "character_get": lambda client: client.get_character(1),
+    "staff_get": lambda client: client.get_staff(1),
+    "user_get": lambda client: client.get_user("user1"),
+    "list_get_anime": lambda client: client.get_list(1, fixtures.PAGE_SIZE),
+    "list_collection_anime": lambda client: client.get_list_collection(1),
+    "list_item_get": lambda client: client.get_list_item("user1", 1),
+    "list_activity": lambda client: client.get_anime_activity(1, fixtures.PAGE_SIZE),
+    "text_activity": lambda client: client.get_text_activity(1, fixtures.PAGE_SIZE),
+    "message_activity": lambda client: client.get_message_activity(1, fixtures.PAGE_SIZE),
+}
+
+MEMORY_FIXTURES = ["anime_get", "user_get", "list_get_anime", "list_activity", "text_activity"]
+
+
+def timings(function: Callable[[], Any], repeat: int) -> List[float]:
+    function()
+    result = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        result.append(time.perf_counter() - start)
+    return result
+
+
+def summary(samples: List[float]) -> Dict[str, float]:
+    samples = sorted(samples)
+    return {
+        "min_ms": samples[0] * 1000,
+        "median_ms": statistics.median(samples) * 1000,
+        "p95_ms": samples[min(len(samples) - 1, int(len(samples) * 0.95))] * 1000,
+    }
+
+
+def _cold_import(statement: str) -> float:
+    code = f"import time; start = time.perf_counter(); {statement}; print(time.perf_counter() - start)"
+    root = Path(__file__).resolve().parent.parent
+    output = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True, cwd=root).stdout
+    return float(output)
+
+
+def bench_import(repeat: int) -> Dict[str, Dict[str, float]]:
+    """Cold import time of the package, each sample in a new interpreter."""
+    return {name: summary([_cold_import(statement) for _ in range(repeat)]) for name, statement in IMPORTS.items()}
+
+
+def bench_parse(repeat: int) -> Dict[str, Dict[str, float]]:
+    """Decode and process_* time of every fixture."""
+    decoder = get_decoder()
+    results = {}
+    for name, fixture in fixtures.FIXTURES.items():
+        body = fixtures.body(name)
+        data = decoder(body)
+        results[name] = {
+            "bytes": len(body),
+            "decode_ms": summary(timings(lambda: decoder(body), repeat))["median_ms"],
+            "process_ms": summary(timings(lambda: fixture.process(data), repeat))["median_ms"],
+        }
+    return results
+
+
+def bench_memory() -> Dict[str, Dict[str, float]]:
+    """Memory held by the objects process_* builds."""
+    results = {}
+    for name in MEMORY_FIXTURES:
+        data = fixtures.data(name)
+        gc.collect()
+        tracemalloc.start()
+        before = tracemalloc.get_traced_memory()[0]
+        result = fixtures.FIXTURES[name].process(data)
+        gc.collect()
+        used = tracemalloc.get_traced_memory()[0] - before
+        tracemalloc.stop()
+        counts, size = count_objects(result)
+        objects = sum(counts.values())
+        results[name] = {
+            "objects": objects,
+            "held_bytes": used,
+            "bytes_per_object": used / max(objects, 1),
+            "model_bytes_per_object": size / max(objects, 1),
+        }
+        del result
+    return results
+
+
+def bench_latency(repeat: int) -> Dict[str, Dict[str, float]]:
+    """End-to-end time of client calls against the mock transport."""
+    client = anilist.Client(rate_limit=None, transport=fixtures.transport())
+    results = {name: summary(timings(lambda: call(client), repeat)) for name, call in CALLS.items()}
+    client.close()
+    return results
+
+
+async def _throughput(concurrency: int, requests: int, latency: float) -> float:
+    client = anilist.AsyncClient(rate_limit=None, transport=fixtures.async_transport(latency))
+    start = time.perf_counter()
+    await client.map("get_anime", range(requests), concurrency=concurrency)
+    elapsed = time.perf_counter() - start
+    await client.aclose()
+    return requests / elapsed
+
+
+def bench_throughput(requests: int, latency: float, levels: List[int]) -> Dict[str, Dict[str, float]]:
+    """Requests per second of AsyncClient.get_anime at several concurrency levels."""
+    return {
+        f"concurrency_{level}": {"requests_per_second": asyncio.run(_throughput(level, requests, latency))}
+        for level in levels
+    }
+
+
+def metadata() -> Dict[str, str]:
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True,
+            cwd=Path(__file__).resolve().parent,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = "unknown"
+    return {
+        "commit": commit,
+        "python": platform.python_version(),
+        "implementation": platform.python_implementation(),
+        "machine": platform.machine(),
+        "time": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+    }
+
+
+def print_section(name: str, results: Dict[str, Dict[str, float]]) -> None:
+    columns = list(next(iter(results.values())))
+    print(f"\n{name}")
+    print("  " + f"{'':<24}" + "".join(f"{column:>24}" for column in columns))
+    for row, values in results.items():
+        print("  " + f"{row:<24}" + "".join(f"{values[column]:>24.3f}" for column in columns))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--only", default=",".join(SECTIONS), help="Comma separated sections to run.")
+    parser.add_argument("--repeat", type=int, default=50, help="Samples per parse and latency measurement.")
+    parser.add_argument("--requests", type=int, default=400, help="Requests per throughput level.")
+    parser.add_argument("--latency", type=float, default=0.02, help="Emulated network latency in seconds.")
+    parser.add_argument("--levels", default="1,8,32,128", help="Comma separated concurrency levels.")
+    parser.add_argument("--quick", action="store_true", help="Fewer samples, for a smoke run.")
+    parser.add_argument("--json", help="Write the results to this file.")
+    args = parser.parse_args()
+
+    if args.quick:
+        args.repeat, args.requests = 5, 40
+    sections = args.only.split(",")
+    unknown = set(sections) - set(SECTIONS)
+    if unknown:
+        parser.error(f"unknown sections: {', '.join(sorted(unknown))}")
+    missing = fixtures.missing()
+    if missing:
+        print(f"warning: no fixture for {', '.join(missing)}", file=sys.stderr)
+
+    results = {}
+    if "import" in sections:
+        results["import"] = bench_import(max(1, args.repeat // 5))
+    if "parse" in sections:
+        results["parse"] = bench_parse(args.repeat)
+    if "memory" in sections:
+        results["memory"] = bench_memory()
+    if "latency" in sections:
+        results["latency"] = bench_latency(args.repeat)
+    if "throughput" in sections:
+        levels = [int(level) for level in args.levels.split(",")]
+        results["throughput"] = bench_throughput(args.requests, args.latency, levels)
+
+    for name, section in results.items():
+        print_section(name, section)
+
+    if args.json:
+        document = {"metadata": metadata(), "settings": vars(args), "results": results}
+        Path(args.json).write_text(json.dumps(document, indent=2) + "\n")
+        print(f"\nresults written to {args.json}")
+
+
+if __name__ == "__main__":
+    main()
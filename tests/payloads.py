@@ -0,0 +1,137 @@
+# SPDX-License-Identifier: MIT
+# Copyright (C) 2021-2022 Amano Team <https://amanoteam.com/> and the python-anilist contributors
+
+"""Small response payloads shaped like the ones returned by the queries in anilist/queries."""
+
+
+def media(id: int, type: str = "ANIME") -> dict:
+    return {
+        "type": type,
+        "id": id,
+        "title": {"romaji": f"Title {id}", "english": None, "native": None},
+        "siteUrl": f"https://anilist.co/{type.lower()}/{id}",
+        "episodes": 12,
+        "chapters": None,
+        "volumes": None,
+        "description": "Description.",
+        "format": "TV",
+        "status": "FINISHED",
+        "duration": 24,
+        "genres": ["Drama"],
+        "isAdult": False,
+        "tags": [{"name": "Vampire"}],
+        "studios": {"nodes": [{"name": "Shaft"}]},
+        "startDate": {"year": 2009, "month": 7, "day": 3},
+        "endDate": {"year": 2009, "month": 9, "day": 25},
+        "season": "SUMMER",
+        "seasonYear": 2009,
+        "seasonInt": 93,
+        "countryOfOrigin": "JP",
+        "coverImage": {"medium": "m.png", "large": "l.png", "extraLarge": "xl.png"},
+        "bannerImage": "banner.png",
+        "source": "LIGHT_NOVEL",
+        "hashtag": None,
+        "synonyms": [],
+        "meanScore": 83,
+        "averageScore": 82,
+        "popularity": 1000,
+        "rankings": [
+            {"type": "RATED", "allTime": True, "format": "TV", "rank": 100, "year": None, "season": None}
+        ],
+        "nextAiringEpisode": None,
+        "trailer": None,
+        "staff": {"edges": []},
+        "characters": {"edges": []},
+        "relations": {"edges": []},
+    }
+
+
+def media_page(items: list) -> dict:
+    return {
+        "data": {
+            "Page": {
+                "pageInfo": {"total": len(items), "currentPage": 1, "lastPage": 1},
+                "media": items,
+            }
+        }
+    }
+
+
+def list_entry(id: int, media_type: str = "ANIME", updated_at: int = 1650000000) -> dict:
+    return {
+        "id": id,
+        "status": "COMPLETED",
+        "score": 80,
+        "progress": 12,
+        "repeat": 0,
+        "priority": 0,
+        "startedAt": {"year": 2020, "month": 1, "day": 1},
+        "completedAt": {"year": None, "month": None, "day": None},
+        "updatedAt": updated_at,
+        "createdAt": 1600000000,
+        "media": media(id, media_type),
+    }
+
+
+def list_page(entries: list, page: int, last: int, content_type: str = "anime") -> dict:
+    return {
+        "data": {
+            content_type: {
+                "pageInfo": {"total": last * len(entries), "currentPage": page, "lastPage": last},
+                "mediaList": entries,
+            }
+        }
+    }
+
+
+def list_collection(lists: dict, has_next_chunk: bool = False, content_type: str = "anime") -> dict:
+    return {
+        "data": {
+            content_type: {
+                "hasNextChunk": has_next_chunk,
+                "lists": [
+                    {"name": status.title(), "status": status, "isCustomList": status == "CUSTOM", "entries": entries}
+                    for status, entries in lists.items()
+                ],
+            }
+        }
+    }
+
+
+def list_activity(id: int, media_type: str = "ANIME") -> dict:
+    return {
+        "type": f"{media_type}_LIST",
+        "id": id,
+        "status": "watched episode",
+        "progress": "1 - 3",
+        "siteUrl": f"https://anilist.co/activity/{id}",
+        "createdAt": 1650000000 - id,
+        "media": media(id, media_type),
+    }
+
+
+def message_activity(id: int) -> dict:
+    def user(user_id: int) -> dict:
+        return {"id": user_id, "name": f"user{user_id}", "avatar": {"large": None, "medium": None}}
+
+    return {
+        "id": id,
+        "replyCount": 0,
+        "text": "hello",
+        "textHtml": "<p>hello</p>",
+        "siteUrl": f"https://anilist.co/activity/{id}",
+        "createdAt": 1650000000 - id,
+        "messenger": user(1),
+        "recipient": user(2),
+    }
+
+
+def activity_page(activities: list) -> dict:
+    return {
+        "data": {
+            "Page": {
+                "pageInfo": {"total": len(activities), "currentPage": 1, "lastPage": 1},
+                "activities": activities,
+            }
+        }
+    }
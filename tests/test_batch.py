@@ -0,0 +1,61 @@
+# SPDX-License-Identifier: MIT
+# Copyright (C) 2021-2022 Amano Team <https://amanoteam.com/> and the python-anilist contributors
+
+import asyncio
+import json
+
+import httpx
+import pytest
+
+import anilist
+from anilist.batch import split_query
+from anilist.documents import minify
+from anilist.utils import USER_GET_QUERY
+
+NAME = {"first": "A", "full": "A B", "native": None, "last": "B"}
+CHARACTER = {
+    "id": 1, "name": NAME, "image": None, "siteUrl": None, "favourites": None,
+    "description": None, "media": None, "isFavourite": False,
+}
+STAFF = {
+    "id": 2, "name": NAME, "languageV2": "Japanese", "image": None, "description": None,
+    "gender": None, "dateOfBirth": None, "dateOfDeath": None, "siteUrl": None, "favourites": None,
+    "primaryOccupations": None, "age": None, "yearsActive": None, "homeTown": None,
+}
+
+
+def test_split_query():
+    definitions, selection = split_query(USER_GET_QUERY)
+    assert definitions == {"name": "String"}
+    assert minify(selection).startswith("User(name:$name)")
+
+
+@pytest.mark.asyncio
+async def test_lookups_are_coalesced():
+    documents = []
+
+    def handler(request):
+        body = json.loads(request.content)
+        documents.append(body["query"])
+        assert body["variables"] == {"c1_id": 1, "s1_id": 2, "c2_id": 404}
+        return httpx.Response(200, json={"data": {"c1": CHARACTER, "s1": STAFF, "c2": None}})
+
+    async with anilist.AsyncClient(batch_window=0.05, transport=httpx.MockTransport(handler)) as client:
+        character, staff, missing, same = await asyncio.gather(
+            client.get_character(1), client.get_staff(2), client.get_character(404), client.get_character(1)
+        )
+    assert len(documents) == 1
+    assert "c1:Character(id:$c1_id" in minify(documents[0])
+    assert (character.id, staff.id, missing, same) == (1, 2, None, character)
+
+
+@pytest.mark.asyncio
+async def test_errors_fail_every_lookup():
+    def handler(request):
+        return httpx.Response(200, json={"data": None, "errors": [{"message": "Max query complexity"}]})
+
+    async with anilist.AsyncClient(batch_window=0.05, transport=httpx.MockTransport(handler)) as client:
+        results = await asyncio.gather(client.get_character(1), client.get_staff(2), return_exceptions=True)
+    assert [type(result) for result in results] == [ValueError, ValueError]
+    assert "Max query complexity" in str(results[0])
+    assert not client.batcher._tasks
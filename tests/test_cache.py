@@ -0,0 +1,172 @@
+# SPDX-License-Identifier: MIT
+# Copyright (C) 2021-2022 Amano Team <https://amanoteam.com/> and the python-anilist contributors
+
+import threading
+import time
+
+import httpx
+import pytest
+
+import anilist
+from anilist.cache import DiskCache, ResponseCache
+
+RESPONSE = {"data": {"Staff": None}}
+
+
+def test_lru_eviction():
+    cache = ResponseCache(max_size=2)
+    cache.set("q", {"id": 1}, RESPONSE)
+    cache.set("q", {"id": 2}, RESPONSE)
+    assert cache.get("q", {"id": 1}) is RESPONSE
+    cache.set("q", {"id": 3}, RESPONSE)
+
+    assert cache.get("q", {"id": 2}) is None
+    assert cache.get("q", {"id": 3}) is RESPONSE
+    assert cache.stats() == dict(size=2, hits=2, misses=1, evictions=1)
+
+
+def test_ttl_per_content_type(monkeypatch):
+    cache = ResponseCache(ttls={"anime": 10, "staff": 0})
+    cache.set("q", {"id": 1}, RESPONSE, "anime")
+    cache.set("q", {"id": 2}, RESPONSE, "staff")
+    assert cache.get("q", {"id": 2}) is None
+
+    now = time.monotonic()
+    monkeypatch.setattr(time, "monotonic", lambda: now + 11)
+    assert cache.get("q", {"id": 1}) is None
+
+
+def test_errors_are_not_cached():
+    cache = ResponseCache()
+    cache.set("q", {}, {"data": None, "errors": [{"status": 429}]})
+    assert len(cache) == 0
+
+
+@pytest.mark.asyncio
+async def test_client_uses_cache():
+    requests = []
+
+    def handler(request):
+        requests.append(request)
+        return httpx.Response(200, json={"data": {"User": None}})
+
+    cache = ResponseCache()
+    client = anilist.AsyncClient(cache=cache)
+    client.httpx = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+
+    for _ in range(3):
+        await client._query("query { User { id } }", {"name": "travis"}, "user")
+    assert len(requests) == 1
+    assert cache.hits == 2
+
+
+
+@pytest.mark.asyncio
+async def test_async_client_reads_disk_cache_off_the_loop(tmp_path):
+    threads = []
+
+    class RecordingCache(DiskCache):
+        def lookup(self, query, variables):
+            threads.append(threading.get_ident())
+            return super().lookup(query, variables)
+
+        def set(self, *args, **kwargs):
+            threads.append(threading.get_ident())
+            return super().set(*args, **kwargs)
+
+    transport = httpx.MockTransport(lambda request: httpx.Response(200, json={"data": {"User": {"id": 1}}}))
+    client = anilist.AsyncClient(cache=RecordingCache(tmp_path / "cache.sqlite"), rate_limit=None, transport=transport)
+    for _ in range(2):
+        assert await client._query("query { User { id } }", {"id": 1}, "user") == {"data": {"User": {"id": 1}}}
+    await client.aclose()
+    assert len(threads) == 3 and threading.get_ident() not in threads
+
+def test_disk_cache_survives_reopening(tmp_path):
+    path = tmp_path / "cache.sqlite"
+    cache = DiskCache(path)
+    cache.set("q", {"id": 1}, {"data": {"Staff": {"id": 1}}}, "staff")
+    cache.set("q", {"id": 2}, {"data": None, "errors": [{"status": 404}]}, "staff")
+    cache.close()
+
+    cache = DiskCache(path)
+    assert cache.get("q", {"id": 1}) == {"data": {"Staff": {"id": 1}}}
+    assert cache.get("q", {"id": 2}) is None
+    assert cache.stats()["size"] == 1
+
+
+def test_disk_cache_size_cap(tmp_path):
+    cache = DiskCache(tmp_path / "cache.sqlite", max_bytes=200, compression=0)
+    for id in range(5):
+        cache.set("q", {"id": id}, {"data": {"Staff": {"id": id, "name": "x" * 40}}})
+        cache.get("q", {"id": 0})
+
+    assert cache.stats()["bytes"] <= 200
+    assert cache.get("q", {"id": 0}) is not None
+    assert cache.get("q", {"id": 1}) is None
+    assert cache.evictions > 0
+
+
+
+def test_disk_cache_tracks_stored_size(tmp_path):
+    cache = DiskCache(tmp_path / "cache.sqlite", max_bytes=10_000, compression=0)
+    statements = []
+    cache._connection.set_trace_callback(statements.append)
+    for id in [1, 2, 3, 1]:
+        cache.set("q", {"id": id}, {"data": {"Staff": {"id": id, "name": "x" * 40}}})
+
+    assert not any("SUM" in statement for statement in statements)
+    assert cache._bytes == cache.stats()["bytes"]
+
+def test_disk_cache_hits_do_not_write(tmp_path):
+    cache = DiskCache(tmp_path / "cache.sqlite", max_bytes=200, compression=0)
+    cache.set("q", {"id": 1}, {"data": {"Media": {"id": 1, "title": "x" * 40}}})
+    cache.set("q", {"id": 2}, {"data": {"Media": {"id": 2, "title": "x" * 40}}})
+    changes = cache._connection.total_changes
+    for _ in range(3):
+        assert cache.get("q", {"id": 1}) is not None
+    assert cache._connection.total_changes == changes
+
+    # The access times are written before eviction, so the entry read last is kept.
+    cache.set("q", {"id": 3}, {"data": {"Media": {"id": 3, "title": "x" * 40}}})
+    assert cache.get("q", {"id": 2}) is None
+    assert cache.get("q", {"id": 1}) is not None
+
+
+def test_disk_cache_ttl_and_etag(tmp_path, monkeypatch):
+    cache = DiskCache(tmp_path / "cache.sqlite", ttls={"anime": 10})
+    cache.set("q", {"id": 1}, {"data": {"Media": {"id": 1}}}, "anime", etag='"v1"')
+    cache.set("q", {"id": 2}, {"data": {"Media": {"id": 2}}}, "anime")
+
+    now = time.time()
+    monkeypatch.setattr(time, "time", lambda: now + 11)
+    assert cache.get("q", {"id": 1}) is None
+    assert cache.stale("q", {"id": 1}) == ({"data": {"Media": {"id": 1}}}, '"v1"')
+    assert cache.stale("q", {"id": 2}) is None
+
+    statements = []
+    cache._connection.set_trace_callback(statements.append)
+    assert cache.lookup("q", {"id": 1}) == (None, ({"data": {"Media": {"id": 1}}}, '"v1"'))
+    assert cache.lookup("q", {"id": 2}) == (None, None)
+    assert len([statement for statement in statements if statement.startswith("SELECT")]) == 2
+    assert cache.purge() == 2
+
+
+def test_client_revalidates_with_etag(tmp_path, monkeypatch):
+    requests = []
+
+    def handler(request):
+        requests.append(request)
+        if request.headers.get("If-None-Match") == '"v1"':
+            return httpx.Response(304)
+        return httpx.Response(200, json={"data": {"User": {"id": 1}}}, headers={"ETag": '"v1"'})
+
+    cache = DiskCache(tmp_path / "cache.sqlite", ttls={"user": 10})
+    client = anilist.Client(cache=cache, rate_limit=None, transport=httpx.MockTransport(handler))
+    assert client._query("query { User { id } }", {"id": 1}, "user") == {"data": {"User": {"id": 1}}}
+
+    now = time.time()
+    monkeypatch.setattr(time, "time", lambda: now + 11)
+    assert client._query("query { User { id } }", {"id": 1}, "user") == {"data": {"User": {"id": 1}}}
+    assert requests[1].headers["If-None-Match"] == '"v1"'
+    assert client._query("query { User { id } }", {"id": 1}, "user") == {"data": {"User": {"id": 1}}}
+    assert len(requests) == 2
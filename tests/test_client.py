@@ -0,0 +1,205 @@
+# SPDX-License-Identifier: MIT
+# Copyright (C) 2021-2022 Amano Team <https://amanoteam.com/> and the python-anilist contributors
+
+import asyncio
+import json
+import threading
+import time
+
+import httpx
+import pytest
+
+import anilist
+from payloads import media, media_page
+
+CHARACTER = {
+    "id": 22037,
+    "name": {"first": "Hitagi", "full": "Hitagi Senjougahara", "native": "戦場ヶ原ひたぎ", "last": "Senjougahara"},
+    "image": {"medium": "https://example.org/m.png", "large": "https://example.org/l.png"},
+    "siteUrl": "https://anilist.co/character/22037",
+    "favourites": 10000,
+    "description": "Tsundere.",
+    "media": {"edges": []},
+    "isFavourite": False,
+}
+
+
+def handler(request: httpx.Request) -> httpx.Response:
+    return httpx.Response(200, json={"data": {"Character": CHARACTER}})
+
+
+def test_sync_pool_is_reused():
+    client = anilist.Client(http2=False, max_connections=4)
+    client.httpx = httpx.Client(transport=httpx.MockTransport(handler))
+    session = client.httpx
+
+    assert client.get_character(22037).id == 22037
+    assert client.get("22037", "character").name.full == "Hitagi Senjougahara"
+    assert client.httpx is session
+
+    client.close()
+    assert client.httpx is None
+
+
+@pytest.mark.asyncio
+async def test_async_pool_is_reused():
+    async with anilist.AsyncClient(http2=False) as client:
+        await client.httpx.aclose()
+        client.httpx = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        session = client.httpx
+
+        assert (await client.get_character(22037)).id == 22037
+        assert (await client.get("22037", "character")).name.full == "Hitagi Senjougahara"
+        assert client.httpx is session
+    assert client.httpx is None
+
+
+def test_get_many_keeps_order():
+    requests = []
+
+    def handler(request):
+        variables = json.loads(request.content)["variables"]
+        requests.append(variables["ids"])
+        return httpx.Response(200, json=media_page([media(id) for id in variables["ids"] if id % 2]))
+
+    client = anilist.Client()
+    client.httpx = httpx.Client(transport=httpx.MockTransport(handler))
+    ids = list(range(1, 121)) + [3]
+
+    result = client.get_many(ids, "anime")
+    assert [len(chunk) for chunk in requests] == [50, 50, 20]
+    assert [anime and anime.id for anime in result] == [id if id % 2 else None for id in ids]
+
+
+def test_get_many_raises_on_errors():
+    payload = {"data": None, "errors": [{"message": "Too many ids", "status": 400}]}
+    client = anilist.Client()
+    client.httpx = httpx.Client(transport=httpx.MockTransport(lambda request: httpx.Response(200, json=payload)))
+
+    with pytest.raises(ValueError, match="AniList returned errors: Too many ids"):
+        client.get_many([1, 2], "anime")
+
+
+def test_decoder():
+    bodies = []
+
+    def decoder(body):
+        bodies.append(body)
+        return json.loads(body)
+
+    client = anilist.Client(decoder=decoder)
+    client.httpx = httpx.Client(transport=httpx.MockTransport(handler))
+    assert client.get_character(22037).id == 22037
+    assert isinstance(bodies[0], bytes)
+
+    assert anilist.Client(decoder="json").decoder is json.loads
+    with pytest.raises(TypeError):
+        anilist.Client(decoder="yaml")
+
+
+def test_transport_base_url_and_headers():
+    seen = []
+
+    def handler(request):
+        seen.append(request)
+        return httpx.Response(200, json={"data": {"Character": CHARACTER}})
+
+    options = dict(base_url="http://proxy.local/graphql", headers={"Authorization": "Bearer token"})
+    with anilist.Client(transport=httpx.MockTransport(handler), **options) as client:
+        assert client.get_character(22037).id == 22037
+
+    assert str(seen[0].url) == "http://proxy.local/graphql"
+    assert seen[0].headers["Authorization"] == "Bearer token"
+    assert seen[0].headers["Accept"] == "application/json"
+
+
+@pytest.mark.asyncio
+async def test_async_transport():
+    urls = []
+
+    def handler(request):
+        urls.append(str(request.url))
+        return httpx.Response(200, json={"data": {"Character": CHARACTER}})
+
+    async with anilist.AsyncClient(base_url="http://127.0.0.1:8000/", transport=httpx.MockTransport(handler)) as client:
+        assert (await client.get_character(22037)).id == 22037
+    assert urls == ["http://127.0.0.1:8000/"]
+
+
+@pytest.mark.asyncio
+async def test_async_map():
+    in_flight = []
+    peak = []
+
+    async def handler(request):
+        id = json.loads(request.content)["variables"]["id"]
+        in_flight.append(id)
+        peak.append(len(in_flight))
+        await asyncio.sleep(0.01 * (id % 3))
+        in_flight.remove(id)
+        if id == 4:
+            return httpx.Response(429, json={"data": None})
+        return httpx.Response(200, json={"data": {"Character": {**CHARACTER, "id": id}}})
+
+    progress = []
+    async with anilist.AsyncClient(rate_limit=None, max_retries=0, transport=httpx.MockTransport(handler)) as client:
+        results = await client.map(
+            "get_character", range(1, 9), concurrency=3, progress=lambda done, total: progress.append((done, total))
+        )
+        mixed = await client.map(client.get_character, [(5,), {"id": 6}])
+        assert [character.id for character in mixed] == [5, 6]
+
+    assert [result.id for result in results if not isinstance(result, Exception)] == [1, 2, 3, 5, 6, 7, 8]
+    assert isinstance(results[3], httpx.HTTPStatusError)
+    assert max(peak) == 3
+    assert progress[-1] == (8, 8) and len(progress) == 8
+
+    with pytest.raises(TypeError):
+        await client.map("_query", [])
+    with pytest.raises(TypeError):
+        await client.map("get_character", [], concurrency=0)
+
+
+def test_sync_map():
+    threads = set()
+
+    def handler(request):
+        threads.add(threading.get_ident())
+        id = json.loads(request.content)["variables"]["id"]
+        time.sleep(0.01 * (id % 3))
+        if id == 4:
+            return httpx.Response(429, json={"data": None})
+        return httpx.Response(200, json={"data": {"Character": {**CHARACTER, "id": id}}})
+
+    progress = []
+    with anilist.Client(rate_limit=None, max_retries=0, max_workers=4, transport=httpx.MockTransport(handler)) as client:
+        results = client.map("get_character", range(1, 9), progress=lambda done, total: progress.append(done))
+        completed = dict(client.map_as_completed(client.get_character, [(5,), {"id": 6}]))
+
+    assert [result.id for result in results if not isinstance(result, Exception)] == [1, 2, 3, 5, 6, 7, 8]
+    assert isinstance(results[3], httpx.HTTPStatusError)
+    assert progress == list(range(1, 9))
+    assert 1 < len(threads) <= 4
+    assert {index: character.id for index, character in completed.items()} == {0: 5, 1: 6}
+    assert client.executor is None
+
+    with pytest.raises(TypeError):
+        anilist.Client(max_workers=0)
+
+
+def test_sync_get_many_runs_chunks_in_parallel():
+    threads = set()
+
+    def handler(request):
+        threads.add(threading.get_ident())
+        time.sleep(0.01)
+        ids = json.loads(request.content)["variables"]["ids"]
+        return httpx.Response(200, json=media_page([media(id) for id in ids]))
+
+    with anilist.Client(rate_limit=None, transport=httpx.MockTransport(handler)) as client:
+        result = client.get_many(list(range(1, 151)))
+        assert [anime.id for anime in result] == list(range(1, 151))
+        assert len(threads) > 1
+        # Nested calls from the pool's own threads run inline instead of waiting on it.
+        nested = client.map(lambda ids: client.get_many(ids), [list(range(1, 101)), list(range(101, 201))])
+        assert [len(page) for page in nested] == [100, 100]
@@ -0,0 +1,85 @@
+# SPDX-License-Identifier: MIT
+# Copyright (C) 2021-2022 Amano Team <https://amanoteam.com/> and the python-anilist contributors
+
+import hashlib
+import json
+import re
+
+import httpx
+import pytest
+
+import anilist
+from anilist.documents import minify, query_hash
+from anilist.queries import names, source
+from payloads import media, media_page
+
+_TOKEN = re.compile(r"\.\.\.|[!$():=@\[\]{|}]|[\w]+")
+
+
+def tokens(query):
+    return _TOKEN.findall(re.sub(r"#[^\n]*", "", query))
+
+
+def test_minify_keeps_tokens():
+    for name in names():
+        query = source(name)
+        text = minify(query)
+        assert tokens(text) == tokens(query)
+        assert "#" not in text and "\n" not in text and "  " not in text
+        assert len(text) < len(query) / 2
+
+
+def apq_handler(known, requests, supported=True):
+    def handler(request):
+        body = json.loads(request.content)
+        requests.append(body)
+        digest = body["extensions"]["persistedQuery"]["sha256Hash"] if "extensions" in body else None
+        if not supported and digest is not None:
+            return httpx.Response(200, json={"errors": [{"message": "PersistedQueryNotSupported"}]})
+        if "query" in body:
+            if digest is not None:
+                assert hashlib.sha256(body["query"].encode()).hexdigest() == digest
+                known.add(digest)
+        elif digest not in known:
+            return httpx.Response(200, json={"errors": [{"message": "PersistedQueryNotFound"}]})
+        return httpx.Response(200, json=media_page([media(1)]))
+
+    return handler
+
+
+def test_persisted_queries():
+    known, requests = set(), []
+    transport = httpx.MockTransport(apq_handler(known, requests))
+    with anilist.Client(rate_limit=None, minify=True, persisted_queries=True, transport=transport) as client:
+        assert client.get_anime(1).id == 1
+        assert ["query" in body for body in requests] == [False, True]
+        assert requests[1]["query"] == minify(anilist.queries.ANIME_GET_QUERY)
+
+        requests.clear()
+        assert client.get_anime(2).id == 1
+        assert ["query" in body for body in requests] == [False]
+        assert requests[0]["extensions"]["persistedQuery"] == {
+            "version": 1,
+            "sha256Hash": query_hash(minify(anilist.queries.ANIME_GET_QUERY)),
+        }
+
+
+@pytest.mark.asyncio
+async def test_persisted_queries_not_supported():
+    requests = []
+    transport = httpx.MockTransport(apq_handler(set(), requests, supported=False))
+    async with anilist.AsyncClient(rate_limit=None, persisted_queries=True, transport=transport) as client:
+        assert (await client.get_anime(1)).id == 1
+        assert client.persisted_queries is False
+        assert (await client.get_anime(1)).id == 1
+    assert ["query" in body for body in requests] == [False, True, True]
+    assert "extensions" not in requests[-1]
+    assert requests[-1]["query"] == anilist.queries.ANIME_GET_QUERY
+
+
+def test_persisted_query_fallback_without_retries():
+    known, requests = set(), []
+    transport = httpx.MockTransport(apq_handler(known, requests))
+    with anilist.Client(rate_limit=None, max_retries=0, persisted_queries=True, transport=transport) as client:
+        assert client.get_anime(1).id == 1
+    assert ["query" in body for body in requests] == [False, True]
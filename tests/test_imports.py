@@ -0,0 +1,44 @@
+# SPDX-License-Identifier: MIT
+# Copyright (C) 2021-2022 Amano Team <https://amanoteam.com/> and the python-anilist contributors
+
+import subprocess
+import sys
+from typing import Dict, Tuple
+
+
+def import_times(code: str) -> Dict[str, Tuple[int, int]]:
+    """Runs code in a new interpreter with `-X importtime` and returns the self and cumulative
+    microseconds of every imported module."""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code], capture_output=True, text=True, check=True
+    )
+    times = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "[us]" in line:
+            continue
+        own, cumulative, name = line[len("import time:"):].split("|")
+        times[name.strip()] = (int(own), int(cumulative))
+    return times
+
+
+def test_import_anilist_is_lazy():
+    modules = import_times("import anilist")
+    assert "anilist" in modules
+    for name in ("httpx", "h2", "anilist.sync_client", "anilist.async_client", "anilist.client_process", "anilist.types"):
+        assert name not in modules, f"import anilist loads {name}"
+
+
+def test_attributes_load_on_first_access():
+    modules = import_times("import anilist; anilist.types.Anime")
+    assert "anilist.types.anime" in modules
+    assert "anilist.types.user" not in modules and "httpx" not in modules
+
+    modules = import_times("import anilist; anilist.MetricsCollector")
+    assert "anilist.metrics" in modules and "httpx" not in modules
+
+    modules = import_times("import anilist; anilist.Client")
+    assert "anilist.sync_client" in modules
+    assert "anilist.async_client" not in modules
+
+    modules = import_times("from anilist import AsyncClient, ResponseCache, types; from anilist.types import *")
+    assert "anilist.async_client" in modules and "anilist.types.user" in modules
@@ -0,0 +1,108 @@
+# SPDX-License-Identifier: MIT
+# Copyright (C) 2021-2022 Amano Team <https://amanoteam.com/> and the python-anilist contributors
+
+import httpx
+import pytest
+
+import anilist
+from anilist.metrics import Recorder, Span, query_name, variables_hash
+from anilist.projection import project
+from anilist.queries import ANIME_GET_QUERY, LIST_ACTIVITY_QUERY_MANGA
+from payloads import list_entry, list_page, media, media_page
+
+
+def handler(request):
+    return httpx.Response(200, json=media_page([media(1)]))
+
+
+def test_query_name():
+    assert query_name(ANIME_GET_QUERY) == "ANIME_GET_QUERY"
+    assert query_name(LIST_ACTIVITY_QUERY_MANGA) == "LIST_ACTIVITY_QUERY_MANGA"
+    assert query_name(project(ANIME_GET_QUERY, "card")) == "ANIME_GET_QUERY"
+    assert query_name("# comment\nquery Batch($c1_id: Int) { c1: Character(id: $c1_id) { id } }") == "Batch"
+    assert query_name("{ Viewer { id } }") == "anonymous"
+    assert variables_hash({"a": 1, "b": 2}) == variables_hash({"b": 2, "a": 1}) != variables_hash({"a": 2})
+
+
+def test_client_spans():
+    spans = []
+    cache = anilist.ResponseCache()
+    transport = httpx.MockTransport(handler)
+    with anilist.Client(rate_limit=None, cache=cache, hooks=[spans.append], transport=transport) as client:
+        assert client.get_anime(1).id == 1
+        assert [span.phase for span in spans] == ["server", "decode", "process"]
+        assert {span.operation for span in spans} == {"ANIME_GET_QUERY"}
+        assert {span.status_code for span in spans} == {200}
+        assert spans[0].bytes > 0 and spans[0].variables_hash == variables_hash(dict(id=1, MediaType="ANIME"))
+        assert all(span.duration >= 0 for span in spans)
+
+        # Cached responses are only processed.
+        spans.clear()
+        client.get_anime(1)
+        assert [(span.phase, span.status_code) for span in spans] == [("process", None)]
+
+
+def test_connect_and_download_spans():
+    spans = []
+    recorder = Recorder([spans.append], ANIME_GET_QUERY, {"id": 1})
+    for name in (
+        "connection.connect_tcp.started",
+        "connection.connect_tcp.complete",
+        "connection.start_tls.started",
+        "connection.start_tls.complete",
+        "http2.send_request_headers.started",
+        "http2.receive_response_headers.complete",
+    ):
+        recorder.extensions["trace"](name, {})
+    recorder.response(0.0, httpx.Response(200, content=b"{}"))
+
+    assert [span.phase for span in spans] == ["connect", "server", "download"]
+    assert spans[0].start + spans[0].duration == spans[1].start
+    assert spans[1].start + spans[1].duration == spans[2].start
+    assert spans[2].bytes == 2
+
+
+@pytest.mark.asyncio
+async def test_async_collector():
+    collector = anilist.MetricsCollector(max_samples=2)
+
+    def search_handler(request):
+        return httpx.Response(200, json=media_page([media(1), media(2)]))
+
+    async with anilist.AsyncClient(hooks=[collector], transport=httpx.MockTransport(search_handler)) as client:
+        for _ in range(3):
+            await client.search_anime("title", 2)
+
+    stats = collector.quantiles()["ANIME_SEARCH_QUERY"]
+    assert set(stats) == {"server", "decode", "process"}
+    assert stats["process"]["count"] == 3
+    assert stats["process"]["p50"] <= stats["process"]["p99"] <= stats["process"]["sum"]
+
+    text = collector.prometheus()
+    assert "# TYPE anilist_phase_duration_seconds summary" in text
+    assert 'anilist_phase_duration_seconds_count{operation="ANIME_SEARCH_QUERY",phase="server"} 3' in text
+    assert 'anilist_phase_duration_seconds{operation="ANIME_SEARCH_QUERY",phase="decode",quantile="0.99"}' in text
+    assert 'anilist_responses_total{operation="ANIME_SEARCH_QUERY",status="200"} 3' in text
+
+    collector.clear()
+    assert collector.quantiles() == {}
+
+
+def test_collector_accepts_spans():
+    collector = anilist.MetricsCollector()
+    for duration in range(1, 101):
+        collector(Span("OP", "server", 0.0, duration / 1000, "hash", 10, 200))
+    stats = collector.quantiles()["OP"]["server"]
+    assert (stats["p50"], stats["p95"], stats["p99"]) == (0.051, 0.096, 0.1)
+
+
+def test_stream_spans():
+    spans = []
+
+    def list_handler(request):
+        return httpx.Response(200, json=list_page([list_entry(1), list_entry(2)], 1, 1))
+
+    with anilist.Client(rate_limit=None, hooks=[spans.append], transport=httpx.MockTransport(list_handler)) as client:
+        assert [entry.id for entry in client.stream_list(1)] == [1, 2]
+    assert [span.phase for span in spans] == ["server"]
+    assert spans[0].operation == "LIST_GET_QUERY_ANIME" and spans[0].bytes > 0 and spans[0].status_code == 200
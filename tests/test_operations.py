@@ -0,0 +1,77 @@
+# SPDX-License-Identifier: MIT
+# Copyright (C) 2021-2022 Amano Team <https://amanoteam.com/> and the python-anilist contributors
+
+import json
+
+import httpx
+import pytest
+
+import anilist
+from anilist.operations import ACTIVITY, GET, GET_MANY, SEARCH, lookup
+from anilist.queries import names
+from payloads import activity_page, list_activity, media, media_page, message_activity
+
+
+def recording_transport(requests, payload):
+    def handler(request):
+        requests.append(json.loads(request.content))
+        return httpx.Response(200, json=payload)
+
+    return httpx.MockTransport(handler)
+
+
+def test_registry():
+    for registry in (SEARCH, GET, GET_MANY, ACTIVITY):
+        for operation in registry.values():
+            assert operation.query in names()
+            assert hasattr(anilist.Client, operation.method) and hasattr(anilist.AsyncClient, operation.method)
+    assert lookup(SEARCH, "char") is lookup(SEARCH, "Character") is SEARCH["character"]
+    with pytest.raises(TypeError, match="no such content type"):
+        lookup(GET, "studio")
+    with pytest.raises(TypeError, match="must be a string"):
+        lookup(ACTIVITY, 1)
+
+
+def test_sync_dispatch():
+    requests = []
+    with anilist.Client(rate_limit=None, transport=recording_transport(requests, media_page([media(1)]))) as client:
+        assert [item.id for item in client.search("title", "ANIME", limit=1)] == [1]
+        assert client.get("1", "anime").id == 1
+        with pytest.raises(TypeError):
+            client.get(1, "user")
+    assert requests[0]["query"] == anilist.queries.ANIME_SEARCH_QUERY
+    assert requests[0]["variables"] == dict(search="title", page=1, per_page=1, MediaType="ANIME")
+    assert requests[1]["variables"] == dict(id=1, MediaType="ANIME")
+
+
+@pytest.mark.asyncio
+async def test_async_dispatch():
+    requests = []
+    transport = recording_transport(requests, activity_page([list_activity(1, "MANGA")]))
+    async with anilist.AsyncClient(rate_limit=None, transport=transport) as client:
+        activities, pages = await client.get_activity(1, "Manga", pagination=True)
+        assert [activity.id for activity in activities] == [1]
+        with pytest.raises(TypeError):
+            await client.get_activity(1, "studio")
+    assert requests == [{
+        "query": anilist.queries.LIST_ACTIVITY_QUERY_MANGA,
+        "variables": dict(user_id=1, page=1, per_page=25, activity_type="MANGA_LIST"),
+    }]
+
+
+def test_sync_message_sent():
+    requests = []
+    transport = recording_transport(requests, activity_page([message_activity(1), message_activity(2)]))
+    with anilist.Client(rate_limit=None, transport=transport) as client:
+        assert [activity.id for activity in client.get_activity(1, "message_sent")] == [1, 2]
+        assert [activity.id for activity in client.iter_activity(1, "message_sent", limit=2, max_items=2)] == [1, 2]
+    assert {body["query"] for body in requests} == {anilist.queries.MESSAGE_ACTIVITY_QUERY_SENT}
+
+
+@pytest.mark.asyncio
+async def test_async_message_sent():
+    transport = recording_transport([], activity_page([message_activity(1), message_activity(2)]))
+    async with anilist.AsyncClient(rate_limit=None, transport=transport) as client:
+        assert [activity.id for activity in await client.get_activity(1, "message_sent")] == [1, 2]
+        items = [activity.id async for activity in client.iter_activity(1, "message_sent", limit=2, max_items=2)]
+        assert items == [1, 2]
@@ -0,0 +1,155 @@
+# SPDX-License-Identifier: MIT
+# Copyright (C) 2021-2022 Amano Team <https://amanoteam.com/> and the python-anilist contributors
+
+import json
+import threading
+
+import httpx
+import pytest
+
+import anilist
+from payloads import list_collection, list_entry, list_page
+
+PER_PAGE = 3
+LAST_PAGE = 4
+
+
+def handler(request):
+    page = json.loads(request.content)["variables"]["page"]
+    entries = [list_entry(page * 100 + i) for i in range(PER_PAGE)]
+    return httpx.Response(200, json=list_page(entries, page, LAST_PAGE))
+
+
+def expected(count):
+    return [page * 100 + i for page in range(1, LAST_PAGE + 1) for i in range(PER_PAGE)][:count]
+
+
+def test_sync_iter_list():
+    client = anilist.Client()
+    client.httpx = httpx.Client(transport=httpx.MockTransport(handler))
+
+    assert [entry.id for entry in client.iter_list(1, limit=PER_PAGE)] == expected(12)
+    assert [entry.id for entry in client.iter_list(1, limit=PER_PAGE, max_items=5)] == expected(5)
+
+
+def test_iter_list_uses_client_pool():
+    threads = []
+
+    def recording_handler(request):
+        threads.append(threading.current_thread().name)
+        return handler(request)
+
+    with anilist.Client(rate_limit=None, max_workers=1, transport=httpx.MockTransport(recording_handler)) as client:
+        assert [entry.id for entry in client.iter_list(1, limit=PER_PAGE, concurrency=3)] == expected(12)
+        assert client.executor is not None
+    assert threads[0] == threading.current_thread().name
+    assert set(threads[1:]) == {"anilist_0"}
+
+
+@pytest.mark.asyncio
+async def test_async_iter_list():
+    pages = []
+
+    def counting_handler(request):
+        pages.append(json.loads(request.content)["variables"]["page"])
+        return handler(request)
+
+    client = anilist.AsyncClient()
+    client.httpx = httpx.AsyncClient(transport=httpx.MockTransport(counting_handler))
+
+    assert [entry.id async for entry in client.iter_list(1, limit=PER_PAGE, concurrency=3)] == expected(12)
+    assert sorted(pages) == [1, 2, 3, 4]
+
+    pages.clear()
+    assert [entry.id async for entry in client.iter_list(1, limit=PER_PAGE, max_items=4)] == expected(4)
+    assert sorted(pages) == [1, 2]
+
+
+def sync_handler(updates):
+    def handler(request):
+        variables = json.loads(request.content)["variables"]
+        page, per_page = variables["page"], variables["per_page"]
+        entries = [
+            list_entry(id, updated_at=updated)
+            for id, updated in updates[(page - 1) * per_page:page * per_page]
+        ]
+        return httpx.Response(200, json=list_page(entries, page, -(-len(updates) // per_page)))
+
+    return handler
+
+
+def test_sync_list():
+    updates = [(id, 1000 - id * 10) for id in range(1, 11)]
+    pages = []
+
+    def handler(request):
+        pages.append(json.loads(request.content)["variables"]["page"])
+        return sync_handler(updates)(request)
+
+    with anilist.Client(rate_limit=None, transport=httpx.MockTransport(handler)) as client:
+        snapshot = {}
+        entries, watermark = client.sync_list(1, limit=3, snapshot=snapshot)
+        assert [entry.id for entry in entries] == list(range(1, 11))
+        assert watermark == 990 and len(snapshot) == 10
+
+        pages.clear()
+        entries, watermark = client.sync_list(1, limit=3, since=950, snapshot=snapshot)
+        # Entry 5 was updated at the watermark and the snapshot already has that version.
+        assert [entry.id for entry in entries] == [1, 2, 3, 4]
+        assert watermark == 990
+        assert pages == [1, 2]
+
+        # Nothing changed: the entry at the watermark is already in the snapshot.
+        assert client.sync_list(1, limit=3, since=watermark, snapshot=snapshot) == ([], 990)
+        entries, watermark = client.sync_list(1, limit=3, since=watermark)
+        assert [entry.id for entry in entries] == [1] and watermark == 990
+
+
+@pytest.mark.asyncio
+async def test_async_sync_list():
+    updates = [(1, 2000), (2, 1500), (3, 900)]
+    async with anilist.AsyncClient(rate_limit=None, transport=httpx.MockTransport(sync_handler(updates))) as client:
+        entries, watermark = await client.sync_list(1, since=1000)
+        assert [entry.id for entry in entries] == [1, 2]
+        assert watermark == 2000
+
+        entries, watermark = await client.sync_list(1, since=3000)
+        assert entries == [] and watermark == 3000
+
+        with pytest.raises(TypeError):
+            await client.sync_list(1, "character")
+
+
+def test_get_list_collection():
+    chunks = []
+
+    def handler(request):
+        variables = json.loads(request.content)["variables"]
+        chunks.append((variables["chunk"], variables["per_chunk"]))
+        if variables["chunk"] == 1:
+            lists = {"COMPLETED": [list_entry(1), list_entry(2)], "CUSTOM": [list_entry(1)]}
+            return httpx.Response(200, json=list_collection(lists, has_next_chunk=True))
+        return httpx.Response(200, json=list_collection({"COMPLETED": [list_entry(3)], "PLANNING": [list_entry(4)]}))
+
+    with anilist.Client(rate_limit=None, transport=httpx.MockTransport(handler)) as client:
+        groups = client.get_list_collection(1, chunk_size=2)
+
+        with pytest.raises(TypeError):
+            client.get_list_collection(1, chunk_size=501)
+
+    assert chunks == [(1, 2), (2, 2)]
+    assert {status: [entry.id for entry in entries] for status, entries in groups.items()} == {
+        "COMPLETED": [1, 2, 3],
+        "PLANNING": [4],
+    }
+    assert groups["PLANNING"][0].media.id == 4
+
+
+@pytest.mark.asyncio
+async def test_async_get_list_collection():
+    def handler(request):
+        return httpx.Response(200, json=list_collection({"CURRENT": [list_entry(7, "MANGA")]}, content_type="manga"))
+
+    async with anilist.AsyncClient(lazy=True, transport=httpx.MockTransport(handler)) as client:
+        groups = await client.get_list_collection(1, "manga")
+    assert groups["CURRENT"][0].media.title.romaji == "Title 7"
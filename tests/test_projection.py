@@ -0,0 +1,51 @@
+# SPDX-License-Identifier: MIT
+# Copyright (C) 2021-2022 Amano Team <https://amanoteam.com/> and the python-anilist contributors
+
+import json
+
+import httpx
+import pytest
+
+import anilist
+from anilist.projection import project, split_fields
+from anilist.utils import ANIME_GET_QUERY, MANGA_GET_QUERY
+
+
+def test_split_fields():
+    fields = split_fields("id title { romaji } staff(sort: FAVOURITES_DESC) { edges { role } }, popularity")
+    assert fields == [
+        ("id", "id"),
+        ("title", "title { romaji }"),
+        ("staff", "staff(sort: FAVOURITES_DESC) { edges { role } }"),
+        ("popularity", "popularity"),
+    ]
+
+
+def test_presets():
+    assert project(ANIME_GET_QUERY, None) is ANIME_GET_QUERY
+    assert project(ANIME_GET_QUERY, "full") is ANIME_GET_QUERY
+
+    card = project(MANGA_GET_QUERY, "card", "manga")
+    assert "chapters" in card and "coverImage" in card and "seasonYear" in card
+    assert "relations" not in card and "staff(" not in card and "episodes" not in card
+    assert project(MANGA_GET_QUERY, "card", "manga") is card
+
+    with pytest.raises(TypeError):
+        project(ANIME_GET_QUERY, ["chapters"])
+    with pytest.raises(TypeError):
+        project(ANIME_GET_QUERY, "tiny")
+
+
+def test_get_anime_with_fields():
+    def handler(request):
+        query = json.loads(request.content)["query"]
+        assert "coverImage" in query and "rankings" not in query
+        item = {"id": 1, "title": {"romaji": "A", "english": None, "native": None}, "coverImage": None}
+        return httpx.Response(200, json={"data": {"Page": {"media": [item]}}})
+
+    client = anilist.Client()
+    client.httpx = httpx.Client(transport=httpx.MockTransport(handler))
+
+    anime = client.get(1, fields=["cover"])
+    assert anime.title.romaji == "A"
+    assert not hasattr(anime, "score") and not hasattr(anime, "season")
@@ -0,0 +1,85 @@
+# SPDX-License-Identifier: MIT
+# Copyright (C) 2021-2022 Amano Team <https://amanoteam.com/> and the python-anilist contributors
+
+import subprocess
+import sys
+
+import pytest
+
+from anilist import queries
+from anilist.documents import minify, query_hash
+from anilist.queries.build import render
+
+
+def test_queries_load_on_first_use():
+    code = (
+        "import anilist, anilist.queries as queries\n"
+        "assert not queries.QUERY_NAMES, queries.QUERY_NAMES\n"
+        "text = queries.CHARACTER_GET_QUERY\n"
+        "assert queries.QUERY_NAMES == {text: 'CHARACTER_GET_QUERY'}\n"
+    )
+    subprocess.run([sys.executable, "-c", code], check=True)
+
+
+def test_load():
+    assert queries.load("MESSAGE_ACTIVITY_SENT_QUERY") is queries.MESSAGE_ACTIVITY_QUERY_SENT
+    assert queries.QUERY_NAMES[queries.MESSAGE_ACTIVITY_QUERY_SENT] == "MESSAGE_ACTIVITY_QUERY_SENT"
+    assert "chapters" in queries.LIST_ACTIVITY_QUERY_MANGA
+    text = queries.load("ANIME_GET_QUERY")
+    assert queries.minified(text) == minify(text)
+    assert queries.minified(queries.minified(text)) == minify(text)
+    assert queries.digest(minify(text)) == query_hash(minify(text))
+    with pytest.raises(KeyError):
+        queries.load("UNKNOWN_QUERY")
+    with pytest.raises(AttributeError):
+        queries.UNKNOWN_QUERY
+
+
+def test_build():
+    compiled = {name: minify(queries.load(name)) for name in queries.names()}
+    namespace = {}
+    exec(render(compiled), namespace)
+    assert namespace["QUERIES"] == compiled
+    assert namespace["HASHES"] == {name: query_hash(text) for name, text in compiled.items()}
+    assert "MESSAGE_ACTIVITY_SENT_QUERY" not in compiled
+
+
+def test_digest_uses_built_hashes(monkeypatch):
+    monkeypatch.setitem(queries._HASHES, "query{Viewer{id}}", "baked")
+    assert queries.digest("query{Viewer{id}}") == "baked"
+    assert queries.digest("query{Viewer{name}}") == query_hash("query{Viewer{name}}")
+
+
+def test_build_reads_sources(tmp_path):
+    output = tmp_path / "_compiled.py"
+    subprocess.run([sys.executable, "-m", "anilist.queries.build", "--output", str(output)], check=True)
+    namespace = {}
+    exec(output.read_text(), namespace)
+    manga = queries.source("LIST_ACTIVITY_QUERY_MANGA")
+    assert "chapters" in manga and "#" in manga
+    assert namespace["QUERIES"]["LIST_ACTIVITY_QUERY_MANGA"] == minify(manga)
+
+
+def test_derived_queries():
+    for kind in ("ANIME", "MANGA"):
+        single, many = queries.source(f"{kind}_GET_QUERY"), queries.source(f"{kind}_GET_MANY_QUERY")
+        assert "id_in: $ids" in many and "perPage: $per_page" in many and "$id," not in many
+        assert many.splitlines()[6:] == single.splitlines()[6:]
+
+
+def selection(query, field):
+    """Returns the selection set following the first occurrence of field."""
+    start = query.index("{", query.index(field))
+    depth = 0
+    for end in range(start, len(query)):
+        depth += {"{": 1, "}": -1}.get(query[end], 0)
+        if depth == 0:
+            return query[start:end + 1]
+
+
+def test_list_collection_selects_list_entries():
+    for kind in ("ANIME", "MANGA"):
+        page = minify(queries.source(f"LIST_GET_QUERY_{kind}"))
+        collection = minify(queries.source(f"LIST_COLLECTION_QUERY_{kind}"))
+        assert selection(collection, "entries") == selection(page, "mediaList(")
+        assert "hasNextChunk" in collection and "isCustomList" in collection and "pageInfo" not in collection
@@ -0,0 +1,89 @@
+# SPDX-License-Identifier: MIT
+# Copyright (C) 2021-2022 Amano Team <https://amanoteam.com/> and the python-anilist contributors
+
+import asyncio
+import threading
+import time
+
+import httpx
+import pytest
+
+import anilist
+from anilist.ratelimit import AsyncRateLimiter, RateLimiter
+
+
+def test_bucket_paces_requests():
+    limiter = RateLimiter(limit=2, period=0.2)
+    start = time.monotonic()
+    for _ in range(3):
+        limiter.acquire()
+    assert time.monotonic() - start >= 0.09
+    assert limiter.budget < 1
+
+
+def test_headers_update_budget():
+    limiter = RateLimiter()
+    assert limiter.update({"X-RateLimit-Limit": "30", "X-RateLimit-Remaining": "4"}, 200) is None
+    assert limiter.limit == 30
+    assert 4 <= limiter.budget < 5
+
+    assert limiter.update({"Retry-After": "7"}, 429) == 7
+    assert limiter.stats()["budget"] == 0
+    assert 6 < limiter.retry_after <= 7
+
+
+@pytest.mark.asyncio
+async def test_throttled_request_is_retried():
+    responses = [
+        httpx.Response(429, headers={"Retry-After": "0.05"}, json={"data": None, "errors": [{"status": 429}]}),
+        httpx.Response(200, json={"data": {"User": None}}),
+    ]
+    client = anilist.AsyncClient()
+    client.httpx = httpx.AsyncClient(transport=httpx.MockTransport(lambda request: responses.pop(0)))
+
+    assert await client._query("query { User { id } }", {}) == {"data": {"User": None}}
+    assert isinstance(client.rate_limiter, AsyncRateLimiter)
+    assert client.rate_limiter.throttled == 1
+
+
+def test_async_limiter_survives_event_loops():
+    limiter = AsyncRateLimiter(limit=100)
+    for _ in range(2):
+        asyncio.run(limiter.acquire())
+    assert limiter.stats()["queue_depth"] == 0
+
+
+def test_async_limiter_shared_between_threads():
+    limiter = AsyncRateLimiter(limit=1000, period=3600)
+
+    async def take():
+        for _ in range(50):
+            await limiter.acquire()
+
+    threads = [threading.Thread(target=asyncio.run, args=(take(),)) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert 799 < limiter.budget < 801
+    assert limiter.stats()["queue_depth"] == 0
+
+
+def test_async_client_survives_event_loops():
+    transport = httpx.MockTransport(lambda request: httpx.Response(200, json={"data": {"User": None}}))
+    client = anilist.AsyncClient(rate_limit=None, transport=transport)
+    sessions = []
+    for _ in range(2):
+        assert asyncio.run(client._query("query { User { id } }", {})) == {"data": {"User": None}}
+        sessions.append(client.httpx)
+    # The pool of the first loop is not reused once that loop is closed.
+    assert sessions[0] is not sessions[1]
+
+
+def test_throttled_request_raises_without_retries():
+    response = httpx.Response(429, json={"data": None, "errors": [{"status": 429}]})
+    client = anilist.Client(rate_limit=None)
+    client.httpx = httpx.Client(transport=httpx.MockTransport(lambda request: response))
+
+    with pytest.raises(httpx.HTTPStatusError):
+        client.get_character(1)
@@ -0,0 +1,70 @@
+# SPDX-License-Identifier: MIT
+# Copyright (C) 2021-2022 Amano Team <https://amanoteam.com/> and the python-anilist contributors
+
+import json
+
+import httpx
+import pytest
+from payloads import list_entry, list_page, media, media_page
+
+import anilist
+
+schema = pytest.importorskip("anilist.schema")
+
+USER = {
+    "id": 1,
+    "name": "someone",
+    "about": None,
+    "avatar": {"large": "l.png", "medium": "m.png"},
+    "bannerImage": None,
+    "favourites": {
+        "anime": {"nodes": [media(1)]},
+        "manga": {"nodes": []},
+        "characters": {"nodes": []},
+        "staff": {"nodes": []},
+        "studios": {"nodes": [{"id": 44, "name": "Shaft", "isAnimationStudio": True}]},
+    },
+    "statistics": {"anime": {"count": 1, "genres": [{"genre": "Drama", "count": 1}]}, "manga": None},
+    "siteUrl": "https://anilist.co/user/someone",
+    "donatorTier": 0,
+    "donatorBadge": "Donator",
+    "createdAt": 1600000000,
+    "updatedAt": 1650000000,
+    "options": {"profileColor": "blue"},
+}
+
+
+def test_typed_client():
+    def handler(request):
+        query = json.loads(request.content)["query"]
+        if "mediaList" in query:
+            return httpx.Response(200, json=list_page([list_entry(1), list_entry(2)], 1, 3))
+        if "User(" in query:
+            return httpx.Response(200, json={"data": {"User": USER}})
+        return httpx.Response(200, json=media_page([media(1)]))
+
+    client = anilist.Client(typed=True)
+    client.httpx = httpx.Client(transport=httpx.MockTransport(handler))
+
+    anime = client.get_anime(1)
+    assert isinstance(anime, schema.Media)
+    assert anime.title.romaji == "Title 1" and anime.site_url == "https://anilist.co/anime/1"
+    assert anime.cover_image.extra_large == "xl.png" and anime.rankings[0].all_time
+
+    entries, pages = client.get_list(1, 2)
+    assert [entry.media.id for entry in entries] == [1, 2]
+    assert entries[0].started_at.year == 2020 and pages.last == 3
+    assert [entry.id for entry in client.iter_list(1, limit=2, max_items=4)] == [1, 2, 1, 2]
+
+    user = client.get_user("someone")
+    assert user.favourites.anime.nodes[0].id == 1
+    assert user.favourites.studios.nodes[0].is_animation_studio
+    assert user.statistics.anime.genres[0].genre == "Drama" and user.statistics.manga is None
+    assert user.options.profile_color == "blue"
+
+
+def test_typed_errors():
+    body = json.dumps({"data": None, "errors": [{"message": "Not Found.", "status": 404}]}).encode()
+    assert schema.process_media(schema.decode(body, schema.MediaResponse)) is None
+    assert schema.process_list(schema.decode(body, schema.ListResponse), "anime") is None
+    assert schema.process_user(schema.decode(body, schema.UserResponse)) is None
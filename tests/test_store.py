@@ -0,0 +1,98 @@
+# SPDX-License-Identifier: MIT
+# Copyright (C) 2021-2022 Amano Team <https://amanoteam.com/> and the python-anilist contributors
+
+import json
+import time
+
+import httpx
+import pytest
+
+import anilist
+from anilist.client_process import construct_anime_object, process_get_list
+from anilist.store import EntityStore
+from payloads import list_entry, list_page, media, media_page
+
+
+def test_build_shares_instances_until_fields_change():
+    store = EntityStore()
+    first = store.build("anime", {"id": 1, "title": media(1)["title"]}, construct_anime_object)
+    assert store.build("anime", {"id": 1, "title": media(1)["title"]}, construct_anime_object) is first
+
+    updated = store.build("anime", {"id": 1, "episodes": 12}, construct_anime_object)
+    assert updated is not first
+    assert updated.episodes == 12 and updated.title.romaji == "Title 1"
+
+
+def test_lookup_needs_fresh_covering_fields(monkeypatch):
+    store = EntityStore(ttls={"anime": 10})
+    store.merge("anime", {"id": 1, "title": media(1)["title"], "siteUrl": "url"})
+
+    assert store.lookup("anime", 1, ["id", "title"], construct_anime_object).id == 1
+    assert store.lookup("anime", 1, ["id", "episodes"], construct_anime_object) is None
+    assert store.lookup("anime", 2, ["id"], construct_anime_object) is None
+
+    now = time.monotonic()
+    monkeypatch.setattr(time, "monotonic", lambda: now + 11)
+    assert store.lookup("anime", 1, ["id"], construct_anime_object) is None
+    assert store.stats() == dict(size=1, hits=1, misses=3)
+
+
+def test_max_entities():
+    store = EntityStore(max_entities=2)
+    for id in range(3):
+        store.merge("anime", {"id": id})
+    assert len(store) == 2
+    assert store.get("anime", 0) is None
+
+
+def test_list_media_are_stored():
+    store = EntityStore()
+    entries, _ = process_get_list(list_page([list_entry(1), list_entry(2)], 1, 1), "anime", store=store)
+    assert store.get("anime", 1)["episodes"] == 12
+    again, _ = process_get_list(list_page([list_entry(1)], 1, 1), "anime", store=store)
+    assert again[0].media is entries[0].media
+
+
+def test_client_answers_from_store():
+    requests = []
+
+    def handler(request):
+        body = json.loads(request.content)
+        requests.append(body["variables"])
+        if "ids" in body["variables"]:
+            return httpx.Response(200, json=media_page([media(id) for id in body["variables"]["ids"]]))
+        if "id" in body["variables"]:
+            return httpx.Response(200, json=media_page([media(body["variables"]["id"])]))
+        return httpx.Response(200, json=list_page(page, 1, 1))
+
+    page = [list_entry(1), list_entry(2)]
+    for entry in page:
+        del entry["media"]["relations"]
+
+    store = EntityStore()
+    with anilist.Client(store=store, rate_limit=None, transport=httpx.MockTransport(handler)) as client:
+        entries, _ = client.get_list(7, 25)
+        assert client.get_anime(1, fields="card") is entries[0].media
+        assert len(requests) == 1
+
+        assert client.get_many_anime([1, 3], fields="card")[0] is entries[0].media
+        assert requests[-1]["ids"] == [3]
+
+        # The list query does not select relations, so a full lookup goes to the API.
+        assert client.get_anime(2).id == 2
+        assert requests[-1]["id"] == 2
+
+
+@pytest.mark.asyncio
+async def test_async_client_answers_from_store():
+    requests = []
+
+    def handler(request):
+        requests.append(request)
+        return httpx.Response(200, json=media_page([media(5)]))
+
+    async with anilist.AsyncClient(store=EntityStore(), transport=httpx.MockTransport(handler)) as client:
+        anime = await client.get_anime(5)
+        assert await client.get_anime(5) is anime
+        assert await client.get_anime(5, fields="minimal") is anime
+    assert len(requests) == 1
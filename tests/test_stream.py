@@ -0,0 +1,122 @@
+# SPDX-License-Identifier: MIT
+# Copyright (C) 2021-2022 Amano Team <https://amanoteam.com/> and the python-anilist contributors
+
+import json
+
+import httpx
+import pytest
+
+import anilist
+from anilist.stream import ArrayStream
+from payloads import activity_page, list_activity, list_collection, list_entry, list_page
+
+
+def feed(parser, body, size):
+    items = []
+    for start in range(0, len(body), size):
+        items.extend(parser.feed(body[start:start + size]))
+    return items
+
+
+@pytest.mark.parametrize("size", [1, 7, 64, 1 << 20])
+def test_array_stream_chunks(size):
+    entries = [list_entry(1), list_entry(2), {"text": 'quote " brace } bracket ] \\', "n": [1, {"a": []}]}, 3, "x"]
+    body = json.dumps(list_page(entries, 1, 2)).encode()
+
+    parser = ArrayStream(("data", "anime", "mediaList"))
+    items = feed(parser, body, size)
+
+    assert [json.loads(raw) for raw, _ in items] == entries
+    assert parser.close() == {"data": {"anime": {"pageInfo": {"total": 10, "currentPage": 1, "lastPage": 2}}}}
+
+
+def test_array_stream_context():
+    lists = {"COMPLETED": [list_entry(1), list_entry(2)], "PLANNING": [], "CUSTOM": [list_entry(3)]}
+    body = json.dumps(list_collection(lists, has_next_chunk=True)).encode()
+
+    parser = ArrayStream(("data", "anime", "lists", "*", "entries"))
+    items = feed(parser, body, 5)
+
+    assert [(json.loads(raw)["id"], context["status"], context["isCustomList"]) for raw, context in items] == [
+        (1, "COMPLETED", False),
+        (2, "COMPLETED", False),
+        (3, "CUSTOM", True),
+    ]
+    assert parser.close()["data"]["anime"]["hasNextChunk"] is True
+
+
+def test_array_stream_errors():
+    parser = ArrayStream(("data", "anime", "mediaList"))
+    assert parser.feed(b'{"data": null, "errors": [{"message": "Not Found."}]}') == []
+    assert parser.close()["errors"] == [{"message": "Not Found."}]
+
+    parser = ArrayStream(("data", "anime", "mediaList"))
+    parser.feed(b'{"data": {"anime": {"mediaList": [{"id": 1}')
+    with pytest.raises(ValueError):
+        parser.close()
+
+    with pytest.raises(ValueError):
+        ArrayStream(("data",)).feed(b'{"data" 1}')
+
+
+def test_stream_list():
+    body = json.dumps(list_page([list_entry(id) for id in range(1, 4)], 1, 1)).encode()
+    received = []
+
+    def chunks():
+        # The first entry must be processed before the end of the body is sent.
+        for start in range(0, len(body), 256):
+            received.append(start)
+            yield body[start:start + 256]
+
+    def handler(request):
+        return httpx.Response(200, content=chunks())
+
+    with anilist.Client(rate_limit=None, transport=httpx.MockTransport(handler)) as client:
+        entries = client.stream_list(1)
+        first = next(entries)
+        assert first.id == 1 and first.media.title.romaji == "Title 1"
+        assert len(received) < -(-len(body) // 256)
+        assert [entry.id for entry in entries] == [2, 3]
+
+        with pytest.raises(TypeError):
+            next(client.stream_list(1, "character"))
+
+
+def test_stream_activity():
+    def handler(request):
+        assert "chapters" in json.loads(request.content)["query"]
+        return httpx.Response(200, json=activity_page([list_activity(1, "MANGA"), list_activity(2, "MANGA")]))
+
+    with anilist.Client(rate_limit=None, transport=httpx.MockTransport(handler)) as client:
+        assert [activity.media.id for activity in client.stream_activity(1, "manga")] == [1, 2]
+
+
+def test_stream_raises_on_errors():
+    payload = {"data": None, "errors": [{"message": "Private User", "status": 404}]}
+
+    transport = httpx.MockTransport(lambda request: httpx.Response(200, json=payload))
+    with anilist.Client(rate_limit=None, transport=transport) as client:
+        with pytest.raises(ValueError, match="AniList returned errors: Private User"):
+            list(client.stream_list(1))
+
+
+@pytest.mark.asyncio
+async def test_async_stream_list_collection():
+    chunks = []
+
+    def handler(request):
+        chunk = json.loads(request.content)["variables"]["chunk"]
+        chunks.append(chunk)
+        if chunk == 1:
+            lists = {"COMPLETED": [list_entry(1)], "CUSTOM": [list_entry(1)]}
+            return httpx.Response(200, json=list_collection(lists, has_next_chunk=True))
+        return httpx.Response(200, json=list_collection({"PLANNING": [list_entry(2)]}))
+
+    store = anilist.EntityStore()
+    async with anilist.AsyncClient(store=store, transport=httpx.MockTransport(handler)) as client:
+        entries = [(status, entry.id) async for status, entry in client.stream_list_collection(1)]
+
+    assert entries == [("COMPLETED", 1), ("PLANNING", 2)]
+    assert chunks == [1, 2]
+    assert store.get("anime", 2)["id"] == 2
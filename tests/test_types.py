@@ -0,0 +1,63 @@
+# SPDX-License-Identifier: MIT
+# Copyright (C) 2021-2022 Amano Team <https://amanoteam.com/> and the python-anilist contributors
+
+import pickle
+
+import pytest
+from payloads import list_entry, list_page
+
+from anilist.client_process import process_get_list
+from anilist.types import Anime, Date, MediaList, Title
+
+
+def test_models_have_no_dict():
+    entries, _ = process_get_list(list_page([list_entry(1)], 1, 1), "anime")
+    entry = entries[0]
+    for model in [entry, entry.media, entry.media.title, entry.start_date, entry.media.rankings[0]]:
+        assert not hasattr(model, "__dict__")
+
+    with pytest.raises(AttributeError):
+        entry.unknown = 1
+
+
+def test_raw_skips_unset_attributes():
+    title = Title(romaji="A", english=None, native="B")
+    assert title.raw() == {"romaji": "A", "native": "B"}
+    assert str(title) == "{'romaji': 'A', 'native': 'B'}"
+    with pytest.raises(AttributeError):
+        title.english
+
+    date = Date(year=2020, day=3)
+    assert date.raw() == {"year": 2020, "day": 3}
+    assert date.get_timestamp() > 0
+
+
+def test_pickle():
+    entries, _ = process_get_list(list_page([list_entry(1)], 1, 1), "anime")
+    copy = pickle.loads(pickle.dumps(entries[0]))
+    assert copy == entries[0]
+    assert copy.media.title.raw() == entries[0].media.title.raw()
+
+
+def test_lazy_list():
+    data = list_page([list_entry(1), list_entry(2, updated_at=1700000000)], 1, 1)
+    eager, _ = process_get_list(data, "anime")
+    entries, _ = process_get_list(data, "anime", lazy=True)
+
+    assert all(isinstance(entry, MediaList) for entry in entries)
+    assert all(entry._factory is not None for entry in entries)
+
+    # Reading the title builds neither the list entry nor the whole media.
+    media = entries[0].media
+    assert isinstance(media, Anime) and media is entries[0].media
+    assert media.title.romaji == "Title 1" and media.title is media.title
+    assert entries[0]._factory is not None and media._factory is not None
+
+    assert entries[0].status == "COMPLETED" and entries[0]._factory is None
+    assert media.episodes == 12 and str(media) == str(eager[0].media) and media._factory is None
+
+    assert entries == eager
+    assert entries[1].update_date.raw() == eager[1].update_date.raw()
+    assert entries[1].media.raw().keys() == eager[1].media.raw().keys()
+    assert not hasattr(entries[1], "unknown")
+    assert isinstance(pickle.loads(pickle.dumps(entries[1])), MediaList)